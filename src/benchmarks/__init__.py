@@ -0,0 +1,14 @@
+"""Benchmarks for the D0010 import pipeline.
+
+Run a benchmark from the `src` directory, e.g.: `python -m benchmarks.bench_validators`
+"""
+
+import os
+
+import django
+
+
+def setup_django() -> None:
+    """Set up Django, so that benchmarks can be run as plain python modules."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kraken.settings")
+    django.setup()
@@ -0,0 +1,91 @@
+"""Benchmark parsing compressed D0010 files against parsing the same file uncompressed."""
+
+import argparse
+import bz2
+import gzip
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from benchmarks import setup_django
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.conf import settings  # noqa: E402
+
+from meter_readings.importers.flow_files import hash_flow_file, parse_flow_file  # noqa: E402
+from meter_readings.importers.sources import list_flow_file_sources  # noqa: E402
+
+
+def build_large_file(file_path: Path, repeat: int) -> str:
+    """Return the content of a D0010 file, with the body (everything but the header and footer) repeated."""
+    lines = file_path.read_text().splitlines(keepends=True)
+    return lines[0] + "".join(lines[1:-1]) * repeat + lines[-1]
+
+
+def write_variants(content: str, directory: Path) -> dict[str, Path]:
+    """Write the content uncompressed and in every supported compressed format, returning the path of each."""
+    data = content.encode()
+    file_paths = {
+        "uncompressed": directory / "flow.uff",
+        "gzip": directory / "flow.uff.gz",
+        "bzip2": directory / "flow.uff.bz2",
+        "zip": directory / "flow.zip",
+    }
+    file_paths["uncompressed"].write_bytes(data)
+    file_paths["gzip"].write_bytes(gzip.compress(data))
+    file_paths["bzip2"].write_bytes(bz2.compress(data))
+    with zipfile.ZipFile(file_paths["zip"], "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("flow.uff", data)
+    return file_paths
+
+
+def main() -> None:
+    """Time hashing and parsing of a D0010 file, uncompressed and in each compressed format."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "file_path",
+        nargs="?",
+        type=Path,
+        default=settings.BASE_DIR.parent / "data" / "DTC5259515123502080915D0010.uff",
+    )
+    parser.add_argument("--repeat", type=int, default=2000, help="Number of times the body of the file is repeated")
+    parser.add_argument("--runs", type=int, default=3, help="Number of times each file is parsed")
+    args = parser.parse_args()
+
+    content = build_large_file(args.file_path, args.repeat)
+    megabytes = len(content.encode()) / 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        file_paths = write_variants(content, Path(directory))
+
+        sys.stdout.write(f"Parsing a {megabytes:.1f}MB file, as:\n")
+        baseline_seconds = 0.0
+        for variant, file_path in file_paths.items():
+            [source] = list_flow_file_sources(file_path)
+            start_time = time.perf_counter()
+            hash_flow_file(source)
+            hash_seconds = time.perf_counter() - start_time
+            # Take the fastest of a few runs, to reduce noise
+            parse_seconds = float("inf")
+            for _ in range(args.runs):
+                start_time = time.perf_counter()
+                flow_file_parser, records = parse_flow_file(source)
+                parse_seconds = min(parse_seconds, time.perf_counter() - start_time)
+            if flow_file_parser.errors:
+                sys.stdout.write(f"Unexpected errors parsing {variant} file: {flow_file_parser.errors[:5]}\n")
+                sys.exit(1)
+
+            baseline_seconds = baseline_seconds or parse_seconds
+            sys.stdout.write(
+                f"  {variant:<13} {file_path.stat().st_size / 1_000_000:>7.1f}MB on disk, "
+                f"hashed in {hash_seconds:.3f}s, parsed in {parse_seconds:.3f}s "
+                f"({len(records) / parse_seconds:>9,.0f} rows/sec, {megabytes / parse_seconds:>5.1f}MB/s, "
+                f"{parse_seconds / baseline_seconds:.2f}x uncompressed)\n",
+            )
+
+
+if __name__ == "__main__":
+    main()
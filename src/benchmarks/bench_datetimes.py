@@ -0,0 +1,54 @@
+"""Benchmark cached fixed-width datetime parsing against strptime."""
+
+import argparse
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import setup_django
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.utils.timezone import make_aware  # noqa: E402
+
+from meter_readings.utils.datetimes import parse_timestamp  # noqa: E402
+
+
+def parse_with_strptime(value: str) -> datetime:
+    """Parse a datetime string the way it was parsed before parse_timestamp: validated and parsed with strptime."""
+    datetime.strptime(value, "%Y%m%d%H%M%S")  # noqa: DTZ007
+    return make_aware(datetime.strptime(value, "%Y%m%d%H%M%S"), timezone.utc)  # noqa: DTZ007
+
+
+def main() -> None:
+    """Time both parsers over datetime strings repeating the way reading dates in flow files do."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000, help="Number of datetime strings parsed")
+    parser.add_argument("--distinct", type=int, default=30, help="Number of distinct datetime strings")
+    args = parser.parse_args()
+
+    start = datetime(2016, 2, 1, tzinfo=timezone.utc)
+    distinct_values = [(start + timedelta(days=day)).strftime("%Y%m%d%H%M%S") for day in range(args.distinct)]
+    values = [distinct_values[index % args.distinct] for index in range(args.count)]
+
+    mismatches = [value for value in distinct_values if parse_timestamp(value) != parse_with_strptime(value)]
+    if mismatches:
+        sys.stdout.write(f"Parsed datetimes differ for {len(mismatches)} strings: {mismatches}\n")
+        sys.exit(1)
+
+    strptime_seconds = timeit.timeit(lambda: [parse_with_strptime(value) for value in values], number=1)
+    parse_timestamp.cache_clear()
+    cached_seconds = timeit.timeit(lambda: [parse_timestamp(value) for value in values], number=1)
+    parse_timestamp.cache_clear()
+    uncached_seconds = timeit.timeit(lambda: [parse_timestamp.__wrapped__(value) for value in values], number=1)
+
+    sys.stdout.write(f"Parsed {args.count:,} datetime strings ({args.distinct:,} distinct) with identical results\n")
+    sys.stdout.write(f"  strptime + make_aware:     {args.count / strptime_seconds:>12,.0f} strings/sec\n")
+    sys.stdout.write(f"  parse_timestamp, uncached: {args.count / uncached_seconds:>12,.0f} strings/sec\n")
+    sys.stdout.write(f"  parse_timestamp, cached:   {args.count / cached_seconds:>12,.0f} strings/sec\n")
+    sys.stdout.write(f"  speed up:                  {strptime_seconds / cached_seconds:>12.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark each stage of the import pipeline over a synthetic D0010 file: splitting, validating and importing."""
+
+import argparse
+import io
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from benchmarks import setup_django
+from benchmarks.bench_sqlite_pragmas import use_new_database
+from benchmarks.generators import generate_flow_file
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from meter_readings.importers.flow_files import DEFAULT_BATCH_SIZE, import_flow_file  # noqa: E402
+from meter_readings.importers.parsers import FlowFileParser  # noqa: E402
+from meter_readings.importers.sources import FlowFileSource  # noqa: E402
+from meter_readings.importers.tokenizers import FlowFileTokenizer  # noqa: E402
+from meter_readings.utils.databases import count_queries  # noqa: E402
+
+
+def split_rows(data: bytes) -> int:
+    """Split a file into rows, returning the number of rows."""
+    return sum(1 for _ in FlowFileTokenizer().iter_rows(io.BytesIO(data)))
+
+
+def validate_rows(data: bytes) -> int:
+    """Split a file into rows, then parse and validate them into energy readings, returning the number of readings."""
+    return sum(1 for _ in FlowFileParser().iter_records(FlowFileTokenizer().iter_rows(io.BytesIO(data))))
+
+
+def peak_memory(function: Callable[[], object]) -> int:
+    """Return the peak number of bytes allocated by a function, over what was allocated before it was called."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    """Time each stage of the import pipeline, also measuring its peak memory and the queries it runs."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mpans", type=int, default=20000, help="Number of MPAN cores in the file")
+    parser.add_argument("--registers", type=int, default=2, help="Number of registers per meter")
+    parser.add_argument(
+        "--optional-ratio",
+        type=float,
+        default=0.2,
+        help="Proportion of optional (027, 029, 032 and 033) rows written",
+    )
+    parser.add_argument("--invalid-ratio", type=float, default=0.0, help="Proportion of rows made invalid")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generated file")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Readings per bulk insert")
+    parser.add_argument("--runs", type=int, default=3, help="Number of times each stage is run")
+    args = parser.parse_args()
+
+    flow_file = generate_flow_file(
+        mpan_count=args.mpans,
+        registers_per_meter=args.registers,
+        optional_row_ratio=args.optional_ratio,
+        invalid_row_ratio=args.invalid_ratio,
+        seed=args.seed,
+    )
+    data = flow_file.content.encode()
+    sys.stdout.write(
+        f"Generated a {len(data) / 1_000_000:.1f}MB file of {flow_file.row_count:,} rows "
+        f"({flow_file.reading_count:,} readings, {flow_file.invalid_row_count:,} invalid rows)\n",
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = Path(directory) / "synthetic.uff"
+        file_path.write_bytes(data)
+        use_new_database(Path(directory) / "db.sqlite3")
+        source = FlowFileSource(file_path)
+
+        def import_file() -> int:
+            """Import the file into SQLite, returning the number of readings written."""
+            result = import_flow_file(source, args.batch_size, force=True)
+            if result.errors and not flow_file.invalid_row_count:
+                sys.stdout.write(f"Unexpected errors importing the file: {result.errors[:5]}\n")
+                sys.exit(1)
+            return result.reading_count
+
+        stages = {
+            "split": lambda: split_rows(data),
+            "validate": lambda: validate_rows(data),
+            "import (SQLite)": import_file,
+        }
+        sys.stdout.write(f"{'stage':<16} {'rows/sec':>12} {'seconds':>9} {'peak memory':>12} {'queries':>8}\n")
+        for name, stage in stages.items():
+            # Time without tracing memory allocations, which slows everything down, then measure memory separately
+            seconds = min(timeit.repeat(stage, number=1, repeat=args.runs))
+            with count_queries() as queries:
+                peak_bytes = peak_memory(stage)
+            sys.stdout.write(
+                f"{name:<16} {flow_file.row_count / seconds:>12,.0f} {seconds:>9.3f} "
+                f"{peak_bytes / 1_000_000:>10.1f}MB {queries.count:>8,}\n",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark importing into SQLite with and without the bulk import pragmas, while the admin queries the readings."""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from io import StringIO
+from pathlib import Path
+
+from benchmarks import setup_django
+from benchmarks.bench_compression import build_large_file
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.conf import settings  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import OperationalError, connection, connections  # noqa: E402
+
+from meter_readings.models.energy_readings import EnergyReading  # noqa: E402
+
+
+def use_new_database(database_path: Path) -> None:
+    """Point the default database at a new SQLite file, and create its tables."""
+    connections.close_all()
+    connection.settings_dict["NAME"] = database_path
+    call_command("migrate", verbosity=0)
+
+
+def query_like_admin(stop: threading.Event, latencies: list[float], errors: list[str]) -> None:
+    """Run the queries of the energy readings admin page until stopped, recording the time each took."""
+    while not stop.is_set():
+        start_time = time.perf_counter()
+        try:
+            EnergyReading.objects.count()
+            list(EnergyReading.objects.order_by("-id")[:100])
+        except OperationalError as error:
+            errors.append(str(error))
+        else:
+            latencies.append(time.perf_counter() - start_time)
+        time.sleep(0.01)
+    connection.close()
+
+
+def run_import(directory: Path, *, bulk_import: bool) -> tuple[float, list[float], list[str]]:
+    """Import a directory of files while querying like the admin, returning the time taken and query latencies."""
+    stop = threading.Event()
+    latencies: list[float] = []
+    errors: list[str] = []
+    reader = threading.Thread(target=query_like_admin, args=(stop, latencies, errors))
+    reader.start()
+    start_time = time.perf_counter()
+    try:
+        call_command("import_d0010_files", str(directory), force=True, bulk_import=bulk_import, stdout=StringIO())
+    finally:
+        elapsed_seconds = time.perf_counter() - start_time
+        stop.set()
+        reader.join()
+    return elapsed_seconds, latencies, errors
+
+
+def main() -> None:
+    """Time importing files into a SQLite database file with the default pragmas and with the bulk import pragmas."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "file_path",
+        nargs="?",
+        type=Path,
+        default=settings.BASE_DIR.parent / "data" / "DTC5259515123502080915D0010.uff",
+    )
+    parser.add_argument("--repeat", type=int, default=50, help="Number of times the body of each file is repeated")
+    parser.add_argument("--files", type=int, default=100, help="Number of files imported")
+    args = parser.parse_args()
+
+    content = build_large_file(args.file_path, args.repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        flow_directory = Path(directory) / "flows"
+        flow_directory.mkdir()
+        for index in range(args.files):
+            (flow_directory / f"flow_{index}.uff").write_text(content)
+
+        sys.stdout.write(f"Importing {args.files} files into SQLite while querying like the admin:\n")
+        for name, bulk_import in {"default": False, "bulk import": True}.items():
+            use_new_database(Path(directory) / f"{name.replace(' ', '_')}.sqlite3")
+            elapsed_seconds, latencies, errors = run_import(flow_directory, bulk_import=bulk_import)
+            reading_count = EnergyReading.objects.count()
+            latencies_ms = sorted(latency * 1000 for latency in latencies) or [0.0]
+            sys.stdout.write(
+                f"  {name:<12} {reading_count / elapsed_seconds:>9,.0f} rows/sec, "
+                f"admin queries: {len(latencies)} ran (median {statistics.median(latencies_ms):.1f}ms, "
+                f"p95 {latencies_ms[int(len(latencies_ms) * 0.95)]:.1f}ms, max {latencies_ms[-1]:.1f}ms), "
+                f"{len(errors)} failed\n",
+            )
+        connections.close_all()
+
+
+if __name__ == "__main__":
+    main()
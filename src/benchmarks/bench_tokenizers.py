@@ -0,0 +1,100 @@
+"""Benchmark splitting D0010 files into rows with the bytes tokenizer against a text mode csv.reader."""
+
+import argparse
+import csv
+import io
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+from benchmarks import setup_django
+from benchmarks.bench_compression import build_large_file
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.conf import settings  # noqa: E402
+
+from meter_readings.importers.parsers import FlowFileParser  # noqa: E402
+from meter_readings.importers.tokenizers import RECORD_CODES, FlowFileTokenizer  # noqa: E402
+
+
+def read_with_csv(file_path: Path) -> Iterator[list[str]]:
+    """Split a file into rows the way files were read before the tokenizer: in text mode with a csv.reader."""
+    with file_path.open(mode="r") as file:
+        yield from csv.reader(file, delimiter="|")
+
+
+def read_with_tokenizer(file_path: Path, *, use_mmap: bool = False) -> Iterator[list[str]]:
+    """Split a file into rows with the bytes tokenizer."""
+    with file_path.open(mode="rb") as file:
+        yield from FlowFileTokenizer().iter_rows(file, use_mmap=use_mmap)
+
+
+def count_rows(rows: Iterable[list[str]]) -> int:
+    """Consume rows one at a time, as the parser does, returning the number of rows."""
+    return sum(1 for _ in rows)
+
+
+def parse_rows(rows: Iterable[list[str]]) -> int:
+    """Parse rows into energy readings, returning the number of readings."""
+    return sum(1 for _ in FlowFileParser().iter_records(rows))
+
+
+def best_time(function: Callable[[], object], runs: int) -> float:
+    """Return the fastest time taken by a function over a number of runs (with garbage collection disabled)."""
+    return min(timeit.repeat(function, number=1, repeat=runs))
+
+
+def main() -> None:
+    """Time splitting (and then parsing) a large D0010 file with a csv.reader and with the tokenizer."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "file_path",
+        nargs="?",
+        type=Path,
+        default=settings.BASE_DIR.parent / "data" / "DTC5259515123502080915D0010.uff",
+    )
+    parser.add_argument("--repeat", type=int, default=5000, help="Number of times the body of the file is repeated")
+    parser.add_argument("--runs", type=int, default=5, help="Number of times each file is read")
+    args = parser.parse_args()
+
+    content = build_large_file(args.file_path, args.repeat)
+    data = content.encode()
+    megabytes = len(data) / 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = Path(directory) / "flow.uff"
+        file_path.write_text(content)
+
+        csv_rows = [row for row in read_with_csv(file_path) if not row or row[0] in RECORD_CODES]
+        if list(read_with_tokenizer(file_path)) != csv_rows:
+            sys.stdout.write("Rows split by the tokenizer differ from those split by the csv.reader\n")
+            sys.exit(1)
+
+        readers = {
+            "csv.reader": lambda: count_rows(read_with_csv(file_path)),
+            "tokenizer": lambda: count_rows(read_with_tokenizer(file_path)),
+            "tokenizer (mmap)": lambda: count_rows(read_with_tokenizer(file_path, use_mmap=True)),
+        }
+        row_count = content.count("\n")
+        sys.stdout.write(f"Split {megabytes:.1f}MB ({row_count:,} rows) into identical rows:\n")
+        for name, read in readers.items():
+            seconds = best_time(read, args.runs)
+            sys.stdout.write(
+                f"  {name:<17} {row_count / seconds:>12,.0f} rows/sec {megabytes / seconds:>7.1f}MB/s\n",
+            )
+
+        sys.stdout.write("Split and parsed into energy readings, from memory:\n")
+        parsers = {
+            "csv.reader": lambda: parse_rows(csv.reader(io.StringIO(content), delimiter="|")),
+            "tokenizer": lambda: parse_rows(FlowFileTokenizer().iter_rows(io.BytesIO(data))),
+        }
+        for name, parse in parsers.items():
+            seconds = best_time(parse, args.runs)
+            sys.stdout.write(f"  {name:<17} {row_count / seconds:>12,.0f} rows/sec\n")
+
+
+if __name__ == "__main__":
+    main()
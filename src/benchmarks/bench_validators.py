@@ -0,0 +1,98 @@
+"""Benchmark fast-path row validation against validating every row with pydantic."""
+
+import argparse
+import csv
+import sys
+import timeit
+from pathlib import Path
+
+from benchmarks import setup_django
+
+setup_django()
+
+# pylint: disable=wrong-import-position
+from django.conf import settings  # noqa: E402
+from pydantic import BaseModel, ValidationError  # noqa: E402
+
+from meter_readings.importers.validators import (  # noqa: E402
+    METER_READING_TYPE_VALIDATOR,
+    METER_READING_VALIDATION_RESULT_VALIDATOR,
+    MPAN_CORE_VALIDATOR,
+    REGISTER_READING_VALIDATOR,
+    SITE_VISIT_VALIDATOR,
+    ZHV_HEADER_VALIDATOR,
+    ZPT_FOOTER_VALIDATOR,
+    RecordValidator,
+)
+
+VALIDATORS_BY_RECORD_CODE: dict[str, RecordValidator[BaseModel]] = {
+    "ZHV": ZHV_HEADER_VALIDATOR,
+    "026": MPAN_CORE_VALIDATOR,
+    "027": SITE_VISIT_VALIDATOR,
+    "028": METER_READING_TYPE_VALIDATOR,
+    "030": REGISTER_READING_VALIDATOR,
+    "032": METER_READING_VALIDATION_RESULT_VALIDATOR,
+    "ZPT": ZPT_FOOTER_VALIDATOR,
+}
+
+
+def validate_with_pydantic(validator: RecordValidator[BaseModel], row: list[str]) -> BaseModel:
+    """Validate a row the way every row was validated before the fast path: with pydantic's model_validate."""
+    model = validator.model
+    return model.model_validate(dict(zip(list(model.model_fields.keys()), row, strict=False)))
+
+
+def outcome(validate: object, validator: RecordValidator[BaseModel], row: list[str]) -> object:
+    """Return the validated model, or None if the row is invalid."""
+    try:
+        return validate(validator, row)  # type: ignore[operator]
+    except ValidationError:
+        return None
+
+
+def main() -> None:
+    """Time both validation paths over the rows of a D0010 file and check they give identical results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "file_path",
+        nargs="?",
+        type=Path,
+        default=settings.BASE_DIR.parent / "data" / "DTC5259515123502080915D0010.uff",
+    )
+    parser.add_argument("--repeat", type=int, default=2000, help="Number of times every row is validated")
+    args = parser.parse_args()
+
+    with args.file_path.open() as file:
+        rows = [
+            (VALIDATORS_BY_RECORD_CODE[row[0]], row)
+            for row in csv.reader(file, delimiter="|")
+            if row and row[0] in VALIDATORS_BY_RECORD_CODE
+        ]
+
+    mismatches = [
+        row
+        for validator, row in rows
+        if outcome(RecordValidator.validate, validator, row) != outcome(validate_with_pydantic, validator, row)
+    ]
+    if mismatches:
+        sys.stdout.write(f"Accept/reject results differ for {len(mismatches)} rows: {mismatches}\n")
+        sys.exit(1)
+
+    row_count = len(rows) * args.repeat
+    pydantic_seconds = timeit.timeit(
+        lambda: [validate_with_pydantic(validator, row) for validator, row in rows],
+        number=args.repeat,
+    )
+    fast_path_seconds = timeit.timeit(
+        lambda: [validator.validate(row) for validator, row in rows],
+        number=args.repeat,
+    )
+
+    sys.stdout.write(f"Validated {row_count:,} rows with identical accept/reject results\n")
+    sys.stdout.write(f"  pydantic model_validate: {row_count / pydantic_seconds:>12,.0f} rows/sec\n")
+    sys.stdout.write(f"  fast path:               {row_count / fast_path_seconds:>12,.0f} rows/sec\n")
+    sys.stdout.write(f"  speed up:                {pydantic_seconds / fast_path_seconds:>12.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
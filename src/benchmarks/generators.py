@@ -0,0 +1,99 @@
+"""Generate synthetic D0010 flow files of any size, for benchmarking the import pipeline.
+
+Files are generated from a seed, so the same arguments always generate the same file.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from meter_readings.schemas.meter_reading_types import READING_TYPES
+from meter_readings.schemas.meter_reading_validation_results import METER_READING_REASON_CODES
+from meter_readings.schemas.site_visits import J0024_VALID_SET
+
+# Register IDs of meters with one register, or with several (e.g. day and night)
+SINGLE_REGISTER_IDS = ("S", "TO", "A1", "01")
+MULTIPLE_REGISTER_IDS = ("01", "02", "03", "04", "05", "06", "07", "08", "09", "10")
+
+# Earliest reading date, with readings spread over the following year
+FIRST_READING_AT = datetime(2016, 1, 1)  # noqa: DTZ001
+
+
+class SyntheticFlowFile(NamedTuple):
+    """A generated D0010 flow file, alongside what importing it is expected to give."""
+
+    content: str
+    # Number of rows, including the header and footer
+    row_count: int
+    # Number of energy readings (one per register reading row)
+    reading_count: int
+    # Number of rows made deliberately invalid
+    invalid_row_count: int
+
+
+def generate_flow_file(  # noqa: PLR0913
+    mpan_count: int = 1000,
+    registers_per_meter: int = 1,
+    optional_row_ratio: float = 0.0,
+    invalid_row_ratio: float = 0.0,
+    seed: int = 0,
+    file_identifier: str = "0000000001",
+) -> SyntheticFlowFile:
+    """Generate a D0010 flow file with one meter per MPAN core.
+
+    Each optional row (027 and 029 site visits, 032 validation results and 033 register site visits) is written with
+    a probability of `optional_row_ratio`, and each row of the body is made invalid (so that the parser rejects it)
+    with a probability of `invalid_row_ratio`.
+    """
+    generator = random.Random(seed)  # noqa: S311
+    visit_reasons = sorted(J0024_VALID_SET)
+    reading_types = sorted(READING_TYPES)
+    validation_reasons = sorted(METER_READING_REASON_CODES)
+    register_ids = MULTIPLE_REGISTER_IDS if registers_per_meter > 1 else SINGLE_REGISTER_IDS
+
+    body: list[str] = []
+    reading_count = 0
+    for _ in range(mpan_count):
+        body.append(f"026|{generator.randrange(10**12, 10**13)}|V|")
+        if generator.random() < optional_row_ratio:
+            body.append(f"027|{generator.choice(visit_reasons)}|Visited at {generator.randrange(24):02}:00|")
+        body.append(f"028|M{generator.randrange(10**8):08}|{generator.choice(reading_types)}|")
+        if generator.random() < optional_row_ratio:
+            body.append(f"029|{generator.choice(visit_reasons)}||")
+
+        reading_at = FIRST_READING_AT + timedelta(days=generator.randrange(366))
+        for register_index in range(registers_per_meter):
+            register_id = register_ids[register_index % len(register_ids)]
+            register_reading = generator.randrange(10**6) / 10
+            body.append(f"030|{register_id}|{reading_at:%Y%m%d%H%M%S}|{register_reading:.1f}|||T|N|")
+            reading_count += 1
+            if generator.random() < optional_row_ratio:
+                body.append(f"032|{generator.choice(validation_reasons)}|{generator.choice('TF')}|")
+            if generator.random() < optional_row_ratio:
+                body.append(f"033|{generator.choice(visit_reasons)}|Reading checked|")
+
+    invalid_row_count = 0
+    if invalid_row_ratio:
+        for index, row in enumerate(body):
+            if generator.random() < invalid_row_ratio:
+                body[index] = make_row_invalid(row)
+                invalid_row_count += 1
+
+    created_at = f"{FIRST_READING_AT + timedelta(days=367):%Y%m%d%H%M%S}"
+    rows = [
+        f"ZHV|{file_identifier}|D0010002|D|UDMS|X|MRCY|{created_at}||||OPER|",
+        *body,
+        f"ZPT|{file_identifier}|{len(body)}||{mpan_count}|{created_at}|",
+    ]
+    return SyntheticFlowFile(
+        content="\n".join(rows) + "\n",
+        row_count=len(rows),
+        reading_count=reading_count,
+        invalid_row_count=invalid_row_count,
+    )
+
+
+def make_row_invalid(row: str) -> str:
+    """Return a row which fails validation: its record code is kept, but its first field is made too long."""
+    code, _, fields = row.partition("|")
+    return f"{code}|{'X' * 300}|{fields}"
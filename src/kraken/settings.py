@@ -125,3 +125,69 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# D0010 flow file imports
+
+# Encoding of flow files (D0010 files are ASCII, a subset of UTF-8)
+D0010_FILE_ENCODING = "utf-8"
+
+# Memory map uncompressed flow files rather than reading them in blocks
+D0010_USE_MMAP = False
+
+# Dotted path of the class writing energy readings to the database (e.g.
+# "meter_readings.importers.loaders.EnergyReadingLoader" to use the ORM). By default, the fastest loader for the
+# database engine is used: COPY on PostgreSQL and executemany on SQLite.
+D0010_LOADER = None
+
+# Dotted path of the class searching energy readings in the admin (e.g.
+# "meter_readings.searches.backends.ReadingSearchBackend" for the admin's default LIKE lookups). By default, the search
+# table of the database engine is used: an FTS5 trigram table on SQLite and a pg_trgm GIN index on PostgreSQL.
+D0010_SEARCH_BACKEND = None
+
+# Pragmas set on a SQLite database for the duration of a bulk import (`import_d0010_files --bulk-import`), after
+# which their previous values are restored:
+# - WAL lets the admin read the database while files are imported, and with synchronous NORMAL only checkpoints
+#   are synced to disk (an imported file may be lost on power failure, but the database cannot be corrupted)
+# - A 64MB page cache, temporary tables in memory and a 256MB memory map reduce reads from disk
+D0010_SQLITE_BULK_IMPORT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+# Always import flow files in bulk import mode, as if `--bulk-import` was given
+D0010_BULK_IMPORT = False
+
+# Directory the report of each profiled import is written to (`import_d0010_files --profile`)
+D0010_PROFILE_DIR = BASE_DIR / "profiles"
+
+# Profiler of the files sampled below: "cprofile" (a .prof report of the time spent in each function, readable with
+# pstats) or "tracemalloc" (a .tracemalloc snapshot of the memory allocated by each line)
+D0010_PROFILER = "cprofile"
+
+# Proportion of imported files profiled without `--profile`, chosen at random (e.g. 0.01 to profile 1 file in 100
+# while `watch_d0010` runs). 0 profiles no file
+D0010_PROFILE_SAMPLE_RATE = 0.0
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+
+# Statistics of each file imported with `import_d0010_files --stats` are logged as JSON lines to stderr, for log
+# pipelines to collect
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "message": {"format": "%(message)s"},
+    },
+    "handlers": {
+        "import_stats": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "meter_readings.import_stats": {"handlers": ["import_stats"], "level": "INFO"},
+    },
+}
@@ -1,11 +1,34 @@
 """Admin registered models."""
 
+import copy
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
 from django.contrib import admin
-from django.db.models import Model
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Model, QuerySet, Sum
+from django.db.models.functions import TruncMonth, TruncYear
 from django.http import HttpRequest
+from django.utils import timezone
 
-from meter_readings.models.energy_readings import EnergyReading
+from meter_readings.models.date_buckets import DateBucket
+from meter_readings.models.energy_readings import EnergyReading, Reading
 from meter_readings.models.flow_files import FlowFile, FlowFileMetadata
+from meter_readings.models.import_jobs import ImportJob
+from meter_readings.models.import_runs import ImportRun, ImportRunFile
+from meter_readings.models.meters import Meter, Register
+from meter_readings.models.mpans import MPAN
+from meter_readings.models.site_visits import SiteVisit
+from meter_readings.models.watch_checkpoints import WatchCheckpoint
+from meter_readings.searches.backends import get_reading_search_backend
+from meter_readings.searches.queries import classify_search_term
+from meter_readings.utils.paginators import EstimatedCountPaginator, KeysetPaginator
+
+# Query string parameter holding the key of the last object of the previous page, when paging by seeking
+KEYSET_VAR = "after"
 
 
 class ReadOnlyAdminMixin:
@@ -24,12 +47,161 @@ class ReadOnlyAdminMixin:
         return False
 
 
+class KeysetChangeList(ChangeList):
+    """Changelist which can also page through results by seeking (`?after=<key>`), in the admin's default ordering.
+
+    Numbered pages skip every row before them (with OFFSET), whereas a seek page starts straight after the last object
+    of the previous page (see KeysetPaginator), so deep pages cost the same as the first.
+    """
+
+    def __init__(self, request: HttpRequest, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Read the key to page after, which is not a filter, so is left out of the filters and of their links."""
+        self.keyset_after = request.GET.get(KEYSET_VAR)
+        self.keyset_next_url = ""
+        if self.keyset_after is not None:
+            request = copy.copy(request)
+            request.GET = request.GET.copy()
+            del request.GET[KEYSET_VAR]
+        super().__init__(request, *args, **kwargs)
+
+    def get_results(self, request: HttpRequest) -> None:
+        """Find the results of the page, seeking past the key given, and the link to seek to the next page."""
+        super().get_results(request)
+        if ORDER_VAR in self.params or (self.show_all and self.can_show_all):
+            # Results are only paged by seeking in the default ordering: by the keyset field, then by key
+            self.keyset_after = None
+            return
+
+        if self.keyset_after is None:
+            self.result_list = list(self.result_list)
+            has_next_page = self.multi_page and self.page_num < self.paginator.num_pages
+            next_key = self.result_list[-1].pk if has_next_page and self.result_list else None
+        else:
+            paginator = KeysetPaginator(self.queryset, self.model_admin.keyset_field, self.list_per_page)
+            try:
+                page = paginator.page_after(self.opts.pk.to_python(self.keyset_after))
+            except (InvalidPage, ValidationError) as error:
+                raise IncorrectLookupParameters from error
+            self.result_list = page.object_list
+            next_key = page.next_key
+
+        if next_key is not None:
+            self.keyset_next_url = self.get_query_string({KEYSET_VAR: next_key}, remove=[PAGE_VAR])
+
+
+class KeysetPaginationAdminMixin:
+    """Page through the changelist by seeking on a field then the key, as well as by page number.
+
+    The admin must be ordered by the field then the key, both descending.
+    """
+
+    keyset_field = ""
+
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> type[ChangeList]:  # noqa: ANN401
+        """Return the changelist class, which pages by seeking."""
+        return KeysetChangeList
+
+
+class EnergyReadingPaginator(EstimatedCountPaginator):
+    """Paginator estimating the number of energy readings from the table of readings, of which they are a view."""
+
+    estimated_model = Reading
+
+
+class DateBucketFilter(admin.SimpleListFilter):
+    """Navigate by year, then month, then day, with their counts read from date buckets (see DateBucket).
+
+    Django's date hierarchy finds the distinct dates of every row each time the changelist is shown; the buckets
+    hold a row per day. Counts are of every row, whatever other filters are applied.
+    """
+
+    series: DateBucket.Series
+    # Date (or datetime) field filtered
+    field_name = ""
+
+    def lookups(self, request: HttpRequest, model_admin: admin.ModelAdmin) -> list[tuple[str, str]]:
+        """Return every year, the months of the selected year and the days of the selected month, with counts."""
+        buckets = DateBucket.objects.filter(series=self.series)
+        value = self.value() or ""
+        choices = []
+        for year, year_count in sum_buckets(buckets, TruncYear("date")):
+            choices.append((f"{year:%Y}", f"{year:%Y} ({year_count:,})"))
+            if not value.startswith(f"{year:%Y}"):
+                continue
+            for month, month_count in sum_buckets(buckets.filter(date__year=year.year), TruncMonth("date")):
+                choices.append((f"{month:%Y-%m}", f"{month:%B %Y} ({month_count:,})"))
+                if value.startswith(f"{month:%Y-%m}"):
+                    days = buckets.filter(date__year=month.year, date__month=month.month).order_by("date")
+                    choices.extend((f"{day.date}", f"{day.date:%d %B %Y} ({day.count:,})") for day in days)
+        return choices
+
+    def queryset(self, request: HttpRequest, queryset: QuerySet) -> QuerySet:
+        """Return the rows dated within the selected year, month or day (an indexed range lookup)."""
+        if not self.value():
+            return queryset
+        try:
+            start, end = get_period(self.value())
+        except ValueError as error:
+            raise IncorrectLookupParameters(error) from error
+        if queryset.model._meta.get_field(self.field_name).get_internal_type() == "DateTimeField":
+            # Days start at midnight in the current time zone, as Django's date hierarchy does
+            start, end = (timezone.make_aware(datetime.combine(day, time())) for day in (start, end))
+        return queryset.filter(**{f"{self.field_name}__gte": start, f"{self.field_name}__lt": end})
+
+
+def sum_buckets(buckets: QuerySet, period: TruncYear | TruncMonth) -> list[tuple[date, int]]:
+    """Return the total count of the buckets in each period (e.g. year), in date order."""
+    return list(
+        buckets.annotate(period=period)
+        .values("period")
+        .annotate(total=Sum("count"))
+        .order_by("period")
+        .values_list("period", "total"),
+    )
+
+
+def get_period(value: str) -> tuple[date, date]:
+    """Return the first day and the (exclusive) last day of a year (YYYY), month (YYYY-MM) or day (YYYY-MM-DD).
+
+    Raise ValueError if the value is none of them.
+    """
+    parts = [int(part) for part in value.split("-")]
+    if len(parts) == 1:
+        return date(parts[0], 1, 1), date(parts[0] + 1, 1, 1)
+    if len(parts) == 2:  # noqa: PLR2004
+        year, month = parts
+        return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+    if len(parts) == 3:  # noqa: PLR2004
+        day = date(*parts)
+        return day, day + timedelta(days=1)
+    msg = f"Date must be in the format YYYY, YYYY-MM or YYYY-MM-DD but is instead {value}."
+    raise ValueError(msg)
+
+
+class ReadingDateFilter(DateBucketFilter):
+    """Navigate readings by the date they were taken."""
+
+    title = "reading date"
+    parameter_name = "reading_date"
+    series = DateBucket.Series.READING_AT
+    field_name = "reading_at"
+
+
+class FileCreatedDateFilter(DateBucketFilter):
+    """Navigate flow files by the date they were created."""
+
+    title = "file creation date"
+    parameter_name = "file_created_date"
+    series = DateBucket.Series.FILE_CREATED_AT
+    field_name = "file_created_at"
+
+
 @admin.register(FlowFile)
 class FlowFileAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
     """Admin view for FlowFile."""
 
-    list_display = ("name", "extension", "imported_at")
-    search_fields = ("name",)
+    list_display = ("name", "extension", "file_identifier", "imported_at", "completed_at")
+    search_fields = ("name", "file_identifier")
     list_filter = ("extension", "imported_at")
 
 
@@ -59,6 +231,8 @@ class FlowFileMetadataAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
         "file_created_at",
         "file_completed_at",
     )
+    # Join each flow file up front, rather than querying it for every row
+    list_select_related = ("flow_file",)
 
     # Fields that can be searched
     search_fields = (
@@ -79,16 +253,24 @@ class FlowFileMetadataAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
         "to_market_participant_role_code",
         "broadcast",
         "test_data_flag",
+        # Navigate by dates, with counts from date buckets rather than a date hierarchy querying every row
+        FileCreatedDateFilter,
     )
 
-    # Date hierarchy to make it easier to navigate by dates
-    date_hierarchy = "file_created_at"
-
 
 @admin.register(EnergyReading)
-class EnergyReadingAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+class EnergyReadingAdmin(ReadOnlyAdminMixin, KeysetPaginationAdminMixin, admin.ModelAdmin):
     """Admin view for EnergyReading."""
 
+    # Newest readings first, paged by seeking past the date and ID of the last reading of each page
+    ordering = ("-reading_at", "-id")
+    keyset_field = "reading_at"
+    # Estimate the number of readings, rather than counting them twice (filtered and not) for every page
+    paginator = EnergyReadingPaginator
+    show_full_result_count = False
+    # Join each flow file up front, rather than querying it for every row
+    list_select_related = ("flow_file",)
+
     # Display these fields in the list view
     list_display = (
         # Primary focus fields
@@ -112,7 +294,7 @@ class EnergyReadingAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
         "register_reading_site_visit_reason",
     )
 
-    # Fields that can be searched
+    # Fields that can be searched (with the search table of the database, see `get_search_results`)
     search_fields = (
         "flow_file__name",
         "mpan_core",
@@ -121,5 +303,129 @@ class EnergyReadingAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
         "reading_at",
     )
 
-    # Date hierarchy to make it easier to navigate by dates
-    date_hierarchy = "reading_at"
+    # Navigate by dates, with counts from date buckets rather than a date hierarchy querying every reading. The counts
+    # of the filter are shown with its choices, rather than as facets counting every reading per choice
+    list_filter = (ReadingDateFilter,)
+    show_facets = admin.ShowFacets.NEVER
+
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet,
+        search_term: str,
+    ) -> tuple[QuerySet, bool]:
+        """Return the readings matching a search term, with the indexes of the database.
+
+        A term which is unmistakably an MPAN core, meter ID, date (or range of dates) or register reading is an exact
+        (or range) lookup of its column. Any other term is looked up in the search table, or, if the search table
+        cannot look it up (e.g. with a word shorter than 3 characters), searched with the default lookups of
+        `search_fields`, which scan every reading.
+        """
+        if typed_search := classify_search_term(search_term):
+            return queryset.filter(**typed_search.lookups), False
+
+        readings = get_reading_search_backend().search(queryset, search_term)
+        if readings is None:
+            return super().get_search_results(request, queryset, search_term)
+        return readings, False
+
+
+@admin.register(Reading)
+class ReadingAdmin(ReadOnlyAdminMixin, KeysetPaginationAdminMixin, admin.ModelAdmin):
+    """Admin view for Reading."""
+
+    list_display = ("id", "flow_file", "mpan", "meter", "register", "reading_at", "register_reading")
+    list_select_related = ("flow_file", "mpan", "meter", "register")
+    ordering = ("-reading_at", "-id")
+    keyset_field = "reading_at"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(MPAN)
+class MPANAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin view for MPAN."""
+
+    list_display = ("mpan_core", "bsc_validation_status")
+    search_fields = ("mpan_core",)
+    list_filter = ("bsc_validation_status",)
+
+
+@admin.register(Meter)
+class MeterAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin view for Meter."""
+
+    list_display = ("meter_id", "meter_reading_type")
+    search_fields = ("meter_id",)
+    list_filter = ("meter_reading_type",)
+
+
+@admin.register(Register)
+class RegisterAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin view for Register."""
+
+    list_display = ("meter", "meter_register_id")
+    search_fields = ("meter__meter_id", "meter_register_id")
+    list_select_related = ("meter",)
+
+
+@admin.register(SiteVisit)
+class SiteVisitAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin view for SiteVisit."""
+
+    list_display = ("visit_reason", "additional_information")
+    search_fields = ("additional_information",)
+    list_filter = ("visit_reason",)
+
+
+@admin.register(DateBucket)
+class DateBucketAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin view for DateBucket."""
+
+    list_display = ("series", "date", "count")
+    list_filter = ("series",)
+
+
+@admin.register(WatchCheckpoint)
+class WatchCheckpointAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin view for WatchCheckpoint."""
+
+    list_display = ("directory", "imported_count", "failed_count", "updated_at")
+
+
+@admin.register(ImportRun)
+class ImportRunAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin view for ImportRun."""
+
+    list_display = ("id", "path", "started_at", "finished_at")
+    search_fields = ("path",)
+
+
+@admin.register(ImportRunFile)
+class ImportRunFileAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin view for ImportRunFile."""
+
+    list_display = ("run", "relative_path", "member", "status", "reading_count", "error_count", "elapsed_seconds")
+    search_fields = ("relative_path", "member")
+    list_filter = ("status",)
+    list_select_related = ("run",)
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    """Admin view for ImportJob."""
+
+    list_display = (
+        "id",
+        "path",
+        "status",
+        "attempts",
+        "queued_at",
+        "wait_seconds",
+        "run_seconds",
+        "reading_count",
+        "error_count",
+        "worker",
+    )
+    search_fields = ("path",)
+    list_filter = ("status",)
@@ -0,0 +1 @@
+"""Import pipeline for D0010 flow files."""
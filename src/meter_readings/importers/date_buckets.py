@@ -0,0 +1,40 @@
+"""Keep the counts of readings and flow files per day (see DateBucket) up to date as flow files are imported."""
+
+from collections.abc import Mapping
+from datetime import date
+
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+
+from meter_readings.models.date_buckets import DateBucket
+from meter_readings.models.energy_readings import Reading
+from meter_readings.models.flow_files import FlowFile
+
+
+def add_to_date_buckets(series: DateBucket.Series, counts: Mapping[date, int]) -> None:
+    """Add counts per day to the buckets of a series, creating any bucket not yet created.
+
+    Counts are added to the stored counts in the database (rather than written over them), so flow files imported
+    concurrently each add their own.
+    """
+    if not counts:
+        return
+    DateBucket.objects.bulk_create([DateBucket(series=series, date=day) for day in counts], ignore_conflicts=True)
+    for day, count in counts.items():
+        DateBucket.objects.filter(series=series, date=day).update(count=F("count") + count)
+
+
+def count_reading_dates(flow_file: FlowFile) -> dict[date, int]:
+    """Return the number of readings of a flow file per day (in the current time zone), leaving out undated readings."""
+    return dict(
+        Reading.objects.filter(flow_file=flow_file, reading_at__isnull=False)
+        .annotate(day=TruncDate("reading_at"))
+        .values("day")
+        .annotate(count=Count("id"))
+        .values_list("day", "count"),
+    )
+
+
+def add_flow_file_readings_to_date_buckets(flow_file: FlowFile) -> None:
+    """Add the readings of a newly imported flow file to the reading date buckets."""
+    add_to_date_buckets(DateBucket.Series.READING_AT, count_reading_dates(flow_file))
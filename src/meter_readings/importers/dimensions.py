@@ -0,0 +1,148 @@
+"""Resolve the MPANs, meters, registers and site visits of energy readings to the keys of their database rows."""
+
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import DEFAULT_DB_ALIAS, connections, models
+
+from meter_readings.importers.records import EnergyReadingRecord
+from meter_readings.models.meters import Meter, Register
+from meter_readings.models.mpans import MPAN
+from meter_readings.models.site_visits import SiteVisit
+from meter_readings.schemas.meter_reading_types import MeterReadingType
+from meter_readings.schemas.mpan_cores import MPANCore
+from meter_readings.schemas.site_visits import SiteVisit as SiteVisitSchema
+
+# Values of a row of a dimension table, in the order of its fields
+DimensionValues = tuple[Any, ...]
+
+# Values of the rows standing for a missing MPAN, meter or site visit
+EMPTY_VALUES = ("", "")
+
+
+class DimensionCache:
+    """Keys of the rows of a dimension table (e.g. MPANs), by their values.
+
+    Values are resolved in bulk: rows which already exist are read, and missing rows are created, with a few queries
+    per batch of readings rather than a query per reading. A cache is only used for a single flow file, as rows
+    created while importing a file are rolled back if the file is invalid.
+    """
+
+    def __init__(self, model: type[models.Model], fields: tuple[str, ...], using: str = DEFAULT_DB_ALIAS) -> None:
+        """Prepare to resolve rows of a model, identified by the values of its (unique together) fields."""
+        self.model = model
+        self.fields = fields
+        self.using = using
+        self.keys: dict[DimensionValues, int] = {}
+
+        # Rows are read with SQL rather than the ORM, which is several times slower at building the lookups
+        quote_name = connections[using].ops.quote_name
+        columns = [quote_name(model._meta.get_field(field_name).column) for field_name in fields]
+        self.sql = (
+            f"SELECT {quote_name(model._meta.pk.column)}, {', '.join(columns)} "  # noqa: S608
+            f"FROM {quote_name(model._meta.db_table)} WHERE ({', '.join(columns)}) IN "
+        )
+        # Placeholders of the values of a row, compared with every field of the (unique together) key at once
+        self.row_placeholders = f"({', '.join(['%s'] * len(fields))})"
+
+    def __getitem__(self, values: DimensionValues) -> int:
+        """Return the key of a resolved row."""
+        return self.keys[values]
+
+    def resolve(self, values: Iterable[DimensionValues]) -> None:
+        """Look up (or create) the rows of any values not yet cached."""
+        missing_values = {value for value in values if value not in self.keys}
+        if not missing_values:
+            return
+
+        self.read(missing_values)
+        missing_values = {value for value in missing_values if value not in self.keys}
+        if missing_values:
+            # Rows created by another import in the meantime are ignored, then read back with the new rows
+            self.model.objects.using(self.using).bulk_create(
+                [self.model(**dict(zip(self.fields, value, strict=True))) for value in missing_values],
+                ignore_conflicts=True,
+            )
+            self.read(missing_values)
+
+    def read(self, values: set[DimensionValues]) -> None:
+        """Cache the keys of the rows with the given values which exist.
+
+        Rows are filtered by the values of every field, as a row value, so only the rows asked for are read (through
+        the unique index of the fields), however many others share the value of one of them.
+        """
+        connection = connections[self.using]
+        values_list = list(values)
+        chunk_size = (connection.features.max_query_params or len(values_list) * len(self.fields)) // len(self.fields)
+        with connection.cursor() as cursor:
+            for start in range(0, len(values_list), chunk_size):
+                chunk = values_list[start : start + chunk_size]
+                cursor.execute(
+                    f"{self.sql}({', '.join([self.row_placeholders] * len(chunk))})",
+                    [value for row_values in chunk for value in row_values],
+                )
+                for key, *row_values in cursor.fetchall():
+                    self.keys[tuple(row_values)] = key
+
+
+class ReadingDimensions:
+    """Caches of the MPANs, meters, registers and site visits of the readings of a flow file."""
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS) -> None:
+        """Prepare empty caches for a new flow file."""
+        self.mpans = DimensionCache(MPAN, ("mpan_core", "bsc_validation_status"), using)
+        self.meters = DimensionCache(Meter, ("meter_id", "meter_reading_type"), using)
+        self.registers = DimensionCache(Register, ("meter_id", "meter_register_id"), using)
+        self.site_visits = DimensionCache(SiteVisit, ("visit_reason", "additional_information"), using)
+
+    def resolve(self, records: list[EnergyReadingRecord]) -> None:
+        """Look up (or create) the rows of every MPAN, meter, register and site visit of a batch of readings."""
+        self.mpans.resolve({get_mpan_values(record.mpan.mpan_core) for record in records})
+        self.meters.resolve({get_meter_values(record.meter.meter_reading_type) for record in records})
+        self.site_visits.resolve(
+            {
+                get_site_visit_values(site_visit)
+                for record in records
+                for site_visit in (record.mpan.site_visit, record.meter.site_visit, record.register_reading_site_visit)
+            },
+        )
+        # Registers belong to meters, so are only resolved once the meters have been
+        self.registers.resolve({self.get_register_values(record) for record in records})
+
+    def get_keys(self, record: EnergyReadingRecord) -> tuple[int, int, int, int, int, int]:
+        """Return the keys of the MPAN, meter, register and site visits of a resolved reading.
+
+        Keys are returned in the order of the dimensions of a reading row (see READING_ROW_FIELDS).
+        """
+        site_visit_keys = self.site_visits.keys
+        meter_key = self.meters.keys[get_meter_values(record.meter.meter_reading_type)]
+        register_reading = record.register_reading
+        return (
+            self.mpans.keys[get_mpan_values(record.mpan.mpan_core)],
+            site_visit_keys[get_site_visit_values(record.mpan.site_visit)],
+            meter_key,
+            site_visit_keys[get_site_visit_values(record.meter.site_visit)],
+            self.registers.keys[(meter_key, register_reading.meter_register_id if register_reading else "")],
+            site_visit_keys[get_site_visit_values(record.register_reading_site_visit)],
+        )
+
+    def get_register_values(self, record: EnergyReadingRecord) -> DimensionValues:
+        """Return the values of the register of a reading, whose meter has been resolved."""
+        meter_key = self.meters[get_meter_values(record.meter.meter_reading_type)]
+        register_reading = record.register_reading
+        return (meter_key, register_reading.meter_register_id if register_reading else "")
+
+
+def get_mpan_values(mpan_core: MPANCore | None) -> DimensionValues:
+    """Return the values of the row of an MPAN core, or of the empty MPAN."""
+    return (mpan_core.mpan_core, mpan_core.bsc_validation_status) if mpan_core else EMPTY_VALUES
+
+
+def get_meter_values(meter_reading_type: MeterReadingType | None) -> DimensionValues:
+    """Return the values of the row of a meter, or of the empty meter."""
+    return (meter_reading_type.meter_id, meter_reading_type.reading_type) if meter_reading_type else EMPTY_VALUES
+
+
+def get_site_visit_values(site_visit: SiteVisitSchema | None) -> DimensionValues:
+    """Return the values of the row of a site visit, or of the empty site visit."""
+    return (site_visit.visit_reason, site_visit.additional_information) if site_visit else EMPTY_VALUES
@@ -0,0 +1,348 @@
+"""Import D0010 flow files into the database."""
+
+import hashlib
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path, PurePath
+from typing import BinaryIO
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from meter_readings.importers.date_buckets import add_flow_file_readings_to_date_buckets, add_to_date_buckets
+from meter_readings.importers.dimensions import ReadingDimensions
+from meter_readings.importers.loaders import EnergyReadingLoader, build_reading_row, get_energy_reading_loader
+from meter_readings.importers.parsers import FlowFileParser
+from meter_readings.importers.records import EnergyReadingRecord
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.importers.stats import InstrumentedFlowFileParser, InstrumentedFlowFileTokenizer
+from meter_readings.importers.tokenizers import FlowFileTokenizer
+from meter_readings.models.date_buckets import DateBucket
+from meter_readings.models.flow_files import FlowFile, FlowFileMetadata
+from meter_readings.schemas.footers import ZPTFooter
+from meter_readings.schemas.headers import ZHVHeader
+from meter_readings.schemas.import_results import ImportResult
+from meter_readings.schemas.import_stats import ImportStats
+from meter_readings.searches.backends import get_reading_search_backend
+from meter_readings.utils.databases import count_queries
+
+# Number of energy readings written to the database per INSERT statement
+DEFAULT_BATCH_SIZE = 1000
+
+
+class FlowFileImportedError(Exception):
+    """A flow file with identical content has already been imported (e.g. concurrently, by another worker)."""
+
+
+def import_flow_file(
+    source: FlowFileSource,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    *,
+    force: bool = False,
+    collect_stats: bool = False,
+) -> ImportResult:
+    """Import data from a single D0010 file.
+
+    The file is skipped before being parsed if a file with identical content has already been imported,
+    unless forced.
+    The file is streamed (and decompressed, if need be): energy readings are written in batches as soon as they have
+    been parsed, rather than after the whole file has been read.
+    With `collect_stats`, the time spent in each stage of the import is recorded in the statistics of the result.
+    """
+    start_time = time.perf_counter()
+    content_hash = hash_flow_file(source)
+    if not force and is_flow_file_imported(content_hash):
+        return build_skipped_result(source, time.perf_counter() - start_time)
+
+    parser = build_flow_file_parser(collect_stats=collect_stats)
+    if parser.stats is not None:
+        parser.stats.add_seconds("hash", time.perf_counter() - start_time)
+    with source.open() as file:
+        return import_flow_file_content(
+            source,
+            file,
+            parser,
+            batch_size,
+            content_hash,
+            force=force,
+            start_time=start_time,
+        )
+
+
+def import_flow_file_content(
+    source: FlowFileSource,
+    file: BinaryIO,
+    parser: FlowFileParser,
+    batch_size: int,
+    content_hash: str,
+    *,
+    force: bool = False,
+    start_time: float,
+) -> ImportResult:
+    """Parse the opened (and decompressed) content of a flow file and save it, returning the result of the import.
+
+    The result is skipped if a flow file with identical content has been imported since it was checked, unless
+    forced. Its time is measured from `start_time`, from `time.perf_counter()`.
+    """
+    records = parser.iter_records(iter_flow_file_rows(file, parser.stats))
+    try:
+        reading_count = save_flow_file(source, parser, records, batch_size, content_hash, force=force)
+    except FlowFileImportedError:
+        return build_skipped_result(source, time.perf_counter() - start_time)
+    return build_import_result(source, parser, reading_count, time.perf_counter() - start_time)
+
+
+def build_flow_file_parser(*, collect_stats: bool = False) -> FlowFileParser:
+    """Return a parser for a new flow file, which also collects statistics if asked to."""
+    return InstrumentedFlowFileParser() if collect_stats else FlowFileParser()
+
+
+def iter_flow_file_rows(file: BinaryIO, stats: ImportStats | None = None) -> Iterator[list[str]]:
+    """Split a flow file opened in binary into rows of fields, with the encoding and memory mapping from settings.
+
+    With statistics, the time taken to split the file into rows is recorded in them.
+    """
+    if stats is not None:
+        tokenizer: FlowFileTokenizer = InstrumentedFlowFileTokenizer(stats, encoding=settings.D0010_FILE_ENCODING)
+    else:
+        tokenizer = FlowFileTokenizer(encoding=settings.D0010_FILE_ENCODING)
+    return tokenizer.iter_rows(file, use_mmap=settings.D0010_USE_MMAP)
+
+
+def hash_flow_file(source: FlowFileSource) -> str:
+    """Return the SHA-256 hex digest of the (decompressed) content of a file, read in chunks rather than all at once.
+
+    Hashing the decompressed content means a file is recognised whether it was imported compressed or not.
+    """
+    with source.open() as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def is_flow_file_imported(content_hash: str) -> bool:
+    """Return True if a flow file with the given content hash has already been imported.
+
+    This is only a check made before a file is parsed: a file imported concurrently is caught by the unique
+    constraint on the content of flow files when it is saved (see `create_flow_file`).
+    """
+    return FlowFile.objects.filter(content_hash=content_hash).exists()
+
+
+def parse_flow_file(
+    source: FlowFileSource,
+    *,
+    collect_stats: bool = False,
+) -> tuple[FlowFileParser, list[EnergyReadingRecord]]:
+    """Parse and validate a single D0010 file without writing anything to the database.
+
+    Return the parser (holding the header, footer, any errors and any statistics) and every energy reading in the file.
+    """
+    parser = build_flow_file_parser(collect_stats=collect_stats)
+    with source.open() as file:
+        records = list(parser.iter_records(iter_flow_file_rows(file, parser.stats)))
+    return parser, records
+
+
+def save_flow_file(
+    source: FlowFileSource,
+    parser: FlowFileParser,
+    records: Iterable[EnergyReadingRecord],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    content_hash: str = "",
+    *,
+    force: bool = False,
+) -> int:
+    """Save a flow file and its energy readings to the database.
+
+    The flow file, its metadata and its readings are written within a single transaction, which is rolled back if
+    the parser finds any invalid row. Records may be a generator still being fed by the parser.
+    Return the number of energy readings saved.
+    Raise FlowFileImportedError if a flow file with identical content has been imported since it was checked,
+    unless forced.
+    """
+    if parser.stats is None:
+        return save_flow_file_to_database(source, parser, records, batch_size, content_hash, force=force)
+
+    # Records may still be being parsed, so the time spent parsing meanwhile is not counted as persisting them
+    stats = parser.stats
+    parse_seconds = stats.parse_seconds
+    start_time = time.perf_counter()
+    with count_queries() as queries:
+        reading_count = save_flow_file_to_database(source, parser, records, batch_size, content_hash, force=force)
+    stats.add_seconds("persist", time.perf_counter() - start_time - (stats.parse_seconds - parse_seconds))
+    stats.query_count += queries.count
+    return reading_count
+
+
+def save_flow_file_to_database(
+    source: FlowFileSource,
+    parser: FlowFileParser,
+    records: Iterable[EnergyReadingRecord],
+    batch_size: int,
+    content_hash: str,
+    *,
+    force: bool = False,
+) -> int:
+    """Save a flow file and its energy readings to the database, in a single transaction (see `save_flow_file`)."""
+    with transaction.atomic():
+        flow_file = create_flow_file(source, content_hash, force=force)
+        reading_count = save_energy_readings(flow_file, parser, records, batch_size)
+
+        if parser.errors:
+            # Only keep data in the database if no errors have been found
+            transaction.set_rollback(True)
+            return 0
+
+        complete_flow_file(flow_file, parser)
+
+    return reading_count
+
+
+def create_flow_file(source: FlowFileSource, content_hash: str = "", *, force: bool = False) -> FlowFile:
+    """Create the flow file which the energy readings of a source are saved to.
+
+    Raise FlowFileImportedError if a flow file with identical content has already been imported, unless forced.
+    Where another transaction is writing one (e.g. another worker importing a copy of the file), the database waits
+    for it to commit or roll back first.
+    """
+    name = PurePath(source.name)
+    try:
+        # A savepoint keeps the enclosing transaction usable if the flow file is not unique
+        with transaction.atomic():
+            return FlowFile.objects.create(
+                name=name.stem,
+                extension=name.suffix,
+                archive_name=source.archive_name,
+                content_hash=content_hash,
+                forced=force,
+            )
+    except IntegrityError as error:
+        raise FlowFileImportedError(content_hash) from error
+
+
+def complete_flow_file(flow_file: FlowFile, parser: FlowFileParser) -> None:
+    """Index and count the saved energy readings of a flow file, and save the details of its header and footer.
+
+    The flow file is dated as completed last, just before the transaction of its import is committed.
+    """
+    # Readings are added to the search table and counted by day once they have all been saved
+    get_reading_search_backend().index_flow_file(flow_file)
+    add_flow_file_readings_to_date_buckets(flow_file)
+
+    # The header is only known once the file has been parsed, after the flow file was created
+    if parser.header:
+        flow_file.file_identifier = parser.header.file_identifier
+
+    # Save metadata (from header and footer) to database
+    if parser.header and parser.footer:
+        save_flow_file_metadata(flow_file, parser.header, parser.footer)
+
+    flow_file.completed_at = timezone.now()
+    flow_file.save(update_fields=["file_identifier", "completed_at"])
+
+
+def save_energy_readings(
+    flow_file: FlowFile,
+    parser: FlowFileParser,
+    records: Iterable[EnergyReadingRecord],
+    batch_size: int,
+) -> int:
+    """Save energy readings to the database in batches, with the loader for the database.
+
+    The MPANs, meters, registers and site visits of each batch are looked up (or created) in bulk, and cached for the
+    rest of the file.
+    Every record is consumed so that all errors can be reported, but nothing more is written once the parser has
+    found an error, as the transaction will be rolled back anyway.
+    Return the number of energy readings saved.
+    """
+    loader = get_energy_reading_loader()
+    dimensions = ReadingDimensions()
+    reading_count = 0
+    batch: list[EnergyReadingRecord] = []
+    for record in records:
+        if parser.errors:
+            continue
+
+        batch.append(record)
+        if len(batch) >= batch_size:
+            save_reading_batch(loader, dimensions, flow_file, batch)
+            reading_count += len(batch)
+            batch = []
+
+    if batch and not parser.errors:
+        save_reading_batch(loader, dimensions, flow_file, batch)
+        reading_count += len(batch)
+    return reading_count
+
+
+def save_reading_batch(
+    loader: EnergyReadingLoader,
+    dimensions: ReadingDimensions,
+    flow_file: FlowFile,
+    batch: list[EnergyReadingRecord],
+) -> None:
+    """Save a batch of energy readings, resolving their MPANs, meters, registers and site visits first."""
+    dimensions.resolve(batch)
+    loader.load([build_reading_row(flow_file.pk, dimensions, record) for record in batch])
+
+
+def build_skipped_result(
+    source: FlowFileSource,
+    elapsed_seconds: float,
+    profile_path: Path | None = None,
+) -> ImportResult:
+    """Build the result of skipping a flow file whose content has already been imported."""
+    return ImportResult(
+        file_path=source.path,
+        member=source.member,
+        skipped=True,
+        elapsed_seconds=elapsed_seconds,
+        profile_path=profile_path,
+    )
+
+
+def build_import_result(
+    source: FlowFileSource,
+    parser: FlowFileParser,
+    reading_count: int,
+    elapsed_seconds: float,
+) -> ImportResult:
+    """Build the result of importing a flow file from its parser."""
+    if parser.stats is not None:
+        parser.stats.reading_count = reading_count
+        parser.stats.error_count = len(parser.errors)
+    return ImportResult(
+        file_path=source.path,
+        member=source.member,
+        reading_count=reading_count,
+        errors=[f"Error processing row: {row} - {error}" for row, error in parser.errors],
+        elapsed_seconds=elapsed_seconds,
+        stats=parser.stats,
+    )
+
+
+def save_flow_file_metadata(flow_file: FlowFile, header: ZHVHeader, footer: ZPTFooter) -> None:
+    """Save flow file metadata to the database."""
+    FlowFileMetadata.objects.create(
+        flow_file=flow_file,
+        header_format=header.header_format,
+        footer_format=footer.footer_format,
+        file_identifier=footer.file_identifier,
+        data_flow=header.data_flow,
+        data_flow_version=header.data_flow_version,
+        from_market_participant_role_code=header.from_market_participant_role_code,
+        from_market_participant_id=header.from_market_participant_id,
+        to_market_participant_role_code=header.to_market_participant_role_code,
+        to_market_participant_id=header.to_market_participant_id,
+        sending_application_id=header.sending_application_id,
+        receiving_application_id=header.receiving_application_id,
+        broadcast=header.broadcast,
+        test_data_flag=header.test_data_flag,
+        total_group_count=footer.total_group_count,
+        footer_checksum=footer.checksum,
+        flow_count=footer.flow_count,
+        file_created_at=header.file_created_at_datetime,
+        file_completed_at=footer.file_completed_at_datetime,
+    )
+    if file_created_at := header.file_created_at_datetime:
+        add_to_date_buckets(DateBucket.Series.FILE_CREATED_AT, {timezone.localdate(file_created_at): 1})
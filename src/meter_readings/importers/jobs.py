@@ -0,0 +1,375 @@
+"""Queue D0010 flow files to be imported, and import them with workers claiming one queued job at a time.
+
+The queue is the ImportJob table, so workers need no broker: any number of them, on one machine or many sharing the
+database, claim jobs from it. A job is claimed by a single statement which only one worker can win: a
+`SELECT ... FOR UPDATE SKIP LOCKED` where the database supports it (e.g. PostgreSQL), or a conditional UPDATE of the
+job from queued to running otherwise (e.g. SQLite, which only has one writer at a time anyway).
+Transient database errors (e.g. a locked SQLite database, a dropped connection or a deadlock) are retried with
+exponential backoff. Any other error fails the job.
+While a worker runs a job, a thread of its own renews the job's lease with heartbeats. A job whose worker stops
+sending them (e.g. killed for running out of memory) is queued again, or failed once it has been attempted too many
+times. A worker only records the outcome of a job it still holds, so a job taken over by another worker is not
+overwritten.
+"""
+
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from multiprocessing.synchronize import Event
+from pathlib import Path
+from typing import NamedTuple
+
+import django
+from django.core.management.base import OutputWrapper
+from django.db import InterfaceError, OperationalError, connection, connections, transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Max, Min, QuerySet
+from django.utils import timezone
+
+from meter_readings.importers.flow_files import DEFAULT_BATCH_SIZE, import_flow_file
+from meter_readings.importers.pools import FILE_ERRORS
+from meter_readings.importers.sources import list_flow_file_sources
+from meter_readings.models.import_jobs import ImportJob
+
+# Errors which may not happen again if the job is retried
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+# Number of times a job is attempted before it is failed
+DEFAULT_MAX_ATTEMPTS = 5
+
+# Seconds waited before the first retry of a job, doubling with every attempt up to the maximum
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 300.0
+
+# Seconds without a heartbeat after which a running job is assumed to have lost its worker (e.g. killed)
+DEFAULT_STALE_SECONDS = 300.0
+
+# Number of heartbeats sent per stale period, so that a few late ones (e.g. while the database is busy) do not make a
+# job stale
+HEARTBEATS_PER_STALE_PERIOD = 5
+
+# Error of a job whose worker stopped sending heartbeats
+STALE_ERROR = "The worker running the job stopped sending heartbeats."
+
+# Number of queued jobs tried in turn by a conditional update, when others claim them first
+CLAIM_CANDIDATES = 10
+
+# Period over which the latency of finished jobs is averaged
+LATENCY_WINDOW = timedelta(hours=1)
+
+
+class ImportQueueStats(NamedTuple):
+    """Depth of the import queue, and the latency of recently finished jobs."""
+
+    # Number of jobs of each status
+    status_counts: dict[str, int]
+    # Seconds the oldest queued job has been waiting (0 if there is none)
+    oldest_queued_seconds: float
+    # Average and longest seconds from queueing to starting jobs finished within the latency window
+    average_wait_seconds: float | None
+    max_wait_seconds: float | None
+    # Average seconds taken to run jobs finished within the latency window
+    average_run_seconds: float | None
+
+    @property
+    def depth(self) -> int:
+        """Return the number of jobs queued, waiting to be claimed."""
+        return self.status_counts.get(ImportJob.Status.QUEUED, 0)
+
+
+def get_worker_name() -> str:
+    """Return the name of this worker: its host and process ID."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_import_jobs(file_paths: Iterable[Path], *, force: bool = False) -> list[ImportJob]:
+    """Queue a job to import each file, by its absolute path."""
+    return ImportJob.objects.bulk_create(
+        [ImportJob(path=str(file_path.resolve()), force=force) for file_path in file_paths],
+    )
+
+
+def claim_import_job(worker: str) -> ImportJob | None:
+    """Claim the queued job which has been ready for longest, returning it (or None if no job is ready)."""
+    now = timezone.now()
+    ready_jobs = ImportJob.objects.filter(status=ImportJob.Status.QUEUED, available_at__lte=now).order_by(
+        "available_at",
+        "id",
+    )
+    claim = {
+        "status": ImportJob.Status.RUNNING,
+        "started_at": now,
+        "heartbeat_at": now,
+        "finished_at": None,
+        "worker": worker,
+    }
+
+    if connection.features.has_select_for_update_skip_locked:
+        # Jobs locked by other workers are skipped, rather than waited for
+        with transaction.atomic():
+            job = ready_jobs.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            ImportJob.objects.filter(pk=job.pk).update(attempts=F("attempts") + 1, **claim)
+    else:
+        # Only one worker can update a job from queued to running. The others try the next job
+        for job_id in ready_jobs.values_list("id", flat=True)[:CLAIM_CANDIDATES]:
+            if ImportJob.objects.filter(pk=job_id, status=ImportJob.Status.QUEUED).update(
+                attempts=F("attempts") + 1,
+                **claim,
+            ):
+                break
+        else:
+            return None
+        job = ImportJob(pk=job_id)
+
+    job.refresh_from_db()
+    return job
+
+
+def run_import_job(
+    job: ImportJob,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    heartbeat_seconds: float = DEFAULT_STALE_SECONDS / HEARTBEATS_PER_STALE_PERIOD,
+) -> ImportJob:
+    """Import the file of a claimed job, sending heartbeats every `heartbeat_seconds`, and return the job.
+
+    A job failing with a transient error is queued again after a backoff, unless it has been attempted
+    `max_attempts` times, in which case it is failed. Flow files imported before the error are skipped when the job
+    is retried, as they have already been imported (unless the job is forced).
+    """
+    try:
+        with send_import_job_heartbeats(job, heartbeat_seconds):
+            results = [
+                import_flow_file(source, batch_size, force=job.force)
+                for source in list_flow_file_sources(Path(job.path))
+            ]
+    except TRANSIENT_ERRORS as error:
+        # A broken connection is replaced before the job is updated
+        connection.close_if_unusable_or_obsolete()
+        if job.attempts >= max_attempts:
+            return finish_import_job(job, ImportJob.Status.FAILED, errors=[str(error)])
+        return retry_import_job(job, error)
+    except FILE_ERRORS as error:
+        return finish_import_job(job, ImportJob.Status.FAILED, errors=[str(error)])
+
+    errors = [error for result in results for error in result.errors]
+    return finish_import_job(
+        job,
+        ImportJob.Status.FAILED if errors else ImportJob.Status.DONE,
+        reading_count=sum(result.reading_count for result in results),
+        errors=errors,
+    )
+
+
+@contextmanager
+def send_import_job_heartbeats(job: ImportJob, interval_seconds: float) -> Iterator[None]:
+    """Renew the lease of a running job every `interval_seconds` from a thread of its own, until the block exits."""
+    stopped = threading.Event()
+    thread = threading.Thread(
+        target=renew_import_job_lease_until_stopped,
+        args=(job, interval_seconds, stopped),
+        name=f"import-job-{job.pk}-heartbeat",
+        daemon=True,
+    )
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def renew_import_job_lease_until_stopped(job: ImportJob, interval_seconds: float, stop: threading.Event) -> None:
+    """Renew the lease of a running job every `interval_seconds`, until stopped or the job is no longer held."""
+    try:
+        while not stop.wait(interval_seconds):
+            try:
+                if not renew_import_job_lease(job):
+                    return
+            except TRANSIENT_ERRORS:
+                # e.g. the import is writing to a SQLite database: try again at the next heartbeat
+                connection.close_if_unusable_or_obsolete()
+    finally:
+        # The thread has database connections of its own
+        connections.close_all()
+
+
+def renew_import_job_lease(job: ImportJob) -> bool:
+    """Record a heartbeat of a running job, returning False if its worker no longer holds it."""
+    return bool(get_held_import_job(job).update(heartbeat_at=timezone.now()))
+
+
+def get_held_import_job(job: ImportJob) -> QuerySet[ImportJob]:
+    """Return the job, as long as it is still running on the worker which claimed it (rather than taken over)."""
+    return ImportJob.objects.filter(pk=job.pk, status=ImportJob.Status.RUNNING, worker=job.worker)
+
+
+def get_backoff_seconds(attempts: int) -> float:
+    """Return the seconds to wait before retrying a job attempted the given number of times.
+
+    The wait doubles with every attempt, and is jittered so that jobs failing together are not retried together.
+    """
+    backoff_seconds = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return backoff_seconds * random.uniform(0.5, 1.0)  # noqa: S311
+
+
+def retry_import_job(job: ImportJob, error: Exception) -> ImportJob:
+    """Queue a job again after a transient error, to be retried after a backoff."""
+    job.status = ImportJob.Status.QUEUED
+    job.available_at = timezone.now() + timedelta(seconds=get_backoff_seconds(job.attempts))
+    job.last_error = str(error)
+    return save_import_job_outcome(job, ["status", "available_at", "last_error"])
+
+
+def finish_import_job(
+    job: ImportJob,
+    status: ImportJob.Status,
+    reading_count: int = 0,
+    errors: list[str] | None = None,
+) -> ImportJob:
+    """Record that a job is done or failed."""
+    errors = errors or []
+    job.status = status
+    job.finished_at = timezone.now()
+    job.reading_count = reading_count
+    job.error_count = len(errors)
+    job.last_error = errors[0] if errors else ""
+    return save_import_job_outcome(job, ["status", "finished_at", "reading_count", "error_count", "last_error"])
+
+
+def save_import_job_outcome(job: ImportJob, fields: list[str]) -> ImportJob:
+    """Save the outcome of a job, unless its worker no longer holds it, in which case return the job as it now is.
+
+    A job is taken from its worker once found stale, e.g. if the worker could not send heartbeats for too long.
+    """
+    if not get_held_import_job(job).update(**{field: getattr(job, field) for field in fields}):
+        job.refresh_from_db()
+    return job
+
+
+def requeue_stale_import_jobs(
+    stale_seconds: float = DEFAULT_STALE_SECONDS,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> int:
+    """Queue again the running jobs without a heartbeat for `stale_seconds`, returning how many there were.
+
+    Their workers are assumed to have stopped part way through, which rolled back whatever they had written. Jobs
+    already attempted `max_attempts` times are failed instead, so that a file which kills every worker importing it
+    (e.g. by running out of memory) is not retried forever.
+    """
+    now = timezone.now()
+    stale_jobs = ImportJob.objects.filter(
+        status=ImportJob.Status.RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=stale_seconds),
+    )
+    failed_count = stale_jobs.filter(attempts__gte=max_attempts).update(
+        status=ImportJob.Status.FAILED,
+        finished_at=now,
+        reading_count=0,
+        error_count=1,
+        last_error=STALE_ERROR,
+    )
+    requeued_count = stale_jobs.update(status=ImportJob.Status.QUEUED, available_at=now, last_error=STALE_ERROR)
+    return failed_count + requeued_count
+
+
+def get_import_queue_stats(window: timedelta = LATENCY_WINDOW) -> ImportQueueStats:
+    """Return the number of jobs of each status, and the latency of the jobs finished within the window."""
+    status_counts = dict(ImportJob.objects.values_list("status").annotate(count=Count("id")).order_by())
+    oldest_queued_at = ImportJob.objects.filter(status=ImportJob.Status.QUEUED).aggregate(
+        oldest_queued_at=Min("queued_at"),
+    )["oldest_queued_at"]
+
+    wait = ExpressionWrapper(F("started_at") - F("queued_at"), output_field=DurationField())
+    run = ExpressionWrapper(F("finished_at") - F("started_at"), output_field=DurationField())
+    latency = ImportJob.objects.filter(finished_at__gte=timezone.now() - window).aggregate(
+        average_wait=Avg(wait),
+        max_wait=Max(wait),
+        average_run=Avg(run),
+    )
+
+    now = timezone.now()
+    return ImportQueueStats(
+        status_counts=status_counts,
+        oldest_queued_seconds=(now - oldest_queued_at).total_seconds() if oldest_queued_at else 0.0,
+        average_wait_seconds=latency["average_wait"].total_seconds() if latency["average_wait"] else None,
+        max_wait_seconds=latency["max_wait"].total_seconds() if latency["max_wait"] else None,
+        average_run_seconds=latency["average_run"].total_seconds() if latency["average_run"] else None,
+    )
+
+
+class ImportWorkerOptions(NamedTuple):
+    """How each import worker claims and runs jobs."""
+
+    batch_size: int = DEFAULT_BATCH_SIZE
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    # Seconds between polls of the queue when no job is ready
+    poll_seconds: float = 1.0
+    # Seconds without a heartbeat after which a running job is stale, a fraction of which is the heartbeat interval
+    stale_seconds: float = DEFAULT_STALE_SECONDS
+    # Whether to stop once no job is ready, rather than wait for more
+    once: bool = False
+
+
+def run_import_worker(options: ImportWorkerOptions, stop: Event, report: Callable[[ImportJob], None]) -> None:
+    """Claim and run jobs one at a time, reporting each once it has run, until stopped (or the queue is empty).
+
+    A worker only stops between jobs, so that a job is never left part way through.
+    """
+    worker = get_worker_name()
+    while not stop.is_set():
+        try:
+            job = claim_import_job(worker)
+        except TRANSIENT_ERRORS:
+            # e.g. another worker is writing to a SQLite database: poll again later
+            connection.close_if_unusable_or_obsolete()
+            job = None
+
+        if job is None:
+            if options.once:
+                return
+            requeue_stale_import_jobs(options.stale_seconds, options.max_attempts)
+            stop.wait(options.poll_seconds)
+            continue
+
+        heartbeat_seconds = options.stale_seconds / HEARTBEATS_PER_STALE_PERIOD
+        report(run_import_job(job, options.batch_size, options.max_attempts, heartbeat_seconds))
+
+
+def run_import_worker_process(
+    settings_module: str,
+    options: ImportWorkerOptions,
+    stop: Event,
+) -> None:
+    """Set up Django in a newly started worker process, then run jobs until stopped, reporting each to stdout.
+
+    Interrupts (Ctrl+C) are left to the parent process, which stops every worker between jobs.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+    stdout = OutputWrapper(sys.stdout)
+    run_import_worker(options, stop, lambda job: stdout.write(describe_import_job(job)))
+
+
+def describe_import_job(job: ImportJob) -> str:
+    """Return a line describing the outcome of running a job."""
+    if job.status == ImportJob.Status.RUNNING:
+        # Taken over by another worker, after this one stopped sending heartbeats for too long
+        return f"LOST    job {job.pk} {job.path}: now running on {job.worker} (attempt {job.attempts})"
+    if job.status == ImportJob.Status.QUEUED:
+        retry_seconds = max((job.available_at - timezone.now()).total_seconds(), 0)
+        return f"RETRY   job {job.pk} {job.path} in {retry_seconds:.1f}s (attempt {job.attempts}): {job.last_error}"
+    outcome = "DONE   " if job.status == ImportJob.Status.DONE else "FAILED "
+    description = (
+        f"{outcome} job {job.pk} {job.path}: {job.reading_count} readings, waited {job.wait_seconds:.2f}s, "
+        f"ran {job.run_seconds:.2f}s (attempt {job.attempts})"
+    )
+    return f"{description}: {job.last_error}" if job.last_error else description
@@ -0,0 +1,77 @@
+"""Record the progress of import runs, so that an interrupted run can be resumed."""
+
+from functools import cached_property
+from pathlib import Path
+
+from django.utils import timezone
+
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.import_runs import ImportRun, ImportRunFile
+from meter_readings.schemas.import_results import ImportResult
+
+
+class ImportJournal:
+    """Journal of the flow files imported by an import run.
+
+    Files are recorded relative to the directory of the run, so a run can be resumed from another working directory.
+    """
+
+    def __init__(self, run: ImportRun, file_path: Path) -> None:
+        """Prepare to record the files imported from a file or directory by an import run."""
+        self.run = run
+        self.root = file_path if file_path.is_dir() else file_path.parent
+
+    @classmethod
+    def start(cls, file_path: Path) -> "ImportJournal":
+        """Start a new import run of a file or directory."""
+        return cls(ImportRun.objects.create(path=str(file_path.resolve())), file_path)
+
+    @classmethod
+    def resume(cls, run_id: int, file_path: Path) -> "ImportJournal":
+        """Resume an import run of a file or directory.
+
+        Raise a ValueError if there is no such run, or if it imported another file or directory.
+        """
+        run = ImportRun.objects.filter(pk=run_id).first()
+        if run is None:
+            msg = f"No import run found with ID {run_id}"
+            raise ValueError(msg)
+        if run.path != str(file_path.resolve()):
+            msg = f"Import run {run_id} imported {run.path}, not {file_path.resolve()}"
+            raise ValueError(msg)
+        return cls(run, file_path)
+
+    @cached_property
+    def completed_sources(self) -> set[FlowFileSource]:
+        """Return every flow file already imported (or skipped) by the run, which need not be imported again."""
+        completed_files = self.run.files.exclude(status=ImportRunFile.Status.FAILED).values_list(
+            "relative_path",
+            "member",
+        )
+        return {FlowFileSource(self.root / relative_path, member) for relative_path, member in completed_files}
+
+    def record(self, result: ImportResult) -> None:
+        """Record the outcome of importing a flow file, replacing any earlier outcome (e.g. a failed attempt)."""
+        if result.skipped:
+            status = ImportRunFile.Status.SKIPPED
+        elif result.success:
+            status = ImportRunFile.Status.IMPORTED
+        else:
+            status = ImportRunFile.Status.FAILED
+        ImportRunFile.objects.update_or_create(
+            run=self.run,
+            relative_path=str(result.file_path.relative_to(self.root)),
+            member=result.member,
+            defaults={
+                "status": status,
+                "reading_count": result.reading_count,
+                "error_count": len(result.errors),
+                "first_error": result.errors[0] if result.errors else "",
+                "elapsed_seconds": result.elapsed_seconds,
+            },
+        )
+
+    def finish(self) -> None:
+        """Record that the run has imported its last file."""
+        self.run.finished_at = timezone.now()
+        self.run.save(update_fields=["finished_at"])
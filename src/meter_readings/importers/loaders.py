@@ -0,0 +1,181 @@
+"""Write energy readings to the database in bulk, with the fastest method supported by each database."""
+
+import io
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.utils.module_loading import import_string
+
+from meter_readings.importers.dimensions import ReadingDimensions
+from meter_readings.importers.records import EnergyReadingRecord
+from meter_readings.models.energy_readings import Reading
+
+# Reading fields (by attribute name) in the order of the values of a reading row
+READING_ROW_FIELDS = (
+    "flow_file_id",
+    "mpan_id",
+    "mpan_site_visit_id",
+    "meter_id",
+    "meter_reading_site_visit_id",
+    "register_id",
+    "register_reading_site_visit_id",
+    "reading_at",
+    "register_reading",
+    "md_reset_at",
+    "number_of_md_resets",
+    "meter_reading_flag",
+    "reading_method",
+    "meter_reading_validation_result_reason",
+    "meter_reading_validation_result_status",
+)
+
+ReadingRow = tuple[Any, ...]
+
+# Characters escaped in the text format of PostgreSQL's COPY
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def build_reading_row(flow_file_id: int, dimensions: ReadingDimensions, record: EnergyReadingRecord) -> ReadingRow:
+    """Build the values of a reading, in the order of READING_ROW_FIELDS, without a model instance.
+
+    The MPAN, meter, register and site visits of the reading must have been resolved by the dimensions.
+    """
+    register_reading = record.register_reading
+    meter_reading_validation_result = record.meter_reading_validation_result
+
+    return (
+        flow_file_id,
+        *dimensions.get_keys(record),
+        # Register reading
+        register_reading.reading_at_datetime if register_reading else None,
+        register_reading.register_reading if register_reading else None,
+        register_reading.md_reset_at_datetime if register_reading else None,
+        register_reading.number_of_md_resets if register_reading else None,
+        register_reading.meter_reading_flag if register_reading else "",
+        register_reading.reading_method if register_reading else "",
+        # Meter reading validation result
+        meter_reading_validation_result.reason if meter_reading_validation_result else "",
+        meter_reading_validation_result.status if meter_reading_validation_result else "",
+    )
+
+
+class EnergyReadingLoader:
+    """Write rows of readings to the database with the ORM's bulk_create.
+
+    This works with any database, but creates a model instance per row. Subclasses write rows straight to the
+    database instead.
+    """
+
+    def __init__(self, connection: BaseDatabaseWrapper) -> None:
+        """Prepare to write energy readings over the given database connection."""
+        self.connection = connection
+        self.table = connection.ops.quote_name(Reading._meta.db_table)
+        self.columns = ", ".join(
+            connection.ops.quote_name(Reading._meta.get_field(field_name).column) for field_name in READING_ROW_FIELDS
+        )
+
+    def load(self, rows: list[ReadingRow]) -> None:
+        """Write rows of energy readings to the database."""
+        Reading.objects.using(self.connection.alias).bulk_create(
+            [Reading(**dict(zip(READING_ROW_FIELDS, row, strict=True))) for row in rows],
+            batch_size=len(rows) or None,
+        )
+
+
+class SQLiteEnergyReadingLoader(EnergyReadingLoader):
+    """Write rows of energy readings to a SQLite database with a single prepared INSERT statement per batch."""
+
+    def __init__(self, connection: BaseDatabaseWrapper) -> None:
+        """Prepare the INSERT statement, which SQLite compiles once and runs for every row."""
+        super().__init__(connection)
+        placeholders = ", ".join(["%s"] * len(READING_ROW_FIELDS))
+        self.sql = f"INSERT INTO {self.table} ({self.columns}) VALUES ({placeholders})"  # noqa: S608
+        self.datetime_indexes = [
+            index
+            for index, field_name in enumerate(READING_ROW_FIELDS)
+            if Reading._meta.get_field(field_name).get_internal_type() == "DateTimeField"
+        ]
+        # Datetimes repeat heavily, so each is only converted to its database value once
+        self._datetime_values: dict[datetime, str] = {}
+
+    def load(self, rows: list[ReadingRow]) -> None:
+        """Write rows of energy readings to the database."""
+        if not rows:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(self.sql, [self.adapt_row(row) for row in rows])
+
+    def adapt_row(self, row: ReadingRow) -> ReadingRow:
+        """Convert the datetimes of a row to database values, as the ORM would."""
+        values = list(row)
+        for index in self.datetime_indexes:
+            value = values[index]
+            if value is not None:
+                if value not in self._datetime_values:
+                    self._datetime_values[value] = self.connection.ops.adapt_datetimefield_value(value)
+                values[index] = self._datetime_values[value]
+        return tuple(values)
+
+
+class PostgreSQLEnergyReadingLoader(EnergyReadingLoader):
+    """Write rows of energy readings to a PostgreSQL database by streaming them through COPY ... FROM STDIN."""
+
+    def __init__(self, connection: BaseDatabaseWrapper) -> None:
+        """Prepare the COPY statement."""
+        super().__init__(connection)
+        self.sql = f"COPY {self.table} ({self.columns}) FROM STDIN"
+
+    def load(self, rows: list[ReadingRow]) -> None:
+        """Write rows of energy readings to the database."""
+        if not rows:
+            return
+        buffer = io.StringIO()
+        buffer.writelines(build_copy_line(row) for row in rows)
+        with self.connection.cursor() as cursor:
+            database_cursor = cursor.cursor
+            # psycopg (version 3) streams data through a copy object, psycopg2 reads it from a file
+            if hasattr(database_cursor, "copy"):
+                with database_cursor.copy(self.sql) as copy:
+                    copy.write(buffer.getvalue())
+            else:
+                buffer.seek(0)
+                database_cursor.copy_expert(self.sql, buffer)
+
+
+def build_copy_line(row: ReadingRow) -> str:
+    """Build a line of the text format of PostgreSQL's COPY from a row of values."""
+    return "\t".join(build_copy_value(value) for value in row) + "\n"
+
+
+def build_copy_value(value: object) -> str:
+    """Build a value in the text format of PostgreSQL's COPY."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, str):
+        return value.translate(COPY_ESCAPES)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+# Loaders used for each database vendor, with the ORM loader used for any other vendor
+LOADERS_BY_VENDOR: dict[str, type[EnergyReadingLoader]] = {
+    "postgresql": PostgreSQLEnergyReadingLoader,
+    "sqlite": SQLiteEnergyReadingLoader,
+}
+
+
+def get_energy_reading_loader(using: str = DEFAULT_DB_ALIAS) -> EnergyReadingLoader:
+    """Return the loader for a database, chosen from its engine in settings.DATABASES.
+
+    The `D0010_LOADER` setting (the dotted path of a loader class) overrides the automatic choice.
+    """
+    connection = connections[using]
+    if settings.D0010_LOADER:
+        loader_class = import_string(settings.D0010_LOADER)
+    else:
+        loader_class = LOADERS_BY_VENDOR.get(connection.vendor, EnergyReadingLoader)
+    return loader_class(connection)
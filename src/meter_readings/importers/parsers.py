@@ -0,0 +1,200 @@
+"""Parse rows of D0010 flow files into validated schemas."""
+
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import ValidationError
+from pydantic import ValidationError as PydanticValidationError
+
+from meter_readings.importers.records import EMPTY_METER_PART, EMPTY_MPAN_PART, EnergyReadingRecord, MeterPart, MPANPart
+from meter_readings.importers.validators import (
+    METER_READING_TYPE_VALIDATOR,
+    METER_READING_VALIDATION_RESULT_VALIDATOR,
+    MPAN_CORE_VALIDATOR,
+    REGISTER_READING_VALIDATOR,
+    SITE_VISIT_VALIDATOR,
+    ZHV_HEADER_VALIDATOR,
+    ZPT_FOOTER_VALIDATOR,
+)
+from meter_readings.schemas.footers import ZPTFooter
+from meter_readings.schemas.headers import ZHVHeader
+from meter_readings.schemas.meter_reading_types import MeterReadingType
+from meter_readings.schemas.meter_reading_validation_results import MeterReadingValidationResult
+from meter_readings.schemas.mpan_cores import MPANCore
+from meter_readings.schemas.register_readings import RegisterReading
+from meter_readings.schemas.site_visits import SiteVisit
+
+if TYPE_CHECKING:
+    from meter_readings.schemas.import_stats import ImportStats
+
+# Errors that mark a single row as invalid
+ROW_ERRORS = (IndexError, ValueError, ValidationError, PydanticValidationError)
+
+
+def parse_zhv_header(row: list[str]) -> ZHVHeader:
+    """Parse and validate ZHV header data."""
+    return ZHV_HEADER_VALIDATOR.validate(row)
+
+
+def parse_mpan_core(row: list[str]) -> MPANCore:
+    """Parse and validate MPAN core data."""
+    return MPAN_CORE_VALIDATOR.validate(row)
+
+
+def parse_site_visit(row: list[str]) -> SiteVisit:
+    """Parse and validate site visit data."""
+    return SITE_VISIT_VALIDATOR.validate(row)
+
+
+def parse_meter_reading_type(row: list[str]) -> MeterReadingType:
+    """Parse and validate meter reading type data."""
+    return METER_READING_TYPE_VALIDATOR.validate(row)
+
+
+def parse_register_reading(row: list[str]) -> RegisterReading:
+    """Parse and validate register reading data."""
+    return REGISTER_READING_VALIDATOR.validate(row)
+
+
+def parse_meter_reading_validation_result(row: list[str]) -> MeterReadingValidationResult:
+    """Parse and validate meter reading validation result data."""
+    return METER_READING_VALIDATION_RESULT_VALIDATOR.validate(row)
+
+
+def parse_zpt_footer(row: list[str]) -> ZPTFooter:
+    """Parse and validate ZPT footer data."""
+    return ZPT_FOOTER_VALIDATOR.validate(row)
+
+
+class FlowFileParser:
+    """Parse the rows of a single D0010 flow file into energy readings.
+
+    Rows are fed in one at a time and each energy reading (one register reading of a meter) is returned as soon as
+    it is complete, i.e. when the next 030, 028 or 026 row or the ZPT footer arrives. Only the energy reading
+    currently being read is held in memory, so files of any size can be parsed.
+
+    The MPAN and meter details of a reading are shared with every other reading of the same MPAN and meter, rather
+    than copied into each reading.
+
+    Invalid rows do not stop parsing, so that every error in a file can be reported in one go.
+    They are recorded in `errors` instead, alongside the error message.
+    """
+
+    def __init__(self) -> None:
+        """Initialise parser state for a new flow file."""
+        self.header: ZHVHeader | None = None
+        self.footer: ZPTFooter | None = None
+        self.errors: list[tuple[list[str], str]] = []
+        # Statistics of parsing (and then importing) the file, only collected by an instrumented parser
+        self.stats: ImportStats | None = None
+        self._mpan = EMPTY_MPAN_PART
+        self._meter = EMPTY_METER_PART
+        # Whether a reading has been returned for the current MPAN core
+        self._mpan_has_readings = False
+        # Register level details of the energy reading currently being read
+        self._register_reading: RegisterReading | None = None
+        self._meter_reading_validation_result: MeterReadingValidationResult | None = None
+        self._register_reading_site_visit: SiteVisit | None = None
+
+    @property
+    def footer_present(self) -> bool:
+        """Return True once the file footer has been read."""
+        return self.footer is not None
+
+    def iter_records(self, rows: Iterable[list[str]]) -> Iterator[EnergyReadingRecord]:
+        """Feed every row to the parser, yielding each energy reading as soon as it is complete."""
+        for row in rows:
+            yield from self.feed(row)
+
+            # Exit reading file as we have read the footer
+            # Assumption: any data after file footer is either a blank line or invalid data
+            if self.footer_present:
+                return
+
+        yield from self.close()
+
+    def feed(self, row: list[str]) -> list[EnergyReadingRecord]:  # noqa: C901
+        """Parse a single row and return any energy readings completed by it."""
+        completed_records = []
+        try:
+            # Process file header
+            if row[0] == "ZHV" or row[0] == "ZHF":
+                self.header = parse_zhv_header(row)
+
+            # Process MPAN core data
+            if row[0] == "026":
+                mpan_core = parse_mpan_core(row)
+                completed_records.extend(self.close())
+                self._mpan = MPANPart(mpan_core=mpan_core)
+
+            # Process site visit data for MPAN core
+            if row[0] == "027":
+                self._mpan = self._mpan._replace(site_visit=parse_site_visit(row))
+
+            # Process meter reading data
+            if row[0] == "028":
+                meter_reading_type = parse_meter_reading_type(row)
+                completed_records.extend(self.complete_register_reading())
+                self._meter = MeterPart(meter_reading_type=meter_reading_type)
+
+            # Process site visit data for meter readings
+            if row[0] == "029":
+                self._meter = self._meter._replace(site_visit=parse_site_visit(row))
+
+            # Process register reading data
+            # There may be 2 (or more) registers (e.g. Day and Night), each recorded as a separate reading
+            if row[0] == "030":
+                register_reading = parse_register_reading(row)
+                completed_records.extend(self.complete_register_reading())
+                self._register_reading = register_reading
+
+            # Process meter reading validation result data for the register reading
+            if row[0] == "032":
+                self._meter_reading_validation_result = parse_meter_reading_validation_result(row)
+
+            # Process site visit data for the register reading
+            if row[0] == "033":
+                self._register_reading_site_visit = parse_site_visit(row)
+
+            # Process file footer
+            if row[0] == "ZPT":
+                self.footer = parse_zpt_footer(row)
+                completed_records.extend(self.close())
+
+        except ROW_ERRORS as e:
+            self.errors.append((row, str(e)))
+
+        return completed_records
+
+    def complete_register_reading(self) -> list[EnergyReadingRecord]:
+        """Complete the register reading currently being read and return its energy reading, if there is one."""
+        if self._register_reading is None:
+            return []
+
+        record = EnergyReadingRecord(
+            mpan=self._mpan,
+            meter=self._meter,
+            register_reading=self._register_reading,
+            meter_reading_validation_result=self._meter_reading_validation_result,
+            register_reading_site_visit=self._register_reading_site_visit,
+        )
+        self._mpan_has_readings = True
+        self._register_reading = None
+        self._meter_reading_validation_result = None
+        self._register_reading_site_visit = None
+        return [record]
+
+    def close(self) -> list[EnergyReadingRecord]:
+        """Complete the MPAN core currently being read and return its last energy reading.
+
+        An MPAN core without any register readings is still returned as an energy reading, without register details.
+        """
+        records = self.complete_register_reading()
+        if not self._mpan_has_readings and (self._mpan is not EMPTY_MPAN_PART or self._meter is not EMPTY_METER_PART):
+            records.append(EnergyReadingRecord(mpan=self._mpan, meter=self._meter))
+
+        # Reset state for the next MPAN core
+        self._mpan = EMPTY_MPAN_PART
+        self._meter = EMPTY_METER_PART
+        self._mpan_has_readings = False
+        return records
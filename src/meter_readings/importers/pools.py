@@ -0,0 +1,311 @@
+"""Import many D0010 flow files concurrently using a pool of worker processes."""
+
+import itertools
+import os
+import time
+import zipfile
+from collections.abc import Callable, Container, Generator, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import NamedTuple
+
+import django
+from django.conf import settings
+from django.db import DatabaseError, connection, connections
+
+from meter_readings.importers.flow_files import (
+    DEFAULT_BATCH_SIZE,
+    FlowFileImportedError,
+    build_import_result,
+    build_skipped_result,
+    hash_flow_file,
+    import_flow_file,
+    is_flow_file_imported,
+    parse_flow_file,
+    save_flow_file,
+)
+from meter_readings.importers.parsers import FlowFileParser
+from meter_readings.importers.profiles import profile_call, sample_profile_options
+from meter_readings.importers.records import EnergyReadingRecord
+from meter_readings.importers.sources import FlowFileSource, list_flow_file_sources
+from meter_readings.schemas.import_profiles import ProfileOptions
+from meter_readings.schemas.import_results import ImportResult
+
+# Errors that fail the import of a single file without stopping the import of the others
+# (EOFError and BadZipFile are raised by truncated or corrupt compressed files)
+FILE_ERRORS = (OSError, ValueError, EOFError, zipfile.BadZipFile, DatabaseError)
+
+# Number of files submitted to a pool per worker process at a time, so that each worker has its next file ready
+IN_FLIGHT_PER_WORKER = 2
+
+# Error of a file whose worker process stopped abruptly (e.g. killed for running out of memory) while importing it
+WORKER_STOPPED_ERROR = "The worker process importing this file stopped abruptly."
+
+
+class ParsedFlowFile(NamedTuple):
+    """A flow file parsed and validated by a worker process, ready to be written to the database."""
+
+    content_hash: str
+    parser: FlowFileParser
+    records: list[EnergyReadingRecord]
+    parse_seconds: float
+    # Report of profiling the parse, if it was profiled
+    profile_path: Path | None = None
+
+
+def initialise_worker(settings_module: str) -> None:
+    """Set up Django in a newly started worker process.
+
+    Each worker opens its own database connection the first time it needs one.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def import_flow_file_safely(
+    source: FlowFileSource,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    *,
+    force: bool = False,
+    collect_stats: bool = False,
+    profile: ProfileOptions | None = None,
+) -> ImportResult:
+    """Import a single D0010 file, recording any error reading or writing it in the result rather than raising.
+
+    With profile options, the import is profiled and the path of its report recorded in the result.
+    """
+    start_time = time.perf_counter()
+    try:
+        if profile is None:
+            return import_flow_file(source, batch_size, force=force, collect_stats=collect_stats)
+        result, profile_path = profile_call(
+            lambda: import_flow_file(source, batch_size, force=force, collect_stats=collect_stats),
+            profile,
+            source,
+        )
+    except FILE_ERRORS as error:
+        return ImportResult(
+            file_path=source.path,
+            member=source.member,
+            errors=[str(error)],
+            elapsed_seconds=time.perf_counter() - start_time,
+        )
+    result.profile_path = profile_path
+    return result
+
+
+def parse_flow_file_timed(
+    source: FlowFileSource,
+    *,
+    force: bool = False,
+    collect_stats: bool = False,
+    profile: ProfileOptions | None = None,
+) -> ParsedFlowFile | ImportResult:
+    """Hash, parse and validate a single D0010 file, also returning the time taken in seconds.
+
+    Return the result of skipping the file instead, if a file with identical content has already been imported.
+    With profile options, only the parse is profiled: the file is written to the database by another process.
+    """
+    if profile is not None:
+        parsed_flow_file, profile_path = profile_call(
+            lambda: parse_flow_file_timed(source, force=force, collect_stats=collect_stats),
+            profile,
+            source,
+        )
+        if isinstance(parsed_flow_file, ImportResult):
+            parsed_flow_file.profile_path = profile_path
+            return parsed_flow_file
+        return parsed_flow_file._replace(profile_path=profile_path)
+
+    start_time = time.perf_counter()
+    content_hash = hash_flow_file(source)
+    if not force and is_flow_file_imported(content_hash):
+        return build_skipped_result(source, time.perf_counter() - start_time)
+
+    hash_seconds = time.perf_counter() - start_time
+    parser, records = parse_flow_file(source, collect_stats=collect_stats)
+    if parser.stats is not None:
+        parser.stats.add_seconds("hash", hash_seconds)
+    return ParsedFlowFile(content_hash, parser, records, time.perf_counter() - start_time)
+
+
+def import_flow_files(
+    file_paths: list[Path],
+    workers: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    *,
+    force: bool = False,
+    completed: Container[FlowFileSource] = frozenset(),
+    collect_stats: bool = False,
+    profile: ProfileOptions | None = None,
+) -> Iterator[ImportResult]:
+    """Import D0010 files, yielding the result of each flow file as soon as it has been imported.
+
+    Compressed files are decompressed as they are read, and every flow file within a zip archive is imported.
+    Files with identical content to an already imported file are skipped, unless forced.
+    Flow files in `completed` (e.g. those already imported by an interrupted run) are left out altogether.
+    With `collect_stats`, the result of each file holds the time spent in each stage of its import.
+    With profile options, a sample of the files are profiled, the result of each holding the path of its report.
+    With more than one worker, files are imported in a pool of worker processes (see `get_pool_tasks`). A file whose
+    worker process stops abruptly fails, and the pool is restarted to import the others.
+    """
+    sources = []
+    for file_path in file_paths:
+        # A completed plain file need not even be opened
+        if FlowFileSource(file_path) in completed:
+            continue
+        try:
+            sources.extend(source for source in list_flow_file_sources(file_path) if source not in completed)
+        except FILE_ERRORS as error:
+            yield ImportResult(file_path=file_path, errors=[str(error)])
+
+    if workers <= 1:
+        for source in sources:
+            yield import_flow_file_safely(
+                source,
+                batch_size,
+                force=force,
+                collect_stats=collect_stats,
+                profile=sample_profile_options(profile),
+            )
+        return
+
+    submit, get_result = get_pool_tasks(batch_size, force=force, collect_stats=collect_stats, profile=profile)
+    # Worker processes must open their own database connections rather than share this one
+    connections.close_all()
+    broken_sources = yield from import_in_pool(sources, workers, submit, get_result)
+
+    # Every file pending when a worker stopped abruptly (e.g. killed for running out of memory) is imported again, one
+    # at a time in a pool of its own, so that only the file which stops its worker fails
+    for source in broken_sources:
+        if (yield from import_in_pool([source], 1, submit, get_result)):
+            yield ImportResult(file_path=source.path, member=source.member, errors=[WORKER_STOPPED_ERROR])
+
+
+def get_pool_tasks(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    *,
+    force: bool = False,
+    collect_stats: bool = False,
+    profile: ProfileOptions | None = None,
+) -> tuple[
+    Callable[[ProcessPoolExecutor, FlowFileSource], Future],
+    Callable[[FlowFileSource, Future], ImportResult],
+]:
+    """Return how a flow file is submitted to a pool of worker processes, and how the result of its import is got.
+
+    SQLite only allows a single writer, so the workers return the parsed files and this process writes them one at
+    a time. Other databases accept concurrent writers, so each worker writes its own files over its own connection.
+    """
+    if connection.vendor == "sqlite":
+
+        def submit(executor: ProcessPoolExecutor, source: FlowFileSource) -> Future:
+            return executor.submit(
+                parse_flow_file_timed,
+                source,
+                force=force,
+                collect_stats=collect_stats,
+                profile=sample_profile_options(profile),
+            )
+
+        def get_result(source: FlowFileSource, future: Future) -> ImportResult:
+            return save_parsed_flow_file(source, future, batch_size, force=force)
+
+    else:
+
+        def submit(executor: ProcessPoolExecutor, source: FlowFileSource) -> Future:
+            return executor.submit(
+                import_flow_file_safely,
+                source,
+                batch_size,
+                force=force,
+                collect_stats=collect_stats,
+                profile=sample_profile_options(profile),
+            )
+
+        def get_result(source: FlowFileSource, future: Future) -> ImportResult:  # pylint: disable=unused-argument
+            return future.result()
+
+    return submit, get_result
+
+
+def import_in_pool(
+    sources: list[FlowFileSource],
+    workers: int,
+    submit: Callable[[ProcessPoolExecutor, FlowFileSource], Future],
+    get_result: Callable[[FlowFileSource, Future], ImportResult],
+) -> Generator[ImportResult, None, list[FlowFileSource]]:
+    """Import flow files in a new pool of worker processes, yielding the result of each as soon as it is ready.
+
+    Only a few files per worker are submitted at a time, the next being submitted as each finishes, and each finished
+    file is released once its result is yielded. Parsed files (with every record) are returned to this process on
+    SQLite, so memory stays the same however many files there are.
+    Return the flow files left without a result because a worker process stopped abruptly while they were submitted,
+    breaking the pool. Files not yet submitted by then are imported in a new pool.
+    """
+    pending_sources = iter(sources)
+    broken_sources = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=initialise_worker,
+        initargs=(settings.SETTINGS_MODULE,),
+    ) as executor:
+        futures = {
+            submit(executor, source): source
+            for source in itertools.islice(pending_sources, workers * IN_FLIGHT_PER_WORKER)
+        }
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            while done:
+                future = done.pop()
+                source = futures.pop(future)
+                try:
+                    result = get_result(source, future)
+                except BrokenProcessPool:
+                    broken_sources.append(source)
+                    continue
+                finally:
+                    # The finished file (e.g. every record parsed from it) is released before its result is yielded
+                    del future
+                # The next file is submitted before yielding, so that the workers are kept busy meanwhile
+                if not broken_sources and (next_source := next(pending_sources, None)) is not None:
+                    try:
+                        futures[submit(executor, next_source)] = next_source
+                    except BrokenProcessPool:
+                        broken_sources.append(next_source)
+                yield result
+    # Files not yet submitted when the pool broke are imported in a new pool
+    if unsubmitted_sources := list(pending_sources):
+        broken_sources.extend((yield from import_in_pool(unsubmitted_sources, workers, submit, get_result)))
+    return broken_sources
+
+
+def save_parsed_flow_file(
+    source: FlowFileSource,
+    future: Future[ParsedFlowFile | ImportResult],
+    batch_size: int,
+    *,
+    force: bool = False,
+) -> ImportResult:
+    """Write a flow file parsed by a worker process to the database."""
+    try:
+        parsed_flow_file = future.result()
+    except FILE_ERRORS as error:
+        return ImportResult(file_path=source.path, member=source.member, errors=[str(error)])
+
+    if isinstance(parsed_flow_file, ImportResult):
+        return parsed_flow_file
+
+    content_hash, parser, records, parse_seconds, profile_path = parsed_flow_file
+    start_time = time.perf_counter()
+    try:
+        reading_count = save_flow_file(source, parser, records, batch_size, content_hash, force=force)
+    except FlowFileImportedError:
+        # A file with identical content has been written since the worker checked
+        return build_skipped_result(source, parse_seconds, profile_path)
+    except DatabaseError as error:
+        return ImportResult(file_path=source.path, member=source.member, errors=[str(error)])
+    result = build_import_result(source, parser, reading_count, parse_seconds + time.perf_counter() - start_time)
+    result.profile_path = profile_path
+    return result
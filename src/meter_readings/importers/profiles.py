@@ -0,0 +1,164 @@
+"""Profile the import of flow files with cProfile or tracemalloc, writing a report per file."""
+
+import cProfile
+import pstats
+import random
+import tracemalloc
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import NamedTuple, TypeVar
+
+from django.conf import settings
+
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.schemas.import_profiles import ProfileOptions
+
+T = TypeVar("T")
+
+# Profilers which can profile imports, and the suffix of the report each writes
+PROFILE_SUFFIXES = {"cprofile": ".prof", "tracemalloc": ".tracemalloc"}
+PROFILERS = tuple(PROFILE_SUFFIXES)
+
+
+class FunctionProfile(NamedTuple):
+    """Time spent in a function, over every cProfile report summarised."""
+
+    location: str
+    call_count: int
+    # Time spent in the function itself, excluding the functions it called
+    own_seconds: float
+    cumulative_seconds: float
+
+
+class AllocationProfile(NamedTuple):
+    """Memory allocated by a line of code and still held once imports returned, over every tracemalloc report."""
+
+    location: str
+    block_count: int
+    size: int
+
+
+class MemoryProfile(NamedTuple):
+    """Memory used by imports, over every tracemalloc report summarised."""
+
+    # Largest peak of the memory allocated during any one import, including memory freed before it returned (e.g.
+    # each batch of readings)
+    peak_size: int
+    # Largest memory allocated during any one import and still held once it returned
+    retained_size: int
+    # Lines holding the most memory once imports returned, largest first
+    allocations: list[AllocationProfile]
+
+
+def get_profile_options(profiler: str | None = None) -> ProfileOptions | None:
+    """Return how to profile imports: every file with the given profiler, otherwise the sample of files in settings.
+
+    Return None if no file is to be profiled.
+    """
+    if profiler is not None:
+        return ProfileOptions(profiler=profiler, directory=settings.D0010_PROFILE_DIR)  # type: ignore[arg-type]
+    if settings.D0010_PROFILE_SAMPLE_RATE:
+        return ProfileOptions(
+            profiler=settings.D0010_PROFILER,
+            directory=settings.D0010_PROFILE_DIR,
+            sample_rate=settings.D0010_PROFILE_SAMPLE_RATE,
+        )
+    return None
+
+
+def sample_profile_options(options: ProfileOptions | None) -> ProfileOptions | None:
+    """Return the options if a file is chosen to be profiled at their sample rate, otherwise None."""
+    if options is None or random.random() >= options.sample_rate:  # noqa: S311
+        return None
+    return options
+
+
+def build_profile_path(options: ProfileOptions, source: FlowFileSource) -> Path:
+    """Return the path of the report of profiling a flow file, named after the file and when it was profiled."""
+    name = "-".join(part for part in (source.path.name, source.member) if part).replace("/", "-")
+    return options.directory / f"{datetime.now(tz=UTC):%Y%m%dT%H%M%S%f}-{name}{PROFILE_SUFFIXES[options.profiler]}"
+
+
+def profile_call(function: Callable[[], T], options: ProfileOptions, source: FlowFileSource) -> tuple[T, Path]:
+    """Call a function importing a flow file under a profiler, writing its report.
+
+    Return the result of the function and the path of the report.
+    """
+    options.directory.mkdir(parents=True, exist_ok=True)
+    profile_path = build_profile_path(options, source)
+
+    if options.profiler == "cprofile":
+        profiler = cProfile.Profile()
+        result = profiler.runcall(function)
+        profiler.dump_stats(profile_path)
+        return result, profile_path
+
+    # Memory allocated before the call (e.g. by Django) is not traced, unless something else was already tracing, in
+    # which case it is left out by comparing with a snapshot taken before the call
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.take_snapshot()
+        start_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = function()
+        end_size, peak_size = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    write_tracemalloc_report(profile_path, snapshot, baseline, peak_size - start_size, end_size - start_size)
+    return result, profile_path
+
+
+def write_tracemalloc_report(
+    profile_path: Path,
+    snapshot: tracemalloc.Snapshot,
+    baseline: tracemalloc.Snapshot,
+    peak_size: int,
+    retained_size: int,
+) -> None:
+    """Write the snapshot taken after an import, with the baseline taken before it and the peak and retained sizes.
+
+    The report is still a snapshot which `tracemalloc.Snapshot.load` can read: the baseline and sizes are attributes
+    of it.
+    """
+    tracemalloc_filter = tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__)
+    report = snapshot.filter_traces([tracemalloc_filter])
+    report.baseline = baseline.filter_traces([tracemalloc_filter])  # type: ignore[attr-defined]
+    report.peak_size = peak_size  # type: ignore[attr-defined]
+    report.retained_size = retained_size  # type: ignore[attr-defined]
+    report.dump(str(profile_path))
+
+
+def summarise_cprofile_reports(profile_paths: Iterable[Path], top: int) -> list[FunctionProfile]:
+    """Return the functions taking the most time themselves over every cProfile report, slowest first."""
+    stats = pstats.Stats(*(str(profile_path) for profile_path in profile_paths))
+    function_stats = stats.stats  # type: ignore[attr-defined]
+    functions = [
+        FunctionProfile(pstats.func_std_string(function), call_count, own_seconds, cumulative_seconds)
+        for function, (_, call_count, own_seconds, cumulative_seconds, _) in function_stats.items()
+    ]
+    return sorted(functions, key=lambda function: function.own_seconds, reverse=True)[:top]
+
+
+def summarise_tracemalloc_reports(profile_paths: Iterable[Path], top: int) -> MemoryProfile:
+    """Return the peak and retained memory of imports, and the lines holding the most once they returned."""
+    peak_size = retained_size = 0
+    sizes: dict[str, int] = {}
+    block_counts: dict[str, int] = {}
+    for profile_path in profile_paths:
+        report = tracemalloc.Snapshot.load(str(profile_path))
+        peak_size = max(peak_size, report.peak_size)
+        retained_size = max(retained_size, report.retained_size)
+        for statistic in report.compare_to(report.baseline, "lineno"):
+            if statistic.size_diff <= 0:
+                continue
+            location = str(statistic.traceback[0])
+            sizes[location] = sizes.get(location, 0) + statistic.size_diff
+            block_counts[location] = block_counts.get(location, 0) + max(statistic.count_diff, 0)
+    allocations = [AllocationProfile(location, block_counts[location], size) for location, size in sizes.items()]
+    allocations = sorted(allocations, key=lambda allocation: allocation.size, reverse=True)[:top]
+    return MemoryProfile(peak_size, retained_size, allocations)
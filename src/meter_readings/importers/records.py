@@ -0,0 +1,43 @@
+"""Records of the energy readings parsed from D0010 flow files.
+
+A D0010 file nests its rows: every MPAN core (026) has meters (028), every meter has register readings (030).
+Rather than copying the MPAN and meter details into every register reading, each level is an immutable tuple which
+is shared by every energy reading below it.
+"""
+
+from typing import NamedTuple
+
+from meter_readings.schemas.meter_reading_types import MeterReadingType
+from meter_readings.schemas.meter_reading_validation_results import MeterReadingValidationResult
+from meter_readings.schemas.mpan_cores import MPANCore
+from meter_readings.schemas.register_readings import RegisterReading
+from meter_readings.schemas.site_visits import SiteVisit
+
+
+class MPANPart(NamedTuple):
+    """MPAN level details (026 and 027 rows), shared by every energy reading of the MPAN core."""
+
+    mpan_core: MPANCore | None = None
+    site_visit: SiteVisit | None = None
+
+
+class MeterPart(NamedTuple):
+    """Meter level details (028 and 029 rows), shared by every energy reading of the meter."""
+
+    meter_reading_type: MeterReadingType | None = None
+    site_visit: SiteVisit | None = None
+
+
+class EnergyReadingRecord(NamedTuple):
+    """A single energy reading: register level details (030, 032 and 033 rows) and its shared MPAN and meter parts."""
+
+    mpan: MPANPart
+    meter: MeterPart
+    register_reading: RegisterReading | None = None
+    meter_reading_validation_result: MeterReadingValidationResult | None = None
+    register_reading_site_visit: SiteVisit | None = None
+
+
+# Parts used before any MPAN core or meter has been read
+EMPTY_MPAN_PART = MPANPart()
+EMPTY_METER_PART = MeterPart()
@@ -0,0 +1,86 @@
+"""Open D0010 flow files for reading, whether plain, compressed or within a zip archive."""
+
+import bz2
+import gzip
+import zipfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, NamedTuple
+
+# Leading bytes of each supported compression format
+GZIP_MAGIC = b"\x1f\x8b"
+BZIP2_MAGIC = b"BZh"
+ZIP_MAGIC = b"PK\x03\x04"
+
+# Suffixes of compressed files, which are not part of the name of the flow file within them
+COMPRESSION_SUFFIXES = (".gz", ".bz2")
+
+
+class FlowFileSource(NamedTuple):
+    """A flow file to import: a file on disk (compressed or not) or a member of a zip archive on disk."""
+
+    path: Path
+    # Name of the flow file within the zip archive at path
+    member: str = ""
+
+    @property
+    def name(self) -> str:
+        """Return the name of the flow file itself, without any compression suffix."""
+        if self.member:
+            return PurePosixPath(self.member).name
+        if self.path.suffix in COMPRESSION_SUFFIXES:
+            return self.path.stem
+        return self.path.name
+
+    @property
+    def archive_name(self) -> str:
+        """Return the name of the compressed file or zip archive holding the flow file, if any."""
+        return self.path.name if self.name != self.path.name else ""
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        """Open the flow file for reading in binary, decompressing it as it is read."""
+        if self.member:
+            with zipfile.ZipFile(self.path) as archive, archive.open(self.member) as file:
+                yield file  # type: ignore[misc]
+            return
+
+        with self.path.open(mode="rb") as file:
+            magic = file.read(4)
+            file.seek(0)
+            if magic.startswith(GZIP_MAGIC):
+                with gzip.GzipFile(fileobj=file) as decompressed_file:
+                    yield decompressed_file  # type: ignore[misc]
+            elif magic.startswith(BZIP2_MAGIC):
+                with bz2.BZ2File(file) as decompressed_file:
+                    yield decompressed_file  # type: ignore[misc]
+            else:
+                yield file
+
+
+def list_flow_file_sources(file_path: Path) -> list[FlowFileSource]:
+    """Return every flow file at a path: the file itself, or each file within it if it is a zip archive.
+
+    Raise zipfile.BadZipFile if the file looks like a zip archive but is corrupt, or ValueError if it is empty.
+    """
+    with file_path.open(mode="rb") as file:
+        if not file.read(4).startswith(ZIP_MAGIC):
+            return [FlowFileSource(file_path)]
+
+    with zipfile.ZipFile(file_path) as archive:
+        sources = [
+            FlowFileSource(file_path, info.filename)
+            for info in archive.infolist()
+            if not info.is_dir() and not is_hidden_member(info.filename)
+        ]
+
+    if not sources:
+        msg = f"No flow files found in zip archive {file_path}"
+        raise ValueError(msg)
+    return sources
+
+
+def is_hidden_member(member: str) -> bool:
+    """Return True if a zip archive member is a hidden file (e.g. macOS resource forks) rather than a flow file."""
+    return any(part.startswith(".") or part == "__MACOSX" for part in PurePosixPath(member).parts)
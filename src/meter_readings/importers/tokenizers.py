@@ -0,0 +1,102 @@
+"""Split the raw bytes of D0010 flow files into rows of fields."""
+
+import io
+import mmap
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import BinaryIO
+
+# D0010 files are ASCII, so any superset of it reads them. Decoding is strict: a file with undecodable bytes fails.
+DEFAULT_ENCODING = "utf-8"
+
+# Number of bytes read from a file at a time
+# Blocks of this size keep system calls few, while the rows split from each block still fit in the CPU caches
+# (tokenizing 1MB blocks is around 40% slower than 64KB blocks)
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+# Codes of the records read by the parser. Rows of any other record are dropped.
+RECORD_CODES = frozenset(["ZHV", "ZHF", "026", "027", "028", "029", "030", "032", "033", "ZPT"])
+
+# First field of the rows kept: those of records read by the parser, and blank lines
+KEPT_FIRST_FIELDS = RECORD_CODES | {""}
+
+
+class FlowFileTokenizer:
+    """Split the raw bytes of a D0010 flow file into rows of fields.
+
+    D0010 files are pipe delimited, one record per line, without any quoting, so lines are split with `str.split`
+    rather than a `csv.reader`. Bytes are fed in blocks of any size, and each row is returned as soon as its line is
+    complete. The complete lines of a block are decoded at once, which is far cheaper than decoding field by field.
+    Rows are dispatched on their record code: rows of records which are not read by the parser are dropped, while
+    blank lines are returned as empty rows so that the parser reports them as invalid.
+    """
+
+    def __init__(self, encoding: str = DEFAULT_ENCODING) -> None:
+        """Initialise tokenizer state for a new flow file."""
+        self.encoding = encoding
+        # Bytes of the line currently being read, which is not yet complete
+        self._remainder = b""
+
+    def iter_rows(
+        self,
+        file: BinaryIO,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        *,
+        use_mmap: bool = False,
+    ) -> Iterator[list[str]]:
+        """Read a binary file in blocks, yielding each row as soon as it is complete.
+
+        With `use_mmap`, a file on disk is memory mapped rather than read, saving a copy of every block. Files which
+        cannot be memory mapped (e.g. compressed or empty files) are read as normal.
+        """
+        with map_file(file) if use_mmap else nullcontext(file) as blocks:
+            while block := blocks.read(block_size):
+                yield from self.feed(block)
+        yield from self.close()
+
+    def feed(self, block: bytes) -> list[list[str]]:
+        """Split a block of bytes into rows, returning every row completed by it."""
+        data = self._remainder + block
+        end = data.rfind(b"\n") + 1
+        self._remainder = data[end:]
+        return self.split_lines(data[:end])
+
+    def close(self) -> list[list[str]]:
+        """Return the last row, if the file does not end with a new line."""
+        data = self._remainder
+        self._remainder = b""
+        return self.split_lines(data + b"\n") if data else []
+
+    def split_lines(self, data: bytes) -> list[list[str]]:
+        """Split complete lines (each ending with a new line) into rows of fields."""
+        if b"\r" in data:
+            data = data.replace(b"\r\n", b"\n")
+        lines = data.decode(self.encoding).split("\n")
+        # Drop the empty string following the last new line
+        lines.pop()
+
+        # Blank lines are returned as empty rows (rather than rows of one empty field), as a csv.reader returns them
+        return [row if row[0] else [] for line in lines if (row := line.split("|"))[0] in KEPT_FIRST_FIELDS]
+
+
+@contextmanager
+def map_file(file: BinaryIO) -> Iterator[BinaryIO]:
+    """Memory map a file for reading, or use the file itself if it cannot be memory mapped.
+
+    Only files read straight from disk are memory mapped: the file number of a decompressing file is that of the
+    compressed file beneath it.
+    """
+    mapped_file = None
+    if isinstance(file, io.BufferedReader | io.FileIO):
+        try:
+            mapped_file = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and special files (e.g. pipes) cannot be memory mapped
+            mapped_file = None
+
+    if mapped_file is None:
+        yield file
+        return
+
+    with mapped_file:
+        yield mapped_file  # type: ignore[misc]
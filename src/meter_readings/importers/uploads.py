@@ -0,0 +1,195 @@
+"""Import D0010 flow files uploaded over HTTP, once the bytes of each file have all arrived.
+
+No database transaction is held open while an upload is being received, as a slow (or stalled) client would otherwise
+keep the database locked for as long as its connection stays open: on SQLite, the single writer every importer waits
+for. Each chunk of a file is decompressed (if it is gzipped) and hashed as it is received, and spooled to a temporary
+file. Once the file is complete, it is skipped if identical content has already been imported, and otherwise imported
+from the temporary file in one short transaction, as `import_flow_file` imports files on disk.
+"""
+
+import hashlib
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+
+from meter_readings.importers.flow_files import (
+    DEFAULT_BATCH_SIZE,
+    build_flow_file_parser,
+    build_skipped_result,
+    import_flow_file_content,
+    is_flow_file_imported,
+)
+from meter_readings.importers.sources import GZIP_MAGIC, FlowFileSource
+from meter_readings.importers.tokenizers import DEFAULT_BLOCK_SIZE
+from meter_readings.schemas.import_results import ImportResult
+
+# Window bits of zlib decompressing a gzip stream (rather than a zlib one)
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+class GzipStreamDecompressor:
+    """Decompress a gzip stream fed in chunks, into blocks of bounded size.
+
+    Concatenated gzip members (as `gzip` writes when appending) are decompressed one after another. The size of each
+    block is bounded so that a small, highly compressed chunk does not decompress all at once.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        """Prepare to decompress a new gzip stream."""
+        self.block_size = block_size
+        self._decompressor = zlib.decompressobj(GZIP_WBITS)
+        self._member_started = False
+
+    @property
+    def complete(self) -> bool:
+        """Return True if the stream ends with the end of a gzip member, rather than part way through one."""
+        return not self._member_started or self._decompressor.eof
+
+    def decompress(self, chunk: bytes) -> list[bytes]:
+        """Decompress a chunk of the stream, returning its decompressed blocks.
+
+        Raise zlib.error if the chunk is not part of a gzip stream.
+        """
+        blocks = []
+        data = chunk
+        while data:
+            self._member_started = True
+            if block := self._decompressor.decompress(data, self.block_size):
+                blocks.append(block)
+            if self._decompressor.eof:
+                # Start the next member, if any follows
+                data = self._decompressor.unused_data
+                if data:
+                    self._decompressor = zlib.decompressobj(GZIP_WBITS)
+            else:
+                data = self._decompressor.unconsumed_tail
+        return blocks
+
+
+class FlowFileUpload:
+    """Import a single flow file from chunks of bytes, fed as they are uploaded.
+
+    The decompressed content of the file is spooled to a temporary file (in FILE_UPLOAD_TEMP_DIR) until the upload is
+    complete (see `close`), and only then written to the database.
+    """
+
+    def __init__(self, source: FlowFileSource, batch_size: int = DEFAULT_BATCH_SIZE, *, force: bool = False) -> None:
+        """Start receiving a flow file, named by the given source."""
+        self.source = source
+        self.batch_size = batch_size
+        self.force = force
+        self.start_time = time.perf_counter()
+        self.digest = hashlib.sha256()
+        self.decompressor: GzipStreamDecompressor | None = None
+        # Error making the rest of the file unreadable (e.g. invalid gzip data), after which it is ignored
+        self.error = ""
+        # Leading bytes of the file, until there are enough to tell whether it is gzipped (then None)
+        self._head: bytes | None = b""
+        # Open until the upload is imported or aborted
+        self._file: BinaryIO = tempfile.TemporaryFile(  # type: ignore[assignment]  # noqa: SIM115
+            dir=settings.FILE_UPLOAD_TEMP_DIR,
+        )
+
+    def feed(self, chunk: bytes) -> None:
+        """Spool a chunk of the file, decompressing it if the file is gzipped."""
+        if self.error:
+            return
+        if self._head is not None:
+            self._head += chunk
+            if len(self._head) < len(GZIP_MAGIC):
+                return
+            chunk, self._head = self._head, None
+            if chunk.startswith(GZIP_MAGIC):
+                self.decompressor = GzipStreamDecompressor()
+
+        try:
+            blocks = self.decompressor.decompress(chunk) if self.decompressor else [chunk]
+        except zlib.error as error:
+            self.error = f"Invalid gzip data: {error}"
+            return
+        for block in blocks:
+            self.digest.update(block)
+            self._file.write(block)
+
+    def close(self) -> ImportResult:
+        """Import the file once it has all been fed, unless it is invalid or identical content has been imported."""
+        if self._head:
+            # The file is too short to be gzipped
+            head, self._head = self._head, None
+            self.feed(head)
+        if self.decompressor and not self.error and not self.decompressor.complete:
+            self.error = "Gzip data ended before the end of the compressed file."
+
+        try:
+            if self.error:
+                return ImportResult(
+                    file_path=self.source.path,
+                    errors=[self.error],
+                    elapsed_seconds=time.perf_counter() - self.start_time,
+                )
+
+            content_hash = self.digest.hexdigest()
+            if not self.force and is_flow_file_imported(content_hash):
+                return build_skipped_result(self.source, time.perf_counter() - self.start_time)
+
+            self._file.seek(0)
+            return import_flow_file_content(
+                self.source,
+                self._file,
+                build_flow_file_parser(),
+                self.batch_size,
+                content_hash,
+                force=self.force,
+                start_time=self.start_time,
+            )
+        finally:
+            self.abort()
+
+    def abort(self) -> None:
+        """Discard the file received so far, unless it has already been imported or discarded."""
+        self._file.close()
+
+
+class FlowFileUploadHandler(FileUploadHandler):
+    """Import each file of a multipart upload, spooled as its chunks are received rather than kept in memory.
+
+    Files are imported one after another, each in a transaction of its own once it has all been received, and nothing
+    is kept in `request.FILES`.
+    The result of importing each file is added to `results`.
+    """
+
+    def __init__(self, request: Any = None, *, force: bool = False) -> None:  # noqa: ANN401
+        """Prepare to import the files of an upload, even those already imported if forced."""
+        super().__init__(request)
+        self.force = force
+        self.upload: FlowFileUpload | None = None
+        self.results: list[ImportResult] = []
+
+    def new_file(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Start importing a file of the upload, named by its file name."""
+        super().new_file(*args, **kwargs)
+        self.upload = FlowFileUpload(FlowFileSource(Path(self.file_name)), force=self.force)
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:  # noqa: ARG002
+        """Spool a chunk of the current file."""
+        self.upload.feed(raw_data)
+
+    def file_complete(self, file_size: int) -> None:  # noqa: ARG002
+        """Complete the import of the current file, recording its result."""
+        self.results.append(self.upload.close())
+        self.upload = None
+
+    def upload_interrupted(self) -> None:
+        """Discard the file being received when the upload was interrupted."""
+        self.abort()
+
+    def abort(self) -> None:
+        """Discard the file being received, if any."""
+        upload, self.upload = self.upload, None
+        if upload is not None:
+            upload.abort()
@@ -0,0 +1,248 @@
+"""Fast-path validation of the rows of D0010 flow files.
+
+Validating every row with pydantic's `model_validate` means building a dict per row and running the python field
+validators for every field. Instead, each record type is compiled once into
+a `RecordValidator`: a precomputed field layout with a cheap check per field. Rows passing every check are turned
+into schema instances directly. Rows failing any check are validated by pydantic, which produces the error message
+(or accepts the row, if the cheap check was stricter than the schema).
+
+The cheap checks must never accept a row that pydantic would reject, nor produce a different value.
+"""
+
+import re
+from collections.abc import Callable, Mapping
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+from meter_readings.schemas.footers import ZPTFooter
+from meter_readings.schemas.headers import DATA_FLOW_AND_VERSION_NUMBER_PATTERN, ZHVHeader
+from meter_readings.schemas.meter_reading_types import READING_TYPES, MeterReadingType
+from meter_readings.schemas.meter_reading_validation_results import (
+    METER_READING_REASON_CODES,
+    MeterReadingValidationResult,
+)
+from meter_readings.schemas.mpan_cores import MPANCore
+from meter_readings.schemas.register_readings import RegisterReading
+from meter_readings.schemas.site_visits import J0024_VALID_SET, SiteVisit
+from meter_readings.utils.datetimes import parse_timestamp
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Returned by a check when a value fails it
+INVALID = object()
+
+# A check takes the raw string value of a field and returns the validated value, or INVALID
+Check = Callable[[str], Any]
+
+
+def literal(*choices: str) -> Check:
+    """Return a check that a value is one of the given choices."""
+    valid_values = frozenset(choices)
+
+    def check(value: str) -> Any:  # noqa: ANN401
+        return value if value in valid_values else INVALID
+
+    return check
+
+
+def one_of(codes: Mapping[str, str]) -> Check:
+    """Return a check that a value is one of the keys of the given codes."""
+    return literal(*codes)
+
+
+def max_length(length: int) -> Check:
+    """Return a check that a value has at most the given number of characters."""
+
+    def check(value: str) -> Any:  # noqa: ANN401
+        return value if len(value) <= length else INVALID
+
+    return check
+
+
+def pattern(regex: re.Pattern[str], length: int) -> Check:
+    """Return a check that a value has at most the given number of characters and matches the given regex."""
+
+    def check(value: str) -> Any:  # noqa: ANN401
+        return value if len(value) <= length and regex.match(value) else INVALID
+
+    return check
+
+
+def timestamp(value: str) -> Any:  # noqa: ANN401
+    """Check a value is empty or a valid YYYYMMDDHHMMSS datetime string."""
+    if value == "":
+        return value
+
+    try:
+        parse_timestamp(value)
+    except ValueError:
+        return INVALID
+    return value
+
+
+def integer(value: str) -> Any:  # noqa: ANN401
+    """Check a value is a string of digits and convert it to an int."""
+    if value.isascii() and value.isdigit():
+        return int(value)
+    return INVALID
+
+
+def optional_integer(less_than: int | None = None) -> Check:
+    """Return a check that a value is empty (converted to None) or an int below the given (optional) limit."""
+
+    def check(value: str) -> Any:  # noqa: ANN401
+        if value == "":
+            return None
+        number = integer(value)
+        if number is INVALID or (less_than is not None and number >= less_than):
+            return INVALID
+        return number
+
+    return check
+
+
+def decimal(value: str) -> Any:  # noqa: ANN401
+    """Convert a value to a float."""
+    try:
+        return float(value)
+    except ValueError:
+        return INVALID
+
+
+class RecordValidator(Generic[ModelT]):
+    """Validate rows of a single record type against its schema."""
+
+    def __init__(self, model: type[ModelT], checks: Mapping[str, Check]) -> None:
+        """Compile the field layout of the schema, with a check for every one of its fields."""
+        if set(checks) != set(model.model_fields):
+            msg = f"Checks for {model.__name__} must cover exactly the fields {list(model.model_fields)}"
+            raise ValueError(msg)
+
+        self.model = model
+        # Fields in the order they appear in a row
+        self.field_names = tuple(model.model_fields)
+        self.checks = tuple(checks[field_name] for field_name in self.field_names)
+        # Rows shorter than this are missing a required field
+        self.required_length = max(
+            (index + 1 for index, field in enumerate(model.model_fields.values()) if field.is_required()),
+            default=0,
+        )
+        # Default values of the fields missing from a row, by row length
+        self.defaults_by_row_length = [
+            {field_name: model.model_fields[field_name].default for field_name in self.field_names[row_length:]}
+            for row_length in range(len(self.field_names) + 1)
+        ]
+
+    def validate(self, row: list[str]) -> ModelT:
+        """Validate a row, returning a schema instance or raising pydantic's ValidationError if the row is invalid."""
+        if len(row) < self.required_length:
+            return self.validate_with_pydantic(row)
+
+        values = {}
+        for field_name, check, value in zip(self.field_names, self.checks, row, strict=False):
+            checked_value = check(value)
+            if checked_value is INVALID:
+                return self.validate_with_pydantic(row)
+            values[field_name] = checked_value
+
+        if len(row) < len(self.field_names):
+            values.update(self.defaults_by_row_length[len(row)])
+        return self.construct(values, fields_set=set(self.field_names[: len(row)]))
+
+    def validate_with_pydantic(self, row: list[str]) -> ModelT:
+        """Validate a row with its full pydantic schema."""
+        return self.model.model_validate(dict(zip(self.field_names, row, strict=False)))
+
+    def construct(self, values: dict[str, Any], fields_set: set[str]) -> ModelT:
+        """Create a schema instance from already validated values.
+
+        This is what `BaseModel.model_construct` does, without the per call overhead of working out the defaults.
+        """
+        instance = self.model.__new__(self.model)
+        object.__setattr__(instance, "__dict__", values)
+        object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(instance, "__pydantic_extra__", None)
+        object.__setattr__(instance, "__pydantic_private__", None)
+        return instance
+
+
+ZHV_HEADER_VALIDATOR = RecordValidator(
+    ZHVHeader,
+    {
+        "header_format": literal("ZHV", "ZHF"),
+        "file_identifier": max_length(10),
+        "data_flow_and_version_number": pattern(DATA_FLOW_AND_VERSION_NUMBER_PATTERN, 8),
+        "from_market_participant_role_code": max_length(1),
+        "from_market_participant_id": max_length(4),
+        "to_market_participant_role_code": max_length(1),
+        "to_market_participant_id": max_length(4),
+        "file_created_at": timestamp,
+        "sending_application_id": max_length(5),
+        "receiving_application_id": max_length(5),
+        "broadcast": max_length(1),
+        "test_data_flag": max_length(4),
+    },
+)
+
+MPAN_CORE_VALIDATOR = RecordValidator(
+    MPANCore,
+    {
+        "code": literal("026"),
+        "mpan_core": max_length(13),
+        "bsc_validation_status": literal("F", "U", "V"),
+    },
+)
+
+SITE_VISIT_VALIDATOR = RecordValidator(
+    SiteVisit,
+    {
+        "code": literal("027", "029", "033"),
+        "visit_reason": one_of(J0024_VALID_SET),
+        "additional_information": max_length(200),
+    },
+)
+
+METER_READING_TYPE_VALIDATOR = RecordValidator(
+    MeterReadingType,
+    {
+        "code": literal("028"),
+        "meter_id": max_length(10),
+        "reading_type": one_of(READING_TYPES),
+    },
+)
+
+REGISTER_READING_VALIDATOR = RecordValidator(
+    RegisterReading,
+    {
+        "code": literal("030"),
+        "meter_register_id": max_length(2),
+        "reading_at": timestamp,
+        "register_reading": decimal,
+        "md_reset_at": timestamp,
+        "number_of_md_resets": optional_integer(less_than=999),
+        "meter_reading_flag": literal("T", "F", ""),
+        "reading_method": literal("N", "P"),
+    },
+)
+
+METER_READING_VALIDATION_RESULT_VALIDATOR = RecordValidator(
+    MeterReadingValidationResult,
+    {
+        "code": literal("032"),
+        "reason": one_of(METER_READING_REASON_CODES),
+        "status": literal("T", "F"),
+    },
+)
+
+ZPT_FOOTER_VALIDATOR = RecordValidator(
+    ZPTFooter,
+    {
+        "footer_format": literal("ZPT"),
+        "file_identifier": max_length(10),
+        "total_group_count": integer,
+        "checksum": optional_integer(),
+        "flow_count": integer,
+        "file_completed_at": timestamp,
+    },
+)
@@ -0,0 +1,176 @@
+"""Watch an inbound directory and import D0010 flow files as soon as they are complete."""
+
+import os
+import shutil
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from django.db.models import F
+
+from meter_readings.importers.flow_files import DEFAULT_BATCH_SIZE
+from meter_readings.importers.pools import import_flow_files
+from meter_readings.models.watch_checkpoints import WatchCheckpoint
+from meter_readings.schemas.import_profiles import ProfileOptions
+from meter_readings.schemas.import_results import ImportResult
+
+# Files still being written by their sender, which are renamed into place once complete
+TEMPORARY_FILE_SUFFIXES = (".tmp", ".part", ".partial")
+
+
+class WatchedFile(NamedTuple):
+    """A file found in the inbound directory."""
+
+    path: Path
+    size: int
+    # Time the content was last modified (st_mtime_ns)
+    modified_ns: int
+    # Time the file was last changed, including being renamed into place (st_ctime_ns)
+    changed_ns: int
+
+
+class WatchResult(NamedTuple):
+    """Outcome of importing a file from the inbound directory and moving it out."""
+
+    file_path: Path
+    # Result of importing each flow file within the file
+    import_results: list[ImportResult]
+    # Where the file was moved to, or None if it could not be moved
+    destination: Path | None = None
+    move_error: str = ""
+
+
+def is_temporary_file(name: str) -> bool:
+    """Return True if a file is hidden or still being written, so should not be imported yet."""
+    return name.startswith(".") or name.endswith(TEMPORARY_FILE_SUFFIXES)
+
+
+def scan_directory(directory: Path) -> list[WatchedFile]:
+    """Return every file directly in a directory, ignoring subdirectories and temporary files."""
+    watched_files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file() or is_temporary_file(entry.name):
+                continue
+            stat = entry.stat()
+            watched_files.append(WatchedFile(Path(entry.path), stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns))
+    return watched_files
+
+
+def move_file(file_path: Path, directory: Path) -> Path:
+    """Move a file into a directory, adding a numbered suffix if a file of the same name is already there."""
+    directory.mkdir(parents=True, exist_ok=True)
+    destination = directory / file_path.name
+    suffix = 1
+    while destination.exists():
+        destination = directory / f"{file_path.name}.{suffix}"
+        suffix += 1
+    return Path(shutil.move(file_path, destination))
+
+
+class DirectoryWatcher:
+    """Import the flow files arriving in an inbound directory, then move them to a processed or failed directory.
+
+    Compressed files and zip archives are imported too. A zip archive is only moved to the processed directory if
+    every flow file within it was imported.
+
+    A file is complete once it has not been modified for `settle_seconds` and its size has not changed since the
+    previous poll. Files renamed into place are complete as soon as they appear, provided they were written at least
+    `settle_seconds` beforehand.
+
+    Progress is checkpointed in the database after every poll, so a restarted watcher carries on where it stopped.
+    With profile options, a sample of the imported files are profiled.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        directory: Path,
+        processed_directory: Path,
+        failed_directory: Path,
+        settle_seconds: float = 2.0,
+        workers: int = 1,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        profile: ProfileOptions | None = None,
+    ) -> None:
+        """Load the checkpoint of the inbound directory, creating it on the first run."""
+        self.directory = directory
+        self.processed_directory = processed_directory
+        self.failed_directory = failed_directory
+        self.settle_ns = int(settle_seconds * 1_000_000_000)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.profile = profile
+        self.checkpoint, _ = WatchCheckpoint.objects.get_or_create(directory=str(directory.resolve()))
+        # Size of each file not yet imported, when last polled
+        self._sizes: dict[Path, int] = {}
+
+    def poll(self) -> Iterator[WatchResult]:
+        """Import every complete file in the inbound directory, yielding the result of each file once moved."""
+        new_files = [
+            file for file in scan_directory(self.directory) if file.changed_ns > self.checkpoint.last_change_ns
+        ]
+        now_ns = time.time_ns()
+        ready_files = sorted(
+            (
+                file
+                for file in new_files
+                if now_ns - file.modified_ns >= self.settle_ns and self._sizes.get(file.path, file.size) == file.size
+            ),
+            key=lambda file: file.changed_ns,
+        )
+        pending_files = [file for file in new_files if file not in ready_files]
+        self._sizes = {file.path: file.size for file in pending_files}
+        if not ready_files:
+            return
+
+        # Files are only moved once every flow file within them (e.g. within a zip archive) has been imported
+        file_paths = [file.path for file in ready_files]
+        results_by_file_path: dict[Path, list[ImportResult]] = {file_path: [] for file_path in file_paths}
+        workers = min(self.workers, len(file_paths))
+        for result in import_flow_files(
+            file_paths,
+            workers=workers,
+            batch_size=self.batch_size,
+            profile=self.profile,
+        ):
+            results_by_file_path[result.file_path].append(result)
+
+        imported_count = 0
+        failed_count = 0
+        for file_path, results in results_by_file_path.items():
+            success = all(result.success for result in results)
+            if success:
+                imported_count += 1
+            else:
+                failed_count += 1
+            try:
+                destination = move_file(file_path, self.processed_directory if success else self.failed_directory)
+            except OSError as error:
+                # The checkpoint stops the file being imported again, even though it remains in the inbound directory
+                yield WatchResult(file_path, results, move_error=str(error))
+            else:
+                yield WatchResult(file_path, results, destination)
+
+        self.save_checkpoint(ready_files, pending_files, imported_count, failed_count)
+
+    def save_checkpoint(
+        self,
+        ready_files: list[WatchedFile],
+        pending_files: list[WatchedFile],
+        imported_count: int,
+        failed_count: int,
+    ) -> None:
+        """Record the files handled by a poll.
+
+        The checkpoint only moves past a file once every file changed before it has been handled too, so that files
+        still being written are not skipped after a restart.
+        """
+        last_change_ns = max(file.changed_ns for file in ready_files)
+        if pending_files:
+            last_change_ns = min(last_change_ns, min(file.changed_ns for file in pending_files) - 1)
+        self.checkpoint.last_change_ns = max(self.checkpoint.last_change_ns, last_change_ns)
+        self.checkpoint.imported_count = F("imported_count") + imported_count
+        self.checkpoint.failed_count = F("failed_count") + failed_count
+        self.checkpoint.save(update_fields=["last_change_ns", "imported_count", "failed_count", "updated_at"])
+        self.checkpoint.refresh_from_db(fields=["imported_count", "failed_count"])
@@ -1,75 +1,32 @@
 """Import data from D0010 flow files and record it into the database."""
 
-import copy
-import csv
+import logging
+import time
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Any
 
-from django.core.exceptions import ValidationError
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandParser
-from pydantic import ValidationError as PydanticValidationError
 
-from meter_readings.models.energy_readings import EnergyReading
-from meter_readings.models.flow_files import FlowFile, FlowFileMetadata
-from meter_readings.schemas.footers import ZPTFooter
-from meter_readings.schemas.headers import ZHVHeader
-from meter_readings.schemas.meter_reading_types import MeterReadingType
-from meter_readings.schemas.meter_reading_validation_results import MeterReadingValidationResult
-from meter_readings.schemas.mpan_cores import MPANCore
-from meter_readings.schemas.register_readings import RegisterReading
-from meter_readings.schemas.site_visits import SiteVisit
-
-
-def parse_zhv_header(row: list[str]) -> ZHVHeader:
-    """Parse and validate ZHV header data."""
-    # Get list of header fields in the order they are defined in the model
-    zhv_header_fields = list(ZHVHeader.model_fields.keys())
-    # Match header fields with values
-    zhv_header_data = dict(zip(zhv_header_fields, row, strict=False))
-    # Parse and validate data
-    return ZHVHeader.model_validate(zhv_header_data)
-
-
-def parse_mpan_core(row: list[str]) -> MPANCore:
-    """Parse and validate MPAN core data."""
-    mpan_core_fields = list(MPANCore.model_fields.keys())
-    mpan_core_data = dict(zip(mpan_core_fields, row, strict=False))
-    return MPANCore.model_validate(mpan_core_data)
-
-
-def parse_site_visit(row: list[str]) -> SiteVisit:
-    """Parse and validate site visit data."""
-    site_visit_fields = list(SiteVisit.model_fields.keys())
-    site_visit_data = dict(zip(site_visit_fields, row, strict=False))
-    return SiteVisit.model_validate(site_visit_data)
-
-
-def parse_meter_reading_type(row: list[str]) -> MeterReadingType:
-    """Parse and validate meter reading type data."""
-    meter_reading_type_fields = list(MeterReadingType.model_fields.keys())
-    meter_reading_type_data = dict(zip(meter_reading_type_fields, row, strict=False))
-    return MeterReadingType.model_validate(meter_reading_type_data)
-
-
-def parse_register_reading(row: list[str]) -> RegisterReading:
-    """Parse and validate register reading data."""
-    register_reading_fields = list(RegisterReading.model_fields.keys())
-    register_reading_data = dict(zip(register_reading_fields, row, strict=False))
-    return RegisterReading.model_validate(register_reading_data)
-
-
-def parse_meter_reading_validation_result(row: list[str]) -> MeterReadingValidationResult:
-    """Parse and validate meter reading validation result data."""
-    meter_reading_validation_result_fields = list(MeterReadingValidationResult.model_fields.keys())
-    meter_reading_validation_result_data = dict(zip(meter_reading_validation_result_fields, row, strict=False))
-    return MeterReadingValidationResult.model_validate(meter_reading_validation_result_data)
-
-
-def parse_zpt_footer(row: list[str]) -> ZPTFooter:
-    """Parse and validate ZPT footer data."""
-    zpt_footer_fields = list(ZPTFooter.model_fields.keys())
-    zpt_footer_data = dict(zip(zpt_footer_fields, row, strict=False))
-    return ZPTFooter.model_validate(zpt_footer_data)
+from meter_readings.importers.flow_files import DEFAULT_BATCH_SIZE
+from meter_readings.importers.jobs import enqueue_import_jobs
+from meter_readings.importers.journals import ImportJournal
+from meter_readings.importers.pools import import_flow_files
+from meter_readings.importers.profiles import (
+    PROFILERS,
+    get_profile_options,
+    summarise_cprofile_reports,
+    summarise_tracemalloc_reports,
+)
+from meter_readings.importers.stats import build_stats_log_line
+from meter_readings.schemas.import_profiles import ProfileOptions
+from meter_readings.schemas.import_results import ImportResult
+from meter_readings.schemas.import_stats import ImportStats
+from meter_readings.utils.databases import sqlite_bulk_import
+
+# Logger of the statistics of each imported file, as JSON lines (see LOGGING in settings)
+stats_logger = logging.getLogger("meter_readings.import_stats")
 
 
 class Command(BaseCommand):
@@ -79,197 +36,280 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser: CommandParser) -> None:
         """Arguments for importing D0010 file command."""
-        parser.add_argument("file_path", type=str, help="Path to the D0010 file")
+        parser.add_argument(
+            "file_path",
+            type=str,
+            help="Path to the D0010 file (plain, .gz, .bz2 or a .zip archive of files) or a directory of them",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Number of energy readings written per bulk insert (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes used to parse and import files in parallel (default: 1)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Import files even if a file with identical content has already been imported",
+        )
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Queue a job to import each file, to be imported by run_import_workers, rather than importing them",
+        )
+        parser.add_argument(
+            "--resume",
+            type=int,
+            metavar="RUN_ID",
+            help="Resume an interrupted import run, skipping the files it imported and retrying those which failed",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help=(
+                "Print the time spent in each stage of importing each file and counts of what was imported, also "
+                "logging them as a JSON line per file"
+            ),
+        )
+        parser.add_argument(
+            "--profile",
+            nargs="?",
+            const="cprofile",
+            choices=PROFILERS,
+            help=(
+                "Profile importing each file with cProfile (the default) or tracemalloc, writing a report per file to "
+                "D0010_PROFILE_DIR and printing the functions taking the most time (or the peak memory and "
+                "lines holding the most memory) at the end"
+            ),
+        )
+        parser.add_argument(
+            "--profile-top",
+            type=int,
+            default=20,
+            help="Number of functions (or lines) printed at the end of a profiled import (default: 20)",
+        )
+        parser.add_argument(
+            "--bulk-import",
+            action="store_true",
+            help=(
+                "Tune a SQLite database for bulk imports (WAL, larger caches) while importing, restoring its "
+                "settings afterwards (see D0010_SQLITE_BULK_IMPORT_PRAGMAS)"
+            ),
+        )
 
     def handle(self, *args: Any, **kwargs: dict[str, Any]) -> None:  # noqa: ANN401
         """Import, process and record data read from D0010 flow files."""
         file_path = Path(kwargs["file_path"])  # type: ignore[arg-type]
+        batch_size: int = kwargs["batch_size"]  # type: ignore[assignment]
+        workers: int = kwargs["workers"]  # type: ignore[assignment]
+        force: bool = kwargs["force"]  # type: ignore[assignment]
+        resume_run_id: int | None = kwargs["resume"]  # type: ignore[assignment]
+        bulk_import = kwargs["bulk_import"] or settings.D0010_BULK_IMPORT
+        collect_stats: bool = kwargs["stats"]  # type: ignore[assignment]
+        profile = get_profile_options(kwargs["profile"])  # type: ignore[arg-type]
+        profile_top: int = kwargs["profile_top"]  # type: ignore[assignment]
 
         if not file_path.exists():
             self.stdout.write(self.style.ERROR(f"No valid file or directory found at {file_path}"))
             return
 
-        # File path is a directory
-        if file_path.is_dir():
-            # Iterate through all files in directory
-            for file in file_path.iterdir():
-                # Only import files, not any subdirectories
-                if file.is_file():
-                    self.import_file(file)
-        # File path is a single file
-        elif file_path.is_file():
-            self.import_file(file_path)
-
-    def import_file(self, file_path: Path) -> None:  # noqa: C901
-        """Import data from a single D0010 file."""
-        self.stdout.write(f"Processing file: {file_path}")
-
-        error_found = False
-        header_present = False
-        footer_present = False
-        energy_reading_schema_list = []
-        energy_reading_schema = {}
-        with file_path.open(mode="r") as file:
-            reader = csv.reader(file, delimiter="|")
-            for row in reader:
-                try:
-                    # Process file header
-                    if row[0] == "ZHV" or row[0] == "ZHF":
-                        header_present = True
-                        zhv_header = parse_zhv_header(row)
-
-                    # Process MPAN core data
-                    if row[0] == "026":
-                        if energy_reading_schema:
-                            energy_reading_schema_list.append(energy_reading_schema)
-
-                        # Reset energy reading schema for new MPAN core
-                        energy_reading_schema = {}
-                        mpan_core = parse_mpan_core(row)
-                        energy_reading_schema["mpan_core"] = mpan_core
-
-                    # Process site visit data for MPAN core
-                    if row[0] == "027":
-                        mpan_site_visit = parse_site_visit(row)
-                        energy_reading_schema["mpan_site_visit"] = mpan_site_visit
-
-                    # Process meter reading data
-                    if row[0] == "028":
-                        meter_reading_types = parse_meter_reading_type(row)
-                        energy_reading_schema["meter_reading_types"] = meter_reading_types
-
-                    # Process site visit data for meter readings
-                    if row[0] == "029":
-                        meter_reading_site_visit = parse_site_visit(row)
-                        energy_reading_schema["meter_reading_site_visit"] = meter_reading_site_visit
-
-                    # Process register reading data
-                    if row[0] == "030":
-                        # If a 030 reading has already been recorded,
-                        # then there are 2 (or more) registers (e.g. Day and Night),
-                        # so record all the registers as separate readings
-                        if "register_reading" in energy_reading_schema:
-                            energy_reading_schema_list.append(energy_reading_schema)
-
-                            # Reset energy reading schema for new register reading
-                            energy_reading_schema = copy.deepcopy(energy_reading_schema_list[-1])
-
-                        register_reading = parse_register_reading(row)
-                        energy_reading_schema["register_reading"] = register_reading
-
-                    # Process meter reading validation result data
-                    if row[0] == "032":
-                        meter_reading_validation_result = parse_meter_reading_validation_result(row)
-                        energy_reading_schema["meter_reading_validation_result"] = meter_reading_validation_result
-
-                    # Process site visit data for register readings
-                    if row[0] == "033":
-                        register_reading_site_visit = parse_site_visit(row)
-                        energy_reading_schema["register_reading_site_visit"] = register_reading_site_visit
-
-                    # Process file footer
-                    if row[0] == "ZPT":
-                        # Record the last energy reading schema
-                        energy_reading_schema_list.append(energy_reading_schema)
-
-                        footer_present = True
-                        zpt_footer = parse_zpt_footer(row)
-
-                        # Exit reading file as we have read the footer
-                        # Assumption: any data after file footer is either a blank line or invalid data
-                        break
+        if batch_size < 1:
+            self.stdout.write(self.style.ERROR(f"Batch size must be a positive integer, not {batch_size}"))
+            return
 
-                except (IndexError, ValueError, ValidationError, PydanticValidationError) as e:
-                    error_found = True
-                    self.stdout.write(self.style.ERROR(f"Error processing row: {row} - {e}"))
+        if workers < 1:
+            self.stdout.write(self.style.ERROR(f"Number of workers must be a positive integer, not {workers}"))
+            return
 
-        if error_found:
-            self.stdout.write(self.style.ERROR(f"No data from this file will be written to the database: {file_path}."))
+        if profile_top < 1:
+            self.stdout.write(
+                self.style.ERROR(f"Number of profiled functions must be a positive integer, not {profile_top}"),
+            )
             return
 
-        # Only write data to database if no errors have been found
-        flow_file = FlowFile.objects.create(name=file_path.stem, extension=file_path.suffix)
+        # File path is a directory: import all files in it, but not any subdirectories
+        if file_path.is_dir():
+            file_paths = sorted(file for file in file_path.iterdir() if file.is_file())
+        # File path is a single file
+        else:
+            file_paths = [file_path]
 
-        # Save metadata (from header and footer) to database
-        if header_present and footer_present:
-            self.save_flow_file_metadata(flow_file, zhv_header, zpt_footer)
+        if kwargs["enqueue"]:
+            jobs = enqueue_import_jobs(file_paths, force=force)
+            self.stdout.write(self.style.SUCCESS(f"Queued {len(jobs)} import jobs"))
+            return
 
-        # Process energy readings
-        for energy in energy_reading_schema_list:
-            self.save_energy_reading(flow_file, energy)
+        journal = self.open_journal(file_path, resume_run_id)
+        if journal is None:
+            return
 
-        self.stdout.write(self.style.SUCCESS(f"Data imported successfully from {file_path}"))
+        start_time = time.perf_counter()
+        results = []
+        with sqlite_bulk_import() if bulk_import else nullcontext():
+            for result in import_flow_files(
+                file_paths,
+                workers=workers,
+                batch_size=batch_size,
+                force=force,
+                completed=journal.completed_sources,
+                collect_stats=collect_stats,
+                profile=profile,
+            ):
+                self.write_import_result(result)
+                if collect_stats:
+                    self.write_import_stats(result)
+                journal.record(result)
+                results.append(result)
+        journal.finish()
+
+        self.write_run_summary(
+            results,
+            time.perf_counter() - start_time,
+            collect_stats=collect_stats,
+            profile=profile,
+            profile_top=profile_top,
+        )
 
-    def save_flow_file_metadata(self, flow_file: FlowFile, header: ZHVHeader, footer: ZPTFooter) -> None:
-        """Save flow file metadata to the database."""
-        FlowFileMetadata.objects.create(
-            flow_file=flow_file,
-            header_format=header.header_format,
-            footer_format=footer.footer_format,
-            file_identifier=footer.file_identifier,
-            data_flow=header.data_flow,
-            data_flow_version=header.data_flow_version,
-            from_market_participant_role_code=header.from_market_participant_role_code,
-            from_market_participant_id=header.from_market_participant_id,
-            to_market_participant_role_code=header.to_market_participant_role_code,
-            to_market_participant_id=header.to_market_participant_id,
-            sending_application_id=header.sending_application_id,
-            receiving_application_id=header.receiving_application_id,
-            broadcast=header.broadcast,
-            test_data_flag=header.test_data_flag,
-            total_group_count=footer.total_group_count,
-            footer_checksum=footer.checksum,
-            flow_count=footer.flow_count,
-            file_created_at=header.file_created_at_datetime,
-            file_completed_at=footer.file_completed_at_datetime,
+    def open_journal(self, file_path: Path, resume_run_id: int | None) -> ImportJournal | None:
+        """Start a new import run, or resume an interrupted one, returning its journal (or None if it cannot be)."""
+        if resume_run_id is None:
+            journal = ImportJournal.start(file_path)
+            self.stdout.write(f"Started import run {journal.run.pk} (resume it with --resume {journal.run.pk})")
+            return journal
+
+        try:
+            journal = ImportJournal.resume(resume_run_id, file_path)
+        except ValueError as error:
+            self.stdout.write(self.style.ERROR(str(error)))
+            return None
+        self.stdout.write(
+            f"Resuming import run {resume_run_id}: {len(journal.completed_sources)} files already imported",
         )
+        return journal
+
+    def write_run_summary(
+        self,
+        results: list[ImportResult],
+        elapsed_seconds: float,
+        *,
+        collect_stats: bool,
+        profile: ProfileOptions | None,
+        profile_top: int,
+    ) -> None:
+        """Write what was imported by a run, with its statistics and profiles if they were collected."""
+        if len(results) > 1:
+            self.write_summary(results, elapsed_seconds)
+            if collect_stats:
+                self.write_total_stats(results)
+        if profile is not None:
+            self.write_profile_summary(results, profile, profile_top)
+
+    def write_import_result(self, result: ImportResult) -> None:
+        """Write the outcome of importing a single file."""
+        if result.skipped:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Skipped {result.display_path}: a file with identical content has already been imported "
+                    "(use --force to import it again).",
+                ),
+            )
+            return
 
-    def save_energy_reading(self, flow_file: FlowFile, energy_reading: dict[str, Any]) -> None:
-        """Save energy reading to the database."""
-        mpan_core = energy_reading.get("mpan_core")
-        mpan_site_visit = energy_reading.get("mpan_site_visit")
-        meter_reading_types = energy_reading.get("meter_reading_types")
-        meter_reading_site_visit = energy_reading.get("meter_reading_site_visit")
-        register_reading = energy_reading.get("register_reading")
-        meter_reading_validation_result = energy_reading.get("meter_reading_validation_result")
-        register_reading_site_visit = energy_reading.get("register_reading_site_visit")
+        if not result.success:
+            for error in result.errors:
+                self.stdout.write(self.style.ERROR(error))
+            self.stdout.write(
+                self.style.ERROR(f"No data from this file will be written to the database: {result.display_path}."),
+            )
+            return
 
-        EnergyReading.objects.create(
-            flow_file=flow_file,
-            # MPAN core
-            mpan_core=mpan_core.mpan_core if mpan_core else "",
-            bsc_validation_status=mpan_core.bsc_validation_status if mpan_core else "",
-            # MPAN site visit
-            mpan_site_visit_reason=mpan_site_visit.visit_reason if mpan_site_visit else "",
-            mpan_site_visit_additional_information=mpan_site_visit.additional_information if mpan_site_visit else "",
-            # Meter reading types
-            meter_id=meter_reading_types.meter_id if meter_reading_types else "",
-            meter_reading_type=meter_reading_types.reading_type if meter_reading_types else "",
-            # Meter reading site visit
-            meter_reading_site_visit_reason=meter_reading_site_visit.visit_reason if meter_reading_site_visit else "",
-            meter_reading_site_visit_additional_information=(
-                meter_reading_site_visit.additional_information if meter_reading_site_visit else ""
-            ),
-            # Register reading
-            meter_register_id=register_reading.meter_register_id if register_reading else "",
-            reading_at=register_reading.reading_at_datetime if register_reading else None,
-            register_reading=register_reading.register_reading if register_reading else None,
-            md_reset_at=register_reading.md_reset_at_datetime if register_reading else None,
-            number_of_md_resets=register_reading.number_of_md_resets if register_reading else None,
-            meter_reading_flag=register_reading.meter_reading_flag if register_reading else "",
-            reading_method=register_reading.reading_method if register_reading else "",
-            # Meter reading validation result
-            meter_reading_validation_result_reason=(
-                meter_reading_validation_result.reason if meter_reading_validation_result else ""
-            ),
-            meter_reading_validation_result_status=(
-                meter_reading_validation_result.status if meter_reading_validation_result else ""
-            ),
-            # Register reading site visit
-            register_reading_site_visit_reason=(
-                register_reading_site_visit.visit_reason if register_reading_site_visit else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Data imported successfully from {result.display_path}: {result.reading_count} readings "
+                f"in {result.elapsed_seconds:.3f}s ({result.rows_per_second:,.0f} rows/sec)",
             ),
-            register_reading_site_visit_additional_information=(
-                register_reading_site_visit.additional_information if register_reading_site_visit else ""
+        )
+        if result.profile_path is not None:
+            self.stdout.write(f"  Profile written to {result.profile_path}")
+
+    def write_import_stats(self, result: ImportResult) -> None:
+        """Write the time spent in each stage of importing a single file, and log them as a JSON line."""
+        stats_logger.info(build_stats_log_line(result))
+        if result.stats is not None:
+            self.write_stats(result.stats)
+
+    def write_total_stats(self, results: list[ImportResult]) -> None:
+        """Write the time spent in each stage of importing every file."""
+        total_stats = ImportStats()
+        for result in results:
+            if result.stats is not None:
+                total_stats.merge(result.stats)
+        self.stdout.write("Total:")
+        self.write_stats(total_stats)
+
+    def write_stats(self, stats: ImportStats) -> None:
+        """Write the time spent in each stage of an import, and counts of what was imported."""
+        self.stdout.write(
+            "  Stages: " + ", ".join(f"{stage} {seconds:.3f}s" for stage, seconds in stats.stage_seconds.items()),
+        )
+        self.stdout.write(
+            "  Rows: "
+            + ", ".join(
+                f"{code or 'blank'} x{count} ({stats.validate_seconds.get(code, 0.0):.3f}s)"
+                for code, count in stats.row_counts.items()
             ),
         )
+        self.stdout.write(
+            f"  Counts: {stats.group_count} groups, {stats.reading_count} readings, {stats.error_count} errors, "
+            f"{stats.query_count} queries",
+        )
+
+    def write_profile_summary(self, results: list[ImportResult], profile: ProfileOptions, top: int) -> None:
+        """Write the functions taking the most time (or the peak and retained memory) in every profiled file."""
+        profile_paths = [result.profile_path for result in results if result.profile_path is not None]
+        if not profile_paths:
+            return
+
+        if profile.profiler == "cprofile":
+            self.stdout.write(f"Functions taking the most time in {len(profile_paths)} profiled files:")
+            for function in summarise_cprofile_reports(profile_paths, top):
+                self.stdout.write(
+                    f"  {function.own_seconds:>9.3f}s own {function.cumulative_seconds:>9.3f}s cumulative "
+                    f"{function.call_count:>10,} calls  {function.location}",
+                )
+        else:
+            memory = summarise_tracemalloc_reports(profile_paths, top)
+            self.stdout.write(
+                f"Memory of {len(profile_paths)} profiled files: {memory.peak_size / 1024:,.1f}KiB peak, "
+                f"{memory.retained_size / 1024:,.1f}KiB retained (largest of any file)",
+            )
+            self.stdout.write(
+                f"Lines holding the most memory once each of {len(profile_paths)} profiled files was imported:",
+            )
+            for allocation in memory.allocations:
+                self.stdout.write(
+                    f"  {allocation.size / 1024:>12,.1f}KiB "
+                    f"{allocation.block_count:>10,} blocks  {allocation.location}",
+                )
+        self.stdout.write(f"Reports written to {profile.directory}")
+
+    def write_summary(self, results: list[ImportResult], elapsed_seconds: float) -> None:
+        """Write a summary of the successes, failures and time taken for every imported file."""
+        failure_count = sum(not result.success for result in results)
+        skipped_count = sum(result.skipped for result in results)
+        self.stdout.write(
+            f"Imported {len(results) - failure_count - skipped_count} of {len(results)} files "
+            f"({failure_count} failed, {skipped_count} skipped) in {elapsed_seconds:.3f}s",
+        )
+        for result in sorted(results, key=lambda result: result.display_path):
+            status = "SKIPPED" if result.skipped else "OK" if result.success else "FAILED"
+            self.stdout.write(
+                f"  {status:<7} {result.display_path.relative_to(result.file_path.parent)}: "
+                f"{result.reading_count} readings in {result.elapsed_seconds:.3f}s",
+            )
@@ -0,0 +1,165 @@
+"""Run workers importing the D0010 flow files queued as import jobs."""
+
+import multiprocessing
+import signal
+from contextlib import suppress
+from types import FrameType
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections
+
+from meter_readings.importers.flow_files import DEFAULT_BATCH_SIZE
+from meter_readings.importers.jobs import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_STALE_SECONDS,
+    HEARTBEATS_PER_STALE_PERIOD,
+    ImportQueueStats,
+    ImportWorkerOptions,
+    describe_import_job,
+    get_import_queue_stats,
+    run_import_worker,
+    run_import_worker_process,
+)
+from meter_readings.models.import_jobs import ImportJob
+
+
+class Command(BaseCommand):
+    """Run workers importing the D0010 flow files queued as import jobs."""
+
+    help = "Run workers importing queued D0010 files (see import_d0010_files --enqueue)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Arguments for running import workers command."""
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes claiming and importing jobs concurrently (default: 1)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Number of energy readings written per bulk insert (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=DEFAULT_MAX_ATTEMPTS,
+            help=(
+                "Number of times a job failing with a transient database error is attempted before it is failed "
+                f"(default: {DEFAULT_MAX_ATTEMPTS})"
+            ),
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Number of seconds between polls of the queue when no job is ready (default: 1.0)",
+        )
+        parser.add_argument(
+            "--stale-seconds",
+            type=float,
+            default=DEFAULT_STALE_SECONDS,
+            help=(
+                "Number of seconds without a heartbeat after which a running job is assumed to have lost its worker, "
+                "and is queued again (or failed, once attempted too many times). Workers send "
+                f"{HEARTBEATS_PER_STALE_PERIOD} heartbeats in this time (default: {DEFAULT_STALE_SECONDS:.0f})"
+            ),
+        )
+        parser.add_argument("--once", action="store_true", help="Run jobs until none is ready, then exit")
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print the depth of the queue and the latency of recently finished jobs, then exit",
+        )
+
+    def handle(self, *args: Any, **kwargs: dict[str, Any]) -> None:  # noqa: ANN401
+        """Run workers claiming and importing queued jobs, until stopped (or the queue is empty)."""
+        workers: int = kwargs["workers"]  # type: ignore[assignment]
+        max_attempts: int = kwargs["max_attempts"]  # type: ignore[assignment]
+        options = ImportWorkerOptions(
+            batch_size=kwargs["batch_size"],  # type: ignore[arg-type]
+            max_attempts=max_attempts,
+            poll_seconds=kwargs["poll_interval"],  # type: ignore[arg-type]
+            stale_seconds=kwargs["stale_seconds"],  # type: ignore[arg-type]
+            once=kwargs["once"],  # type: ignore[arg-type]
+        )
+
+        if kwargs["stats"]:
+            self.write_queue_stats(get_import_queue_stats())
+            return
+
+        if options.batch_size < 1:
+            self.stdout.write(self.style.ERROR(f"Batch size must be a positive integer, not {options.batch_size}"))
+            return
+
+        if workers < 1:
+            self.stdout.write(self.style.ERROR(f"Number of workers must be a positive integer, not {workers}"))
+            return
+
+        if max_attempts < 1:
+            self.stdout.write(self.style.ERROR(f"Number of attempts must be a positive integer, not {max_attempts}"))
+            return
+
+        # Workers stop between jobs (rather than part way through one) when asked to terminate
+        self.stopping = multiprocessing.Event()
+        signal.signal(signal.SIGTERM, self.stop)
+        self.stdout.write(f"Running {workers} import worker(s) (Ctrl+C to stop)")
+
+        if workers == 1:
+            with suppress(KeyboardInterrupt):
+                run_import_worker(options, self.stopping, self.write_import_job)
+        else:
+            self.run_worker_processes(workers, options)
+
+        self.write_queue_stats(get_import_queue_stats())
+
+    def run_worker_processes(self, workers: int, options: ImportWorkerOptions) -> None:
+        """Run each worker in a process of its own, waiting for them all to stop."""
+        # Worker processes must open their own database connections rather than share this one
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(
+                target=run_import_worker_process,
+                args=(settings.SETTINGS_MODULE, options, self.stopping),
+                name=f"import-worker-{number}",
+            )
+            for number in range(1, workers + 1)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            self.stopping.set()
+            for process in processes:
+                process.join()
+
+    def stop(self, signal_number: int, frame: FrameType | None) -> None:  # pylint: disable=unused-argument
+        """Stop every worker after its current job."""
+        self.stopping.set()
+
+    def write_import_job(self, job: ImportJob) -> None:
+        """Write the outcome of running a job."""
+        description = describe_import_job(job)
+        if job.status == ImportJob.Status.DONE:
+            self.stdout.write(self.style.SUCCESS(description))
+        elif job.status in {ImportJob.Status.FAILED, ImportJob.Status.RUNNING}:
+            self.stdout.write(self.style.ERROR(description))
+        else:
+            self.stdout.write(self.style.WARNING(description))
+
+    def write_queue_stats(self, stats: ImportQueueStats) -> None:
+        """Write the depth of the queue and the latency of recently finished jobs."""
+        counts = ", ".join(f"{stats.status_counts.get(status, 0)} {status}" for status in ImportJob.Status.values)
+        self.stdout.write(f"Import jobs: {counts}")
+        self.stdout.write(f"Queue depth: {stats.depth} (oldest queued {stats.oldest_queued_seconds:.1f}s ago)")
+        if stats.average_wait_seconds is not None:
+            self.stdout.write(
+                f"Jobs finished in the last hour: waited {stats.average_wait_seconds:.2f}s on average "
+                f"(longest {stats.max_wait_seconds:.2f}s), ran {stats.average_run_seconds:.2f}s on average",
+            )
@@ -4,7 +4,14 @@ from typing import Any
 
 from django.core.management.base import BaseCommand
 
+from meter_readings.models.date_buckets import DateBucket
 from meter_readings.models.flow_files import FlowFile, FlowFileMetadata
+from meter_readings.models.import_jobs import ImportJob
+from meter_readings.models.import_runs import ImportRun
+from meter_readings.models.meters import Meter
+from meter_readings.models.mpans import MPAN
+from meter_readings.models.site_visits import SiteVisit
+from meter_readings.models.watch_checkpoints import WatchCheckpoint
 
 
 class Command(BaseCommand):
@@ -16,5 +23,14 @@ class Command(BaseCommand):
         """Truncate all database records."""
         FlowFile.objects.all().delete()
         FlowFileMetadata.objects.all().delete()
+        # Readings are deleted with their flow files, after which their MPANs, meters (and registers) and site visits
+        # can be deleted
+        MPAN.objects.all().delete()
+        Meter.objects.all().delete()
+        SiteVisit.objects.all().delete()
+        DateBucket.objects.all().delete()
+        WatchCheckpoint.objects.all().delete()
+        ImportRun.objects.all().delete()
+        ImportJob.objects.all().delete()
 
         self.stdout.write(self.style.SUCCESS("Successfully truncated all tables"))  # pylint: disable=no-member
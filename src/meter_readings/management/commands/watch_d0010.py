@@ -0,0 +1,122 @@
+"""Watch an inbound directory and import D0010 flow files into the database as they arrive."""
+
+import signal
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from django.core.management.base import CommandParser
+
+from meter_readings.importers.flow_files import DEFAULT_BATCH_SIZE
+from meter_readings.importers.profiles import get_profile_options
+from meter_readings.importers.watchers import DirectoryWatcher, WatchResult
+from meter_readings.management.commands.import_d0010_files import Command as ImportCommand
+
+
+class Command(ImportCommand):
+    """Watch an inbound directory and import D0010 flow files into database as they arrive."""
+
+    help = "Watch a directory and import D0010 files as they arrive."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Arguments for watching a directory of D0010 files command."""
+        parser.add_argument("directory", type=str, help="Path to the inbound directory of D0010 files")
+        parser.add_argument(
+            "--processed-dir",
+            type=str,
+            help="Directory imported files are moved to (default: <directory>/processed)",
+        )
+        parser.add_argument(
+            "--failed-dir",
+            type=str,
+            help="Directory files which could not be imported are moved to (default: <directory>/failed)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Number of seconds between polls of the inbound directory (default: 1.0)",
+        )
+        parser.add_argument(
+            "--settle-seconds",
+            type=float,
+            default=2.0,
+            help="Number of seconds a file must be left unmodified before it is imported (default: 2.0)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Number of energy readings written per bulk insert (default: {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Maximum number of worker processes used to import files in parallel (default: 1)",
+        )
+        parser.add_argument("--once", action="store_true", help="Poll the inbound directory once, then exit")
+
+    def handle(self, *args: Any, **kwargs: dict[str, Any]) -> None:  # noqa: ANN401
+        """Poll the inbound directory, importing every complete file, until stopped."""
+        directory = Path(kwargs["directory"])  # type: ignore[arg-type]
+        processed_directory = Path(kwargs["processed_dir"] or directory / "processed")  # type: ignore[operator]
+        failed_directory = Path(kwargs["failed_dir"] or directory / "failed")  # type: ignore[operator]
+        interval: float = kwargs["interval"]  # type: ignore[assignment]
+        batch_size: int = kwargs["batch_size"]  # type: ignore[assignment]
+        workers: int = kwargs["workers"]  # type: ignore[assignment]
+
+        if not directory.is_dir():
+            self.stdout.write(self.style.ERROR(f"No valid directory found at {directory}"))
+            return
+
+        if batch_size < 1:
+            self.stdout.write(self.style.ERROR(f"Batch size must be a positive integer, not {batch_size}"))
+            return
+
+        if workers < 1:
+            self.stdout.write(self.style.ERROR(f"Number of workers must be a positive integer, not {workers}"))
+            return
+
+        watcher = DirectoryWatcher(
+            directory,
+            processed_directory,
+            failed_directory,
+            settle_seconds=kwargs["settle_seconds"],  # type: ignore[arg-type]
+            workers=workers,
+            batch_size=batch_size,
+            # Files are only profiled if sampled, as set by D0010_PROFILE_SAMPLE_RATE
+            profile=get_profile_options(),
+        )
+
+        if kwargs["once"]:
+            for result in watcher.poll():
+                self.write_watch_result(result)
+            return
+
+        # Stop between polls (rather than part way through importing a file) when asked to terminate
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        self.stdout.write(f"Watching {directory} for D0010 files every {interval}s (Ctrl+C to stop)")
+        try:
+            while not self.stopping:
+                for result in watcher.poll():
+                    self.write_watch_result(result)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"Stopped watching {directory}")
+
+    def stop(self, signal_number: int, frame: FrameType | None) -> None:  # pylint: disable=unused-argument
+        """Stop watching after the current poll."""
+        self.stopping = True
+
+    def write_watch_result(self, result: WatchResult) -> None:
+        """Write the outcome of importing a single file and moving it out of the inbound directory."""
+        for import_result in result.import_results:
+            self.write_import_result(import_result)
+        if result.destination is None:
+            self.stdout.write(self.style.ERROR(f"Unable to move {result.file_path}: {result.move_error}"))
+        else:
+            self.stdout.write(f"Moved {result.file_path.name} to {result.destination}")
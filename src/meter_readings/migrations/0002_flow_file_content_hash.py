@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:51
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.models.functions import Coalesce
+
+
+def copy_file_identifiers(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Copy the file identifier of previously imported flow files from their metadata."""
+    FlowFile = apps.get_model("meter_readings", "FlowFile")  # noqa: N806
+    FlowFileMetadata = apps.get_model("meter_readings", "FlowFileMetadata")  # noqa: N806
+    file_identifiers = FlowFileMetadata.objects.filter(flow_file=models.OuterRef("pk")).values("file_identifier")[:1]
+    FlowFile.objects.update(file_identifier=Coalesce(models.Subquery(file_identifiers), models.Value("")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flowfile",
+            name="content_hash",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="flowfile",
+            name="file_identifier",
+            field=models.CharField(blank=True, db_index=True, max_length=10),
+        ),
+        migrations.RunPython(copy_file_identifiers, migrations.RunPython.noop),
+    ]
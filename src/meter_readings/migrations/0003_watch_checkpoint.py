@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0002_flow_file_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WatchCheckpoint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("directory", models.CharField(max_length=1024, unique=True)),
+                ("last_change_ns", models.BigIntegerField(default=0)),
+                ("imported_count", models.PositiveIntegerField(default=0)),
+                ("failed_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0003_watch_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flowfile",
+            name="archive_name",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
@@ -0,0 +1,341 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:23
+
+import django.db.models.deletion
+from django.apps.registry import Apps
+from django.core.management.color import no_style
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+ENERGY_READING_COLUMNS = (
+    "id",
+    "flow_file_id",
+    "mpan_core",
+    "bsc_validation_status",
+    "mpan_site_visit_reason",
+    "mpan_site_visit_additional_information",
+    "meter_id",
+    "meter_reading_type",
+    "meter_reading_site_visit_reason",
+    "meter_reading_site_visit_additional_information",
+    "meter_register_id",
+    "reading_at",
+    "register_reading",
+    "md_reset_at",
+    "number_of_md_resets",
+    "meter_reading_flag",
+    "reading_method",
+    "meter_reading_validation_result_reason",
+    "meter_reading_validation_result_status",
+    "register_reading_site_visit_reason",
+    "register_reading_site_visit_additional_information",
+)
+
+# Every reading joined to its MPAN, meter, register and site visits, with the columns of the original energy reading
+# table (in the order of ENERGY_READING_COLUMNS)
+ENERGY_READING_SELECT = """
+SELECT
+    readings.id,
+    readings.flow_file_id,
+    mpans.mpan_core,
+    mpans.bsc_validation_status,
+    mpan_site_visits.visit_reason AS mpan_site_visit_reason,
+    mpan_site_visits.additional_information AS mpan_site_visit_additional_information,
+    meters.meter_id,
+    meters.meter_reading_type,
+    meter_reading_site_visits.visit_reason AS meter_reading_site_visit_reason,
+    meter_reading_site_visits.additional_information AS meter_reading_site_visit_additional_information,
+    registers.meter_register_id,
+    readings.reading_at,
+    readings.register_reading,
+    readings.md_reset_at,
+    readings.number_of_md_resets,
+    readings.meter_reading_flag,
+    readings.reading_method,
+    readings.meter_reading_validation_result_reason,
+    readings.meter_reading_validation_result_status,
+    register_reading_site_visits.visit_reason AS register_reading_site_visit_reason,
+    register_reading_site_visits.additional_information AS register_reading_site_visit_additional_information
+FROM meter_readings_reading AS readings
+INNER JOIN meter_readings_mpan AS mpans ON mpans.id = readings.mpan_id
+INNER JOIN meter_readings_sitevisit AS mpan_site_visits ON mpan_site_visits.id = readings.mpan_site_visit_id
+INNER JOIN meter_readings_meter AS meters ON meters.id = readings.meter_id
+INNER JOIN meter_readings_sitevisit AS meter_reading_site_visits
+    ON meter_reading_site_visits.id = readings.meter_reading_site_visit_id
+INNER JOIN meter_readings_register AS registers ON registers.id = readings.register_id
+INNER JOIN meter_readings_sitevisit AS register_reading_site_visits
+    ON register_reading_site_visits.id = readings.register_reading_site_visit_id
+"""
+
+# Statements copying the original energy reading table into the normalised tables: each distinct MPAN, meter,
+# register and site visit once, then every reading (keeping its ID) referring to them
+BACKFILL_STATEMENTS = (
+    """
+    INSERT INTO meter_readings_mpan (mpan_core, bsc_validation_status)
+    SELECT DISTINCT mpan_core, bsc_validation_status FROM meter_readings_energyreading
+    """,
+    """
+    INSERT INTO meter_readings_meter (meter_id, meter_reading_type)
+    SELECT DISTINCT meter_id, meter_reading_type FROM meter_readings_energyreading
+    """,
+    """
+    INSERT INTO meter_readings_register (meter_id, meter_register_id)
+    SELECT DISTINCT meters.id, energy_readings.meter_register_id
+    FROM meter_readings_energyreading AS energy_readings
+    INNER JOIN meter_readings_meter AS meters
+        ON meters.meter_id = energy_readings.meter_id AND meters.meter_reading_type = energy_readings.meter_reading_type
+    """,
+    """
+    INSERT INTO meter_readings_sitevisit (visit_reason, additional_information)
+    SELECT mpan_site_visit_reason, mpan_site_visit_additional_information FROM meter_readings_energyreading
+    UNION
+    SELECT meter_reading_site_visit_reason, meter_reading_site_visit_additional_information
+    FROM meter_readings_energyreading
+    UNION
+    SELECT register_reading_site_visit_reason, register_reading_site_visit_additional_information
+    FROM meter_readings_energyreading
+    """,
+    """
+    INSERT INTO meter_readings_reading (
+        id,
+        flow_file_id,
+        mpan_id,
+        mpan_site_visit_id,
+        meter_id,
+        meter_reading_site_visit_id,
+        register_id,
+        register_reading_site_visit_id,
+        reading_at,
+        register_reading,
+        md_reset_at,
+        number_of_md_resets,
+        meter_reading_flag,
+        reading_method,
+        meter_reading_validation_result_reason,
+        meter_reading_validation_result_status
+    )
+    SELECT
+        energy_readings.id,
+        energy_readings.flow_file_id,
+        mpans.id,
+        mpan_site_visits.id,
+        meters.id,
+        meter_reading_site_visits.id,
+        registers.id,
+        register_reading_site_visits.id,
+        energy_readings.reading_at,
+        energy_readings.register_reading,
+        energy_readings.md_reset_at,
+        energy_readings.number_of_md_resets,
+        energy_readings.meter_reading_flag,
+        energy_readings.reading_method,
+        energy_readings.meter_reading_validation_result_reason,
+        energy_readings.meter_reading_validation_result_status
+    FROM meter_readings_energyreading AS energy_readings
+    INNER JOIN meter_readings_mpan AS mpans
+        ON mpans.mpan_core = energy_readings.mpan_core
+        AND mpans.bsc_validation_status = energy_readings.bsc_validation_status
+    INNER JOIN meter_readings_sitevisit AS mpan_site_visits
+        ON mpan_site_visits.visit_reason = energy_readings.mpan_site_visit_reason
+        AND mpan_site_visits.additional_information = energy_readings.mpan_site_visit_additional_information
+    INNER JOIN meter_readings_meter AS meters
+        ON meters.meter_id = energy_readings.meter_id AND meters.meter_reading_type = energy_readings.meter_reading_type
+    INNER JOIN meter_readings_sitevisit AS meter_reading_site_visits
+        ON meter_reading_site_visits.visit_reason = energy_readings.meter_reading_site_visit_reason
+        AND meter_reading_site_visits.additional_information
+            = energy_readings.meter_reading_site_visit_additional_information
+    INNER JOIN meter_readings_register AS registers
+        ON registers.meter_id = meters.id AND registers.meter_register_id = energy_readings.meter_register_id
+    INNER JOIN meter_readings_sitevisit AS register_reading_site_visits
+        ON register_reading_site_visits.visit_reason = energy_readings.register_reading_site_visit_reason
+        AND register_reading_site_visits.additional_information
+            = energy_readings.register_reading_site_visit_additional_information
+    """,
+)
+
+
+def backfill_readings(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Copy every energy reading into the normalised tables."""
+    for statement in BACKFILL_STATEMENTS:
+        schema_editor.execute(statement)
+    # Readings were inserted with their IDs, so their sequence (e.g. on PostgreSQL) must carry on after the largest
+    Reading = apps.get_model("meter_readings", "Reading")  # noqa: N806
+    for statement in schema_editor.connection.ops.sequence_reset_sql(no_style(), [Reading]):
+        schema_editor.execute(statement)
+
+
+def restore_energy_readings(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Copy every reading from the normalised tables back into the original energy reading table."""
+    columns = ", ".join(ENERGY_READING_COLUMNS)
+    schema_editor.execute(
+        f"INSERT INTO meter_readings_energyreading ({columns}) "  # noqa: S608
+        f"SELECT {columns} FROM ({ENERGY_READING_SELECT}) AS energy_readings",
+    )
+    EnergyReading = apps.get_model("meter_readings", "EnergyReading")  # noqa: N806
+    for statement in schema_editor.connection.ops.sequence_reset_sql(no_style(), [EnergyReading]):
+        schema_editor.execute(statement)
+
+
+def replace_table_with_view(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Drop the original energy reading table, replacing it with a view of the normalised tables."""
+    schema_editor.delete_model(apps.get_model("meter_readings", "EnergyReading"))
+    schema_editor.execute(f"CREATE VIEW meter_readings_energyreading AS {ENERGY_READING_SELECT}")
+
+
+def replace_view_with_table(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Drop the view of the normalised tables, recreating the original (empty) energy reading table."""
+    schema_editor.execute("DROP VIEW meter_readings_energyreading")
+    schema_editor.create_model(apps.get_model("meter_readings", "EnergyReading"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0005_import_run"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Meter",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("meter_id", models.CharField(max_length=10)),
+                ("meter_reading_type", models.CharField(max_length=1)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("meter_id", "meter_reading_type"), name="unique_meter"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="MPAN",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("mpan_core", models.CharField(max_length=13)),
+                ("bsc_validation_status", models.CharField(max_length=1)),
+            ],
+            options={
+                "verbose_name": "MPAN",
+                "constraints": [
+                    models.UniqueConstraint(fields=("mpan_core", "bsc_validation_status"), name="unique_mpan"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="Register",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("meter_register_id", models.CharField(max_length=2)),
+                (
+                    "meter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="registers",
+                        to="meter_readings.meter",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SiteVisit",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("visit_reason", models.CharField(max_length=2)),
+                ("additional_information", models.CharField(max_length=200)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("visit_reason", "additional_information"),
+                        name="unique_site_visit",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="Reading",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("reading_at", models.DateTimeField(null=True)),
+                ("register_reading", models.FloatField(null=True)),
+                ("md_reset_at", models.DateTimeField(null=True)),
+                ("number_of_md_resets", models.PositiveSmallIntegerField(null=True)),
+                ("meter_reading_flag", models.CharField(max_length=1)),
+                ("reading_method", models.CharField(max_length=1)),
+                ("meter_reading_validation_result_reason", models.CharField(max_length=2)),
+                ("meter_reading_validation_result_status", models.CharField(max_length=1)),
+                (
+                    "flow_file",
+                    models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="meter_readings.flowfile"),
+                ),
+                (
+                    "meter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="readings",
+                        to="meter_readings.meter",
+                    ),
+                ),
+                (
+                    "mpan",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="readings",
+                        to="meter_readings.mpan",
+                    ),
+                ),
+                (
+                    "register",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="readings",
+                        to="meter_readings.register",
+                    ),
+                ),
+                (
+                    "meter_reading_site_visit",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="meter_readings.sitevisit",
+                    ),
+                ),
+                (
+                    "mpan_site_visit",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="meter_readings.sitevisit",
+                    ),
+                ),
+                (
+                    "register_reading_site_visit",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="meter_readings.sitevisit",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="register",
+            constraint=models.UniqueConstraint(fields=("meter", "meter_register_id"), name="unique_register"),
+        ),
+        migrations.RunPython(backfill_readings, restore_energy_readings),
+        # Energy readings are now a view, which Django must not create, alter or delete
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterModelOptions(
+                    name="energyreading",
+                    options={"managed": False},
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(replace_table_with_view, replace_view_with_table),
+            ],
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from meter_readings.utils.migrations import AddIndexConcurrently, RemoveForeignKeyIndex
+
+
+def remove_foreign_key_index(
+    model_name: str,
+    name: str,
+    field: models.ForeignKey,
+) -> migrations.SeparateDatabaseAndState:
+    """Return an operation removing the index of a foreign key, without remaking its table."""
+    return migrations.SeparateDatabaseAndState(
+        state_operations=[migrations.AlterField(model_name=model_name, name=name, field=field)],
+        database_operations=[RemoveForeignKeyIndex(model_name=model_name, name=name)],
+    )
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently on PostgreSQL, which cannot be done in a transaction
+    atomic = False
+
+    dependencies = [
+        ("meter_readings", "0006_normalised_readings"),
+    ]
+
+    # Composite indexes are built before the foreign key indexes they replace are dropped
+    operations = [
+        AddIndexConcurrently(
+            model_name="reading",
+            index=models.Index(fields=["mpan", "reading_at"], name="reading_mpan_reading_at"),
+        ),
+        AddIndexConcurrently(
+            model_name="reading",
+            index=models.Index(fields=["meter", "reading_at"], name="reading_meter_reading_at"),
+        ),
+        AddIndexConcurrently(
+            model_name="reading",
+            index=models.Index(fields=["flow_file", "id"], name="reading_flow_file_id"),
+        ),
+        remove_foreign_key_index(
+            "reading",
+            "flow_file",
+            models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="meter_readings.flowfile",
+            ),
+        ),
+        remove_foreign_key_index(
+            "reading",
+            "meter",
+            models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="readings",
+                to="meter_readings.meter",
+            ),
+        ),
+        remove_foreign_key_index(
+            "reading",
+            "mpan",
+            models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="readings",
+                to="meter_readings.mpan",
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:10
+
+from django.apps.registry import Apps
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+# The searchable document of every reading: its flow file name, MPAN core, meter ID, register reading and reading date
+READING_DOCUMENT_SELECT = """
+SELECT
+    reading.id,
+    flow_file.name || ' ' || mpan.mpan_core || ' ' || meter.meter_id || ' '
+    || COALESCE(CAST(reading.register_reading AS TEXT), '') || ' '
+    || COALESCE(CAST(reading.reading_at AS TEXT), '')
+FROM meter_readings_reading AS reading
+JOIN meter_readings_flowfile AS flow_file ON flow_file.id = reading.flow_file_id
+JOIN meter_readings_mpan AS mpan ON mpan.id = reading.mpan_id
+JOIN meter_readings_meter AS meter ON meter.id = reading.meter_id
+"""
+
+# An FTS5 table keyed by the rowid of each reading, from which readings are deleted by a trigger
+SQLITE_STATEMENTS = (
+    "CREATE VIRTUAL TABLE meter_readings_readingsearch USING fts5(document, tokenize = 'trigram')",
+    f"INSERT INTO meter_readings_readingsearch (rowid, document) {READING_DOCUMENT_SELECT}",
+    """
+    CREATE TRIGGER meter_readings_readingsearch_delete AFTER DELETE ON meter_readings_reading
+    BEGIN
+        DELETE FROM meter_readings_readingsearch WHERE rowid = old.id;
+    END
+    """,
+)
+SQLITE_REVERSE_STATEMENTS = (
+    "DROP TRIGGER meter_readings_readingsearch_delete",
+    "DROP TABLE meter_readings_readingsearch",
+)
+
+# A table with a trigram GIN index, from which readings are deleted by the cascade of its foreign key. The index is
+# built once the table has been filled, which is faster than updating it for every row
+POSTGRESQL_STATEMENTS = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE TABLE meter_readings_readingsearch (
+        reading_id bigint NOT NULL PRIMARY KEY REFERENCES meter_readings_reading (id) ON DELETE CASCADE,
+        document text NOT NULL
+    )
+    """,
+    f"INSERT INTO meter_readings_readingsearch (reading_id, document) {READING_DOCUMENT_SELECT}",
+    "CREATE INDEX readingsearch_document_trgm ON meter_readings_readingsearch USING gin (document gin_trgm_ops)",
+)
+POSTGRESQL_REVERSE_STATEMENTS = ("DROP TABLE meter_readings_readingsearch",)
+
+
+def run_vendor_statements(schema_editor: BaseDatabaseSchemaEditor, statements_by_vendor: dict) -> None:
+    """Run the statements for the database vendor, if it has any (other databases have no search table)."""
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def create_reading_search(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:  # noqa: ARG001
+    """Create the search table, with the document of every existing reading."""
+    run_vendor_statements(schema_editor, {"sqlite": SQLITE_STATEMENTS, "postgresql": POSTGRESQL_STATEMENTS})
+
+
+def drop_reading_search(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:  # noqa: ARG001
+    """Drop the search table."""
+    run_vendor_statements(
+        schema_editor,
+        {"sqlite": SQLITE_REVERSE_STATEMENTS, "postgresql": POSTGRESQL_REVERSE_STATEMENTS},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0007_reading_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_reading_search, drop_reading_search),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:37
+
+from django.db import migrations, models
+
+from meter_readings.utils.migrations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built concurrently on PostgreSQL, which cannot be done in a transaction
+    atomic = False
+
+    dependencies = [
+        ("meter_readings", "0008_reading_search"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="reading",
+            index=models.Index(fields=["reading_at"], name="reading_reading_at"),
+        ),
+        AddIndexConcurrently(
+            model_name="reading",
+            index=models.Index(fields=["register_reading"], name="reading_register_reading"),
+        ),
+    ]
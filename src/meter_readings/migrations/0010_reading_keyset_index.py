@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:40
+
+from django.db import migrations, models
+
+from meter_readings.utils.migrations import AddIndexConcurrently, RemoveIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # Indexes are built and dropped concurrently on PostgreSQL, which cannot be done in a transaction
+    atomic = False
+
+    dependencies = [
+        ("meter_readings", "0009_reading_search_indexes"),
+    ]
+
+    # The reading date index is replaced once the index which also covers it has been built
+    operations = [
+        AddIndexConcurrently(
+            model_name="reading",
+            index=models.Index(fields=["reading_at", "id"], name="reading_reading_at_id"),
+        ),
+        RemoveIndexConcurrently(
+            model_name="reading",
+            name="reading_reading_at",
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:44
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def count_existing_dates(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:  # noqa: ARG001
+    """Fill the date buckets with the readings and flow files imported before they were kept."""
+    DateBucket = apps.get_model("meter_readings", "DateBucket")  # noqa: N806
+    series_querysets = {
+        "reading_at": apps.get_model("meter_readings", "Reading").objects.filter(reading_at__isnull=False),
+        "file_created_at": apps.get_model("meter_readings", "FlowFileMetadata").objects.filter(
+            file_created_at__isnull=False,
+        ),
+    }
+    for series, queryset in series_querysets.items():
+        counts = (
+            queryset.annotate(day=TruncDate(series))
+            .values("day")
+            .annotate(count=Count("id"))
+            .values_list("day", "count")
+        )
+        DateBucket.objects.bulk_create(
+            (DateBucket(series=series, date=day, count=count) for day, count in counts.iterator()),
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0010_reading_keyset_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DateBucket",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "series",
+                    models.CharField(
+                        choices=[("reading_at", "Reading date"), ("file_created_at", "Flow file creation date")],
+                        max_length=15,
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("count", models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("series", "date"), name="unique_date_bucket")],
+            },
+        ),
+        migrations.RunPython(count_existing_dates, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0011_date_buckets"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="flowfile",
+            name="imported_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:06
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def mark_forced_flow_files(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Mark every previously imported flow file but the first with the same content as forced."""
+    FlowFile = apps.get_model("meter_readings", "FlowFile")  # noqa: N806
+    first_ids = (
+        FlowFile.objects.exclude(content_hash="")
+        .values("content_hash")
+        .annotate(first_id=models.Min("id"))
+        .values("first_id")
+    )
+    FlowFile.objects.exclude(content_hash="").exclude(id__in=first_ids).update(forced=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0013_import_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flowfile",
+            name="forced",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_forced_flow_files, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="flowfile",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(models.Q(("content_hash", ""), _negated=True), ("forced", False)),
+                fields=("content_hash",),
+                name="unique_flow_file_content",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:10
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def copy_import_dates(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Date the completion of previously imported flow files, all committed, from when their import started."""
+    FlowFile = apps.get_model("meter_readings", "FlowFile")  # noqa: N806
+    FlowFile.objects.update(completed_at=models.F("imported_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0014_flow_file_unique_content"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flowfile",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(copy_import_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="flowfile",
+            name="imported_at",
+            field=models.DateTimeField(auto_now_add=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:14
+
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+
+
+def copy_start_dates(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """Date the last heartbeat of previously started jobs from when their latest attempt started."""
+    ImportJob = apps.get_model("meter_readings", "ImportJob")  # noqa: N806
+    ImportJob.objects.update(heartbeat_at=models.F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0015_flow_file_completed_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_start_dates, migrations.RunPython.noop),
+    ]
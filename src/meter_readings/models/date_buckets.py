@@ -0,0 +1,30 @@
+"""Date bucket database model."""
+
+from django.db import models
+
+
+class DateBucket(models.Model):
+    """The number of readings (or flow files) dated on a day, kept up to date by the importer.
+
+    Counts per month and year are summed from the days, so the admin's date navigation reads a few hundred rows per
+    year rather than finding the distinct dates of every reading.
+    """
+
+    class Series(models.TextChoices):
+        """Dates counted."""
+
+        READING_AT = "reading_at", "Reading date"
+        FILE_CREATED_AT = "file_created_at", "Flow file creation date"
+
+    series = models.CharField(max_length=15, choices=Series.choices)
+    date = models.DateField()
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        """Model options."""
+
+        constraints = (models.UniqueConstraint(fields=("series", "date"), name="unique_date_bucket"),)
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"{self.get_series_display()} {self.date}: {self.count}"
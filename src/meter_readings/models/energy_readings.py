@@ -3,12 +3,71 @@
 from django.db import models
 
 from meter_readings.models.flow_files import FlowFile
+from meter_readings.models.meters import Meter, Register
+from meter_readings.models.mpans import MPAN
+from meter_readings.models.site_visits import SiteVisit
+
+
+class Reading(models.Model):
+    """A register reading (030, 032 and 033 rows), referring to its MPAN, meter, register and site visits.
+
+    Details shared by many readings are stored once, in their own tables, rather than repeated on every reading.
+    """
+
+    # The flow file, MPAN and meter keys lead composite indexes (see Meta), so need no index of their own
+    flow_file = models.ForeignKey(FlowFile, on_delete=models.CASCADE, db_index=False)
+    mpan = models.ForeignKey(MPAN, on_delete=models.PROTECT, related_name="readings", db_index=False)
+    # Readings are never looked up by site visit, and most share the empty one, so site visit keys are not indexed
+    mpan_site_visit = models.ForeignKey(SiteVisit, on_delete=models.PROTECT, related_name="+", db_index=False)
+    meter = models.ForeignKey(Meter, on_delete=models.PROTECT, related_name="readings", db_index=False)
+    meter_reading_site_visit = models.ForeignKey(SiteVisit, on_delete=models.PROTECT, related_name="+", db_index=False)
+    register = models.ForeignKey(Register, on_delete=models.PROTECT, related_name="readings")
+    register_reading_site_visit = models.ForeignKey(
+        SiteVisit,
+        on_delete=models.PROTECT,
+        related_name="+",
+        db_index=False,
+    )
+    reading_at = models.DateTimeField(null=True)
+    register_reading = models.FloatField(null=True)
+    md_reset_at = models.DateTimeField(null=True)
+    number_of_md_resets = models.PositiveSmallIntegerField(null=True)
+    meter_reading_flag = models.CharField(max_length=1)
+    reading_method = models.CharField(max_length=1)
+    meter_reading_validation_result_reason = models.CharField(max_length=2)
+    meter_reading_validation_result_status = models.CharField(max_length=1)
+
+    class Meta:
+        """Model options."""
+
+        indexes = (
+            # Readings of an MPAN or a meter, between two dates
+            models.Index(fields=("mpan", "reading_at"), name="reading_mpan_reading_at"),
+            models.Index(fields=("meter", "reading_at"), name="reading_meter_reading_at"),
+            # Readings of a flow file, in the order they were imported
+            models.Index(fields=("flow_file", "id"), name="reading_flow_file_id"),
+            # Readings between two dates, searched for in the admin, and pages of readings in date order (see
+            # KeysetPaginator), which seek past the date and ID of the last reading of the previous page
+            models.Index(fields=("reading_at", "id"), name="reading_reading_at_id"),
+            # Readings of a register reading, searched for in the admin
+            models.Index(fields=("register_reading",), name="reading_register_reading"),
+        )
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"Reading {self.pk}"
 
 
 class EnergyReading(models.Model):
-    """Energy reading model."""
+    """Energy reading model.
+
+    A read only view joining every reading to its MPAN, meter, register and site visits, with the columns of the
+    original (denormalised) energy reading table, so that existing queries (e.g. in the admin) keep working.
+    Readings are written to `Reading`.
+    """
 
-    flow_file = models.ForeignKey(FlowFile, on_delete=models.CASCADE)
+    # The view cannot be deleted from: readings are deleted with their flow file by the cascade of `Reading`
+    flow_file = models.ForeignKey(FlowFile, on_delete=models.DO_NOTHING)
     mpan_core = models.CharField(max_length=13)
     bsc_validation_status = models.CharField(max_length=1)
     mpan_site_visit_reason = models.CharField(max_length=2)
@@ -29,6 +88,12 @@ class EnergyReading(models.Model):
     register_reading_site_visit_reason = models.CharField(max_length=2)
     register_reading_site_visit_additional_information = models.CharField(max_length=200)
 
+    class Meta:
+        """Model options."""
+
+        # The view is created (and the original table replaced by it) by migration 0006
+        managed = False
+
     def __str__(self) -> str:
         """Return string representation of model."""
         return f"{self.mpan_core}"
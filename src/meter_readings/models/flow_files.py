@@ -8,7 +8,31 @@ class FlowFile(models.Model):
 
     name = models.CharField(max_length=255)
     extension = models.CharField(max_length=10)
+    # When the import started (the flow file is created before its readings are written)
     imported_at = models.DateTimeField(auto_now_add=True)
+    # When the import was completed, in the transaction committing it (null until then). The latest completed import
+    # dates the readings served by the API (see views), so is looked up on every request
+    completed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    # Name of the compressed file or zip archive the flow file was imported from, if any
+    archive_name = models.CharField(max_length=255, blank=True)
+    # SHA-256 hex digest of the file content, used to skip files which have already been imported
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    # Whether the file was imported even though a file with identical content had been (so its content is not unique)
+    forced = models.BooleanField(default=False)
+    # File identifier from the ZHV header
+    file_identifier = models.CharField(max_length=10, blank=True, db_index=True)
+
+    class Meta:
+        """Model options."""
+
+        # Concurrent imports of identical content (e.g. by several workers) cannot both be written
+        constraints = (
+            models.UniqueConstraint(
+                fields=("content_hash",),
+                condition=~models.Q(content_hash="") & models.Q(forced=False),
+                name="unique_flow_file_content",
+            ),
+        )
 
     def __str__(self) -> str:
         """Return string representation of model."""
@@ -0,0 +1,65 @@
+"""Import job database model."""
+
+from django.db import models
+from django.utils import timezone
+
+
+class ImportJob(models.Model):
+    """A flow file (plain, compressed or a zip archive of them) queued to be imported by the import workers.
+
+    Jobs are claimed by one worker at a time (see `run_import_workers`), which sends heartbeats while running them. A
+    job failing with a transient database error, or whose worker stops sending heartbeats, is queued again, to be
+    retried once `available_at` has passed, until it has been attempted too many times.
+    """
+
+    class Status(models.TextChoices):
+        """Progress of an import job."""
+
+        QUEUED = "queued"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    # Path of the file, readable by every worker
+    path = models.CharField(max_length=1024)
+    # Whether to import the file even if a file with identical content has already been imported
+    force = models.BooleanField(default=False)
+    status = models.CharField(max_length=7, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    queued_at = models.DateTimeField(auto_now_add=True)
+    # Time from which the job can be claimed, pushed back after each transient failure
+    available_at = models.DateTimeField(default=timezone.now)
+    # Time the latest attempt started and the job finished
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Time the worker running the job last renewed its lease. The job is stale once the worker has not for too long
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    # Host and process ID of the worker which claimed the job last
+    worker = models.CharField(max_length=255, blank=True)
+    reading_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        """Model options."""
+
+        indexes = (
+            # Jobs ready to be claimed, in the order they became available, and running jobs (checked for heartbeats)
+            models.Index(fields=("status", "available_at"), name="import_job_status_available"),
+        )
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"Import job {self.pk} of {self.path}"
+
+    @property
+    def wait_seconds(self) -> float | None:
+        """Return the number of seconds from queueing the job to starting its latest attempt, once started."""
+        return (self.started_at - self.queued_at).total_seconds() if self.started_at else None
+
+    @property
+    def run_seconds(self) -> float | None:
+        """Return the number of seconds the latest attempt took, once the job has finished."""
+        if self.started_at and self.finished_at:
+            return (self.finished_at - self.started_at).total_seconds()
+        return None
@@ -0,0 +1,54 @@
+"""Import run journal database models."""
+
+from django.db import models
+
+
+class ImportRun(models.Model):
+    """A run of the import D0010 files command, over a file or directory of files.
+
+    An interrupted run can be resumed: files it has already imported (or skipped) are not imported again.
+    """
+
+    # Absolute path of the imported file or directory
+    path = models.CharField(max_length=1024)
+    started_at = models.DateTimeField(auto_now_add=True)
+    # Time the run (or the last resumption of it) imported its last file, if it has
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"Import run {self.pk} of {self.path}"
+
+
+class ImportRunFile(models.Model):
+    """Outcome of importing a single flow file within an import run."""
+
+    class Status(models.TextChoices):
+        """Outcome of importing a flow file."""
+
+        IMPORTED = "imported"
+        SKIPPED = "skipped"
+        FAILED = "failed"
+
+    run = models.ForeignKey(ImportRun, on_delete=models.CASCADE, related_name="files")
+    # Path of the file relative to the directory of the run (or its name, if the run imported a single file)
+    relative_path = models.CharField(max_length=1024)
+    # Name of the flow file within the zip archive at relative_path, if any
+    member = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=8, choices=Status.choices)
+    reading_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    first_error = models.TextField(blank=True)
+    elapsed_seconds = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Model options."""
+
+        constraints = (
+            models.UniqueConstraint(fields=("run", "relative_path", "member"), name="unique_import_run_file"),
+        )
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"{self.relative_path}/{self.member}" if self.member else self.relative_path
@@ -0,0 +1,43 @@
+"""Meter and register database models."""
+
+from django.db import models
+
+
+class Meter(models.Model):
+    """A meter and its reading type, shared by every reading of it in a flow file (028 row).
+
+    The empty meter (every field blank) stands for readings without a meter.
+    """
+
+    # 32 bit keys keep the foreign keys of the readings narrow
+    id = models.AutoField(primary_key=True)
+    # Meter serial number
+    meter_id = models.CharField(max_length=10)
+    meter_reading_type = models.CharField(max_length=1)
+
+    class Meta:
+        """Model options."""
+
+        constraints = (models.UniqueConstraint(fields=("meter_id", "meter_reading_type"), name="unique_meter"),)
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"{self.meter_id}"
+
+
+class Register(models.Model):
+    """A register of a meter (from 030 rows), e.g. the day or night register of an economy 7 meter."""
+
+    # 32 bit keys keep the foreign keys of the readings narrow
+    id = models.AutoField(primary_key=True)
+    meter = models.ForeignKey(Meter, on_delete=models.CASCADE, related_name="registers")
+    meter_register_id = models.CharField(max_length=2)
+
+    class Meta:
+        """Model options."""
+
+        constraints = (models.UniqueConstraint(fields=("meter", "meter_register_id"), name="unique_register"),)
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"{self.meter_register_id}"
@@ -0,0 +1,26 @@
+"""MPAN database model."""
+
+from django.db import models
+
+
+class MPAN(models.Model):
+    """An MPAN core and its BSC validation status, shared by every reading of it in a flow file (026 row).
+
+    The same MPAN core may be validated differently in different flow files, so each status has its own row.
+    The empty MPAN (every field blank) stands for readings without an MPAN core.
+    """
+
+    # 32 bit keys keep the foreign keys of the readings narrow
+    id = models.AutoField(primary_key=True)
+    mpan_core = models.CharField(max_length=13)
+    bsc_validation_status = models.CharField(max_length=1)
+
+    class Meta:
+        """Model options."""
+
+        verbose_name = "MPAN"
+        constraints = (models.UniqueConstraint(fields=("mpan_core", "bsc_validation_status"), name="unique_mpan"),)
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"{self.mpan_core}"
@@ -0,0 +1,26 @@
+"""Site visit database model."""
+
+from django.db import models
+
+
+class SiteVisit(models.Model):
+    """A site visit check code and its free text (027, 029 and 033 rows), shared by every reading it applies to.
+
+    The empty site visit (every field blank) stands for readings without a site visit.
+    """
+
+    # 32 bit keys keep the foreign keys of the readings narrow
+    id = models.AutoField(primary_key=True)
+    visit_reason = models.CharField(max_length=2)
+    additional_information = models.CharField(max_length=200)
+
+    class Meta:
+        """Model options."""
+
+        constraints = (
+            models.UniqueConstraint(fields=("visit_reason", "additional_information"), name="unique_site_visit"),
+        )
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"{self.visit_reason}"
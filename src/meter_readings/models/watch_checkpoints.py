@@ -0,0 +1,22 @@
+"""Watch checkpoint database model."""
+
+from django.db import models
+
+
+class WatchCheckpoint(models.Model):
+    """Progress of watching an inbound directory for new flow files.
+
+    Files changed at or before `last_change_ns` have already been handled, so they are not looked at again after a
+    restart, even if they could not be moved out of the inbound directory.
+    """
+
+    directory = models.CharField(max_length=1024, unique=True)
+    # File change time (st_ctime_ns) of the most recently handled file
+    last_change_ns = models.BigIntegerField(default=0)
+    imported_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        """Return string representation of model."""
+        return f"{self.directory}"
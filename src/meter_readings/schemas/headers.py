@@ -9,6 +9,9 @@ from pydantic import BaseModel, Field, field_validator
 from meter_readings.utils.datetimes import parse_datetime
 from meter_readings.utils.strings import validate_string_to_datetime
 
+# Data flow reference (e.g. D0010) followed by a 3 digit version number
+DATA_FLOW_AND_VERSION_NUMBER_PATTERN = re.compile(r"^D\w{4}\d{3}$")
+
 
 class ZHVHeader(BaseModel):
     """ZHV/ZHF header details.
@@ -37,9 +40,7 @@ class ZHVHeader(BaseModel):
     def validate_data_flow_and_version_number(cls, value: str) -> str:
         """Validate the data flow and the version number."""
         # Validate data flow reference and version number
-        data_flow_pattern = r"^D\w{4}\d{3}$"
-
-        if not re.match(data_flow_pattern, value):
+        if not DATA_FLOW_AND_VERSION_NUMBER_PATTERN.match(value):
             msg = f"Invalid data flow format: {value}"
             raise ValueError(msg)
 
@@ -0,0 +1,21 @@
+"""Schemas for profiling the import of flow files."""
+
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class ProfileOptions(BaseModel):
+    """How to profile the import of flow files.
+
+    Key attributes:
+        profiler -- "cprofile" to record the time spent in each function, or "tracemalloc" to record the memory
+            allocated by each line.
+        directory -- directory the report of each profiled file is written to.
+        sample_rate -- proportion of files profiled, chosen at random (1.0 to profile every file).
+    """
+
+    profiler: Literal["cprofile", "tracemalloc"] = "cprofile"
+    directory: Path
+    sample_rate: float = Field(default=1.0, ge=0.0, le=1.0)
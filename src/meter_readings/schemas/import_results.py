@@ -0,0 +1,46 @@
+"""Schemas for the results of importing flow files."""
+
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from meter_readings.schemas.import_stats import ImportStats
+
+
+class ImportResult(BaseModel):
+    """Outcome of importing a single flow file.
+
+    Key attributes:
+        file_path -- path of the imported flow file, or of the zip archive holding it.
+        member -- name of the imported flow file within the zip archive at file_path, if any.
+        reading_count -- number of energy readings written to the database.
+        errors -- description of every error found in the file. Nothing is written if there are any.
+        elapsed_seconds -- wall clock time taken to parse and write the file.
+        skipped -- whether the file was skipped, as a file with identical content has already been imported.
+        stats -- time spent in each stage of the import and counts of what was imported, if they were collected.
+        profile_path -- path of the report of profiling the import, if it was profiled.
+    """
+
+    file_path: Path
+    member: str = ""
+    reading_count: int = 0
+    errors: list[str] = Field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    skipped: bool = False
+    stats: ImportStats | None = None
+    profile_path: Path | None = None
+
+    @property
+    def display_path(self) -> Path:
+        """Return the path of the imported flow file, including the zip archive holding it."""
+        return self.file_path / self.member if self.member else self.file_path
+
+    @property
+    def success(self) -> bool:
+        """Return True if the file was imported without errors."""
+        return not self.errors
+
+    @property
+    def rows_per_second(self) -> float:
+        """Return the number of energy readings written per second."""
+        return self.reading_count / self.elapsed_seconds if self.elapsed_seconds else 0.0
@@ -0,0 +1,53 @@
+"""Schemas for the statistics of importing flow files."""
+
+from pydantic import BaseModel, Field
+
+# Stages of importing a flow file, in the order they are run
+IMPORT_STAGES = ("hash", "read", "tokenize", "validate", "persist")
+
+
+class ImportStats(BaseModel):
+    """Time spent in each stage of importing a flow file, and counts of what was imported.
+
+    Key attributes:
+        stage_seconds -- seconds spent in each stage (see IMPORT_STAGES): hashing the file, reading (and
+            decompressing) it, splitting it into rows, validating the rows and writing readings to the database.
+        validate_seconds -- seconds spent validating the rows of each record code.
+        row_counts -- number of rows of each record code ("" for blank lines).
+        reading_count -- number of energy readings written to the database.
+        error_count -- number of invalid rows.
+        query_count -- number of database queries run while writing the file.
+    """
+
+    stage_seconds: dict[str, float] = Field(default_factory=lambda: dict.fromkeys(IMPORT_STAGES, 0.0))
+    validate_seconds: dict[str, float] = Field(default_factory=dict)
+    row_counts: dict[str, int] = Field(default_factory=dict)
+    reading_count: int = 0
+    error_count: int = 0
+    query_count: int = 0
+
+    @property
+    def group_count(self) -> int:
+        """Return the number of MPAN core groups (026 rows)."""
+        return self.row_counts.get("026", 0)
+
+    @property
+    def parse_seconds(self) -> float:
+        """Return the time spent reading, tokenizing and validating the file."""
+        return self.stage_seconds["read"] + self.stage_seconds["tokenize"] + self.stage_seconds["validate"]
+
+    def add_seconds(self, stage: str, seconds: float) -> None:
+        """Add time spent in a stage."""
+        self.stage_seconds[stage] += seconds
+
+    def merge(self, other: "ImportStats") -> None:
+        """Add the statistics of importing another flow file to these."""
+        for stage, seconds in other.stage_seconds.items():
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+        for code, seconds in other.validate_seconds.items():
+            self.validate_seconds[code] = self.validate_seconds.get(code, 0.0) + seconds
+        for code, count in other.row_counts.items():
+            self.row_counts[code] = self.row_counts.get(code, 0) + count
+        self.reading_count += other.reading_count
+        self.error_count += other.error_count
+        self.query_count += other.query_count
@@ -0,0 +1,45 @@
+"""Schemas for the query parameters of the readings API."""
+
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+# Number of readings in each page, unless the client asks for fewer (or more, up to the maximum)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class ReadingQuery(BaseModel):
+    """Which readings of an MPAN or meter to list.
+
+    Key attributes:
+        from_date -- first reading date (YYYY-MM-DD) listed, given as the `from` parameter.
+        to_date -- last reading date (YYYY-MM-DD) listed, given as the `to` parameter.
+        after -- ID of the last reading of the previous page (see the `next` link of each page).
+        limit -- number of readings in each page.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    from_date: date | None = Field(default=None, alias="from")
+    to_date: date | None = Field(default=None, alias="to")
+    after: int | None = None
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+
+    @model_validator(mode="after")
+    def validate_date_range(self) -> "ReadingQuery":
+        """Validate the date range is not reversed."""
+        if self.from_date and self.to_date and self.from_date > self.to_date:
+            msg = f"The from date ({self.from_date}) is after the to date ({self.to_date})."
+            raise ValueError(msg)
+        return self
+
+    def get_reading_at_lookups(self) -> dict[str, datetime]:
+        """Return the lookups of readings dated within the date range, from the start of `from` to the end of `to`."""
+        lookups = {}
+        if self.from_date:
+            lookups["reading_at__gte"] = timezone.make_aware(datetime.combine(self.from_date, time()))
+        if self.to_date:
+            lookups["reading_at__lt"] = timezone.make_aware(datetime.combine(self.to_date + timedelta(days=1), time()))
+        return lookups
@@ -66,13 +66,13 @@ class SiteVisit(BaseModel):
     """Site visit schema for J0024.
 
     Key attributes:
-        code -- 027 encoding for site visits.
+        code -- encoding for site visits: 027 for an MPAN core, 029 for a meter and 033 for a register reading.
         visit_reason -- code identifying either nature of checks made/to be made on metering equipment
                         during a site visit or identifying reason for failure to obtain readings (J0024).
         additional_information -- free format character string for providing additional details (J0012).
     """
 
-    code: Literal["027"]
+    code: Literal["027", "029", "033"]
     visit_reason: str = Field(max_length=2)
     additional_information: str = Field(max_length=200)
 
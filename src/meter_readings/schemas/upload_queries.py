@@ -0,0 +1,17 @@
+"""Schemas for the query parameters of the flow file upload API."""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class FlowFileUploadQuery(BaseModel):
+    """How to import the flow files of an upload.
+
+    Key attributes:
+        name -- file name of a flow file uploaded as the whole request body (e.g. "file.uff" or "file.uff.gz").
+        force -- whether to import files even if a file with identical content has already been imported.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str | None = None
+    force: bool = False
@@ -0,0 +1 @@
+"""Search energy readings."""
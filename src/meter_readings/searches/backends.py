@@ -0,0 +1,153 @@
+"""Search energy readings with a full text index of the database, rather than LIKE scans of every reading.
+
+The searchable text of each reading (its flow file name, MPAN core, meter ID, register reading and reading date) is
+written to a search table as a single document when its flow file is imported. The table is created by migration
+`0008_reading_search`: an FTS5 table with the trigram tokenizer on SQLite, and a table with a trigram GIN index (from
+the pg_trgm extension) on PostgreSQL. Both find documents containing a word anywhere within them, as the admin's
+`icontains` lookups do, by looking up the word's trigrams in the index.
+"""
+
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from django.utils.text import smart_split, unescape_string_literal
+
+from meter_readings.models.energy_readings import Reading
+from meter_readings.models.flow_files import FlowFile
+from meter_readings.models.meters import Meter
+from meter_readings.models.mpans import MPAN
+
+# Table holding the searchable document of each reading
+READING_SEARCH_TABLE = "meter_readings_readingsearch"
+
+# Words shorter than a trigram cannot be looked up in a trigram index
+MIN_WORD_LENGTH = 3
+
+
+def build_document_select(where: str = "") -> str:
+    """Return SQL selecting the ID and searchable document of each reading, filtered by an optional WHERE clause."""
+    reading = Reading._meta.db_table
+    return (
+        f"SELECT reading.id, flow_file.name || ' ' || mpan.mpan_core || ' ' || meter.meter_id || ' ' "  # noqa: S608
+        f"|| COALESCE(CAST(reading.register_reading AS TEXT), '') || ' ' "
+        f"|| COALESCE(CAST(reading.reading_at AS TEXT), '') "
+        f"FROM {reading} AS reading "
+        f"JOIN {FlowFile._meta.db_table} AS flow_file ON flow_file.id = reading.flow_file_id "
+        f"JOIN {MPAN._meta.db_table} AS mpan ON mpan.id = reading.mpan_id "
+        f"JOIN {Meter._meta.db_table} AS meter ON meter.id = reading.meter_id "
+        f"{where}"
+    )
+
+
+def get_search_words(search_term: str) -> list[str]:
+    """Split a search term into words as the admin does, keeping quoted phrases (e.g. "F75A 00802") together."""
+    words = []
+    for word in smart_split(search_term):
+        if word.startswith(('"', "'")) and word[0] == word[-1]:
+            word = unescape_string_literal(word)  # noqa: PLW2901
+        if word:
+            words.append(word)
+    return words
+
+
+class ReadingSearchBackend:
+    """Search readings with the admin's default lookups (see `search`), without a search table.
+
+    Used for any database without a search backend below.
+    """
+
+    def __init__(self, connection: BaseDatabaseWrapper) -> None:
+        """Prepare to search readings over the given database connection."""
+        self.connection = connection
+
+    def index_flow_file(self, flow_file: FlowFile) -> None:
+        """Add the readings of a newly imported flow file to the search table."""
+
+    def search(self, queryset: QuerySet, search_term: str) -> QuerySet | None:
+        """Return the readings of a queryset matching every word of a search term.
+
+        Return None if the term cannot be searched with the search table, in which case the admin's default search
+        (an OR of `icontains` lookups per word) is used.
+        """
+        return None
+
+
+class IndexedReadingSearchBackend(ReadingSearchBackend, ABC):
+    """Search readings with a search table, keyed by the ID of each reading.
+
+    Subclasses build the SQL searching the table (see `build_search_sql`).
+    """
+
+    # Column of the search table holding the ID of each reading
+    key_column = "reading_id"
+
+    def index_flow_file(self, flow_file: FlowFile) -> None:
+        """Add the readings of a newly imported flow file to the search table, with a single statement."""
+        sql = (
+            f"INSERT INTO {READING_SEARCH_TABLE} ({self.key_column}, document) "
+            f"{build_document_select(where='WHERE reading.flow_file_id = %s')}"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [flow_file.pk])
+
+    def search(self, queryset: QuerySet, search_term: str) -> QuerySet | None:
+        """Return the readings of a queryset whose document contains every word of a search term.
+
+        Return None if the term has no word, or a word too short to look up in the index.
+        """
+        words = get_search_words(search_term)
+        if not words or any(len(word) < MIN_WORD_LENGTH for word in words):
+            return None
+        sql, params = self.build_search_sql(words)
+        return queryset.filter(pk__in=RawSQL(sql, params))
+
+    @abstractmethod
+    def build_search_sql(self, words: list[str]) -> tuple[str, list[str]]:
+        """Return SQL (and its parameters) selecting the IDs of readings whose document contains every word."""
+
+
+class SQLiteReadingSearchBackend(IndexedReadingSearchBackend):
+    """Search readings with an FTS5 table, using the trigram tokenizer (SQLite 3.34+)."""
+
+    # FTS5 tables are keyed by their rowid
+    key_column = "rowid"
+
+    def build_search_sql(self, words: list[str]) -> tuple[str, list[str]]:
+        """Return SQL (and its parameters) matching every word as a phrase, found anywhere in the document."""
+        query = " AND ".join('"{}"'.format(word.replace('"', '""')) for word in words)
+        return f"SELECT rowid FROM {READING_SEARCH_TABLE} WHERE {READING_SEARCH_TABLE} MATCH %s", [query]  # noqa: S608
+
+
+class PostgreSQLReadingSearchBackend(IndexedReadingSearchBackend):
+    """Search readings with a trigram GIN index of their documents (pg_trgm)."""
+
+    def build_search_sql(self, words: list[str]) -> tuple[str, list[str]]:
+        """Return SQL (and its parameters) filtering documents with an ILIKE per word, which the index speeds up."""
+        conditions = " AND ".join(["document ILIKE %s"] * len(words))
+        patterns = ["%{}%".format(word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")) for word in words]
+        return f"SELECT reading_id FROM {READING_SEARCH_TABLE} WHERE {conditions}", patterns  # noqa: S608
+
+
+# Search backends used for each database vendor, with no search table used for any other vendor
+SEARCH_BACKENDS_BY_VENDOR: dict[str, type[ReadingSearchBackend]] = {
+    "postgresql": PostgreSQLReadingSearchBackend,
+    "sqlite": SQLiteReadingSearchBackend,
+}
+
+
+def get_reading_search_backend(using: str = DEFAULT_DB_ALIAS) -> ReadingSearchBackend:
+    """Return the search backend for a database, chosen from its engine in settings.DATABASES.
+
+    The `D0010_SEARCH_BACKEND` setting (the dotted path of a search backend class) overrides the automatic choice.
+    """
+    connection = connections[using]
+    if settings.D0010_SEARCH_BACKEND:
+        backend_class = import_string(settings.D0010_SEARCH_BACKEND)
+    else:
+        backend_class = SEARCH_BACKENDS_BY_VENDOR.get(connection.vendor, ReadingSearchBackend)
+    return backend_class(connection)
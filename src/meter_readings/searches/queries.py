@@ -0,0 +1,70 @@
+"""Classify admin search terms for energy readings, so that common searches are exact or range lookups of an index.
+
+A term which is unmistakably an MPAN core, a meter ID, a reading date (or range of dates) or a register reading is
+looked up in the indexed column it belongs to, rather than searched for in the text of every reading. Any other term
+(e.g. part of a flow file name, or digits which could be a meter ID or a reading) is ambiguous, and left to the text
+search.
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Any, Literal, NamedTuple
+
+from django.utils.text import unescape_string_literal
+
+from meter_readings.utils.datetimes import parse_timestamp
+
+# An MPAN core is 13 digits
+MPAN_CORE_PATTERN = re.compile(r"\d{13}")
+
+# A meter ID (serial number) of 8 to 10 letters and digits, with both and at most one space, e.g. "F75A 00802".
+# Shorter terms are more likely part of a meter ID, so are left to the text search
+METER_ID_PATTERN = re.compile(r"(?=[A-Z0-9 ]{8,10}$)(?=.*[A-Z])(?=.*\d)[A-Z0-9]+(?: [A-Z0-9]+)?", re.IGNORECASE)
+
+# A date (YYYYMMDD), or a range of dates such as "20160301-20160331" or "20160301..20160331"
+DATE_RANGE_PATTERN = re.compile(r"(\d{8})(?:\s*(?:-|\.\.)\s*(\d{8}))?")
+
+# A register reading with a decimal point (digits alone could be a meter ID), e.g. "56311.0"
+REGISTER_READING_PATTERN = re.compile(r"\d+\.\d+")
+
+SearchKind = Literal["mpan_core", "meter_id", "reading_at", "register_reading"]
+
+
+class TypedSearch(NamedTuple):
+    """The kind of value a search term is, and the lookups of energy readings finding it."""
+
+    kind: SearchKind
+    lookups: dict[str, Any]
+
+
+def classify_search_term(search_term: str) -> TypedSearch | None:
+    """Return the lookups of the energy readings a search term is looking for, or None if the term is ambiguous."""
+    term = search_term.strip()
+    if len(term) > 1 and term[0] in "\"'" and term[0] == term[-1]:
+        term = unescape_string_literal(term).strip()
+
+    if MPAN_CORE_PATTERN.fullmatch(term):
+        return TypedSearch("mpan_core", {"mpan_core": term})
+    if date_range := parse_date_range(term):
+        start_date, end_date = date_range
+        return TypedSearch("reading_at", {"reading_at__gte": start_date, "reading_at__lt": end_date})
+    if REGISTER_READING_PATTERN.fullmatch(term):
+        return TypedSearch("register_reading", {"register_reading": float(term)})
+    if METER_ID_PATTERN.fullmatch(term):
+        return TypedSearch("meter_id", {"meter_id": term.upper()})
+    return None
+
+
+def parse_date_range(term: str) -> tuple[datetime, datetime] | None:
+    """Return the start and (exclusive) end of a date, or an inclusive range of dates, or None if the term is neither.
+
+    Dates are in UTC, as are reading dates.
+    """
+    match = DATE_RANGE_PATTERN.fullmatch(term)
+    if not match:
+        return None
+    try:
+        dates = [parse_timestamp(f"{value}000000") for value in match.groups() if value]
+    except ValueError:
+        return None
+    return min(dates), max(dates) + timedelta(days=1)
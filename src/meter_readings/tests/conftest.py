@@ -0,0 +1,12 @@
+"""Shared fixtures for meter readings tests."""
+
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+
+
+@pytest.fixture
+def d0010_file_path() -> Path:
+    """Return the path to the sample D0010 flow file shipped with the project."""
+    return settings.BASE_DIR.parent / "data" / "DTC5259515123502080915D0010.uff"
@@ -0,0 +1,40 @@
+"""Tests for counting readings and flow files per day as they are imported."""
+
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from meter_readings.importers.date_buckets import add_to_date_buckets
+from meter_readings.importers.flow_files import import_flow_file
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.date_buckets import DateBucket
+from meter_readings.models.energy_readings import Reading
+
+
+def get_counts(series: DateBucket.Series) -> dict[date, int]:
+    """Return the count of each bucket of a series, by day."""
+    return dict(DateBucket.objects.filter(series=series).values_list("date", "count"))
+
+
+@pytest.mark.django_db
+def test_add_to_date_buckets() -> None:
+    """Test counts are added to existing buckets, and missing buckets are created."""
+    add_to_date_buckets(DateBucket.Series.READING_AT, {date(2016, 2, 22): 2})
+    add_to_date_buckets(DateBucket.Series.READING_AT, {date(2016, 2, 22): 3, date(2016, 2, 23): 1})
+    add_to_date_buckets(DateBucket.Series.FILE_CREATED_AT, {})
+
+    assert get_counts(DateBucket.Series.READING_AT) == {date(2016, 2, 22): 5, date(2016, 2, 23): 1}
+    assert get_counts(DateBucket.Series.FILE_CREATED_AT) == {}
+
+
+@pytest.mark.django_db
+def test_imported_flow_files_are_counted_by_day(d0010_file_path: Path) -> None:
+    """Test the readings and creation date of each imported flow file are added to the date buckets."""
+    import_flow_file(FlowFileSource(d0010_file_path))
+    import_flow_file(FlowFileSource(d0010_file_path), force=True)
+
+    reading_dates = Counter(reading_at.date() for reading_at in Reading.objects.values_list("reading_at", flat=True))
+    assert get_counts(DateBucket.Series.READING_AT) == reading_dates
+    assert get_counts(DateBucket.Series.FILE_CREATED_AT) == {date(2016, 3, 2): 2}
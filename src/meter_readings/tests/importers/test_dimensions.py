@@ -0,0 +1,63 @@
+"""Tests for resolving the MPANs, meters, registers and site visits of energy readings."""
+
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from meter_readings.importers.dimensions import DimensionCache, ReadingDimensions
+from meter_readings.importers.flow_files import parse_flow_file
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.meters import Meter, Register
+from meter_readings.models.mpans import MPAN
+from meter_readings.models.site_visits import SiteVisit
+
+
+@pytest.mark.django_db
+def test_dimension_cache_creates_missing_rows_once() -> None:
+    """Test missing rows are created, existing rows are read, and cached rows need no query."""
+    MPAN.objects.create(mpan_core="1200023305967", bsc_validation_status="V")
+    cache = DimensionCache(MPAN, ("mpan_core", "bsc_validation_status"))
+
+    cache.resolve([("1200023305967", "V"), ("1900001059816", "V"), ("1200023305967", "F")])
+    with CaptureQueriesContext(connection) as queries:
+        cache.resolve([("1200023305967", "V"), ("1900001059816", "V")])
+
+    assert len(queries) == 0
+    assert MPAN.objects.count() == 3
+    assert cache[("1200023305967", "V")] == MPAN.objects.get(mpan_core="1200023305967", bsc_validation_status="V").pk
+
+
+@pytest.mark.django_db
+def test_dimension_cache_reads_only_requested_rows() -> None:
+    """Test only the rows with the requested values are read, not others sharing the value of one of their fields."""
+    requested = SiteVisit.objects.create(visit_reason="01", additional_information="Meter stopped")
+    SiteVisit.objects.bulk_create(
+        [SiteVisit(visit_reason="01", additional_information=f"Visit {number}") for number in range(100)],
+    )
+    cache = DimensionCache(SiteVisit, ("visit_reason", "additional_information"))
+
+    cache.resolve([("01", "Meter stopped"), ("01", "Meter replaced")])
+
+    assert set(cache.keys) == {("01", "Meter stopped"), ("01", "Meter replaced")}
+    assert cache[("01", "Meter stopped")] == requested.pk
+    assert SiteVisit.objects.count() == 102
+
+
+@pytest.mark.django_db
+def test_reading_dimensions(d0010_file_path: Path) -> None:
+    """Test every MPAN, meter, register and site visit of a flow file is stored once, with an empty site visit."""
+    _, records = parse_flow_file(FlowFileSource(d0010_file_path))
+    dimensions = ReadingDimensions()
+
+    dimensions.resolve(records)
+    dimensions.resolve(records)
+
+    assert MPAN.objects.count() == 11
+    assert Meter.objects.count() == 11
+    assert Register.objects.count() == 13
+    assert SiteVisit.objects.filter(visit_reason="", additional_information="").exists()
+    night_register = Register.objects.get(meter__meter_id="36933604", meter_register_id="NT")
+    keys = [dimensions.get_keys(record) for record in records]
+    assert sum(register_key == night_register.pk for _, _, _, _, register_key, _ in keys) == 1
@@ -0,0 +1,165 @@
+"""Tests for queueing flow files as import jobs, and claiming and running them."""
+
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.db import OperationalError
+from django.utils import timezone
+
+from meter_readings.importers import jobs
+from meter_readings.importers.jobs import (
+    claim_import_job,
+    describe_import_job,
+    enqueue_import_jobs,
+    get_backoff_seconds,
+    get_import_queue_stats,
+    renew_import_job_lease,
+    requeue_stale_import_jobs,
+    run_import_job,
+    send_import_job_heartbeats,
+)
+from meter_readings.models.energy_readings import EnergyReading
+from meter_readings.models.import_jobs import ImportJob
+
+
+@pytest.mark.django_db
+def test_claim_import_job(d0010_file_path: Path) -> None:
+    """Test each ready job is claimed once, oldest first, and jobs waiting to be retried are not claimed."""
+    first, second, retried = enqueue_import_jobs([d0010_file_path] * 3)
+    ImportJob.objects.filter(pk=retried.pk).update(available_at=timezone.now() + timedelta(minutes=1))
+
+    claimed = [claim_import_job("worker-1"), claim_import_job("worker-2"), claim_import_job("worker-3")]
+
+    assert [job.pk if job else None for job in claimed] == [first.pk, second.pk, None]
+    assert claimed[0].status == ImportJob.Status.RUNNING
+    assert claimed[0].attempts == 1
+    assert claimed[0].worker == "worker-1"
+
+
+@pytest.mark.django_db
+def test_run_import_job(d0010_file_path: Path) -> None:
+    """Test running a claimed job imports its file, recording its outcome and latency."""
+    enqueue_import_jobs([d0010_file_path])
+
+    job = run_import_job(claim_import_job("worker"))
+
+    assert job.status == ImportJob.Status.DONE
+    assert job.reading_count == EnergyReading.objects.count() > 0
+    assert job.wait_seconds >= 0
+    assert job.run_seconds >= 0
+
+
+@pytest.mark.django_db
+def test_run_import_job_invalid_file(tmp_path: Path, d0010_file_path: Path) -> None:
+    """Test a job of a file with an invalid row fails without being retried."""
+    invalid_file_path = tmp_path / "invalid.uff"
+    invalid_file_path.write_text(d0010_file_path.read_text().replace("030|S|20160222000000", "030|S|not-a-date"))
+    enqueue_import_jobs([invalid_file_path, tmp_path / "missing.uff"])
+
+    invalid_job = run_import_job(claim_import_job("worker"))
+    missing_job = run_import_job(claim_import_job("worker"))
+
+    assert invalid_job.status == missing_job.status == ImportJob.Status.FAILED
+    assert "not-a-date" in invalid_job.last_error
+    assert "missing.uff" in missing_job.last_error
+    assert invalid_job.attempts == 1
+
+
+@pytest.mark.django_db
+def test_run_import_job_retries_transient_errors(d0010_file_path: Path) -> None:
+    """Test a job failing with a transient database error is retried after a backoff, until attempted too often."""
+    [job] = enqueue_import_jobs([d0010_file_path])
+
+    with patch.object(jobs, "import_flow_file", side_effect=OperationalError("database is locked")):
+        job = run_import_job(claim_import_job("worker"), max_attempts=2)
+        assert job.status == ImportJob.Status.QUEUED
+        assert job.available_at > timezone.now()
+        assert job.last_error == "database is locked"
+
+        ImportJob.objects.filter(pk=job.pk).update(available_at=timezone.now())
+        job = run_import_job(claim_import_job("worker"), max_attempts=2)
+
+    assert job.status == ImportJob.Status.FAILED
+    assert job.attempts == 2
+
+
+def test_backoff_doubles() -> None:
+    """Test the backoff doubles with every attempt, jittered, up to the maximum."""
+    assert 1.0 <= get_backoff_seconds(1) <= 2.0
+    assert 4.0 <= get_backoff_seconds(3) <= 8.0
+    assert get_backoff_seconds(100) <= jobs.BACKOFF_MAX_SECONDS
+
+
+@pytest.mark.django_db
+def test_requeue_stale_import_jobs(d0010_file_path: Path) -> None:
+    """Test running jobs without a heartbeat for too long are queued again, or failed once attempted too often."""
+    enqueue_import_jobs([d0010_file_path] * 3)
+    stale_job = claim_import_job("worker-1")
+    exhausted_job = claim_import_job("worker-2")
+    # Long running, but still sending heartbeats
+    live_job = claim_import_job("worker-3")
+    ImportJob.objects.filter(pk=live_job.pk).update(started_at=timezone.now() - timedelta(hours=2))
+    ImportJob.objects.filter(pk__in=[stale_job.pk, exhausted_job.pk]).update(
+        heartbeat_at=timezone.now() - timedelta(hours=2),
+    )
+    ImportJob.objects.filter(pk=exhausted_job.pk).update(attempts=3)
+
+    assert requeue_stale_import_jobs(max_attempts=3) == 2
+    assert claim_import_job("worker-4").pk == stale_job.pk
+    exhausted_job.refresh_from_db()
+    assert exhausted_job.status == ImportJob.Status.FAILED
+    assert exhausted_job.last_error == jobs.STALE_ERROR
+    live_job.refresh_from_db()
+    assert live_job.status == ImportJob.Status.RUNNING
+
+
+@pytest.mark.django_db
+def test_outcome_of_job_taken_over_is_not_saved(d0010_file_path: Path) -> None:
+    """Test a worker whose job was found stale and claimed by another neither renews nor records its outcome."""
+    enqueue_import_jobs([d0010_file_path])
+    job = claim_import_job("worker-1")
+    assert renew_import_job_lease(job)
+    ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=2))
+    requeue_stale_import_jobs()
+    claim_import_job("worker-2")
+
+    assert not renew_import_job_lease(job)
+    job = run_import_job(job)
+
+    assert job.status == ImportJob.Status.RUNNING
+    assert job.worker == "worker-2"
+    assert "LOST" in describe_import_job(job)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_heartbeats_renew_lease_while_job_runs(d0010_file_path: Path) -> None:
+    """Test heartbeats are sent from a thread of their own while the worker runs a job."""
+    enqueue_import_jobs([d0010_file_path])
+    job = claim_import_job("worker")
+    ImportJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=2))
+
+    with send_import_job_heartbeats(job, interval_seconds=0.01):
+        time.sleep(0.2)
+
+    job.refresh_from_db()
+    assert job.heartbeat_at > timezone.now() - timedelta(minutes=1)
+
+
+@pytest.mark.django_db
+def test_import_queue_stats(d0010_file_path: Path) -> None:
+    """Test the queue stats count jobs by status, and time the wait and run of finished jobs."""
+    enqueue_import_jobs([d0010_file_path] * 3)
+    run_import_job(claim_import_job("worker"))
+    claim_import_job("worker")
+
+    stats = get_import_queue_stats()
+
+    assert stats.status_counts == {"done": 1, "running": 1, "queued": 1}
+    assert stats.depth == 1
+    assert stats.oldest_queued_seconds >= 0
+    assert stats.average_wait_seconds >= 0
+    assert stats.max_wait_seconds >= stats.average_wait_seconds
+    assert stats.average_run_seconds >= 0
@@ -0,0 +1,96 @@
+"""Tests for writing energy readings to the database with each loader."""
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from meter_readings.importers.dimensions import ReadingDimensions
+from meter_readings.importers.flow_files import parse_flow_file
+from meter_readings.importers.loaders import (
+    EnergyReadingLoader,
+    PostgreSQLEnergyReadingLoader,
+    ReadingRow,
+    SQLiteEnergyReadingLoader,
+    build_copy_line,
+    build_reading_row,
+    get_energy_reading_loader,
+)
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.energy_readings import EnergyReading, Reading
+from meter_readings.models.flow_files import FlowFile
+
+
+def build_rows(file_path: Path, flow_file: FlowFile) -> list[ReadingRow]:
+    """Return the rows of the readings of a flow file, creating their MPANs, meters, registers and site visits."""
+    parser, records = parse_flow_file(FlowFileSource(file_path))
+    assert not parser.errors
+    dimensions = ReadingDimensions()
+    dimensions.resolve(records)
+    return [build_reading_row(flow_file.pk, dimensions, record) for record in records]
+
+
+def load_readings(loader_class: type[EnergyReadingLoader], rows: list[ReadingRow]) -> list[dict]:
+    """Write rows with a loader, returning the saved energy readings (without their keys)."""
+    loader_class(connection).load(rows)
+    field_names = [field.attname for field in EnergyReading._meta.concrete_fields if not field.primary_key]
+    return list(EnergyReading.objects.order_by("id").values(*field_names))
+
+
+@pytest.mark.django_db
+def test_sqlite_loader_matches_orm(d0010_file_path: Path) -> None:
+    """Test readings written with executemany are read back exactly as those written with the ORM."""
+    flow_file = FlowFile.objects.create(name="flow", extension=".uff")
+    rows = build_rows(d0010_file_path, flow_file)
+
+    orm_readings = load_readings(EnergyReadingLoader, rows)
+    Reading.objects.all().delete()
+    sqlite_readings = load_readings(SQLiteEnergyReadingLoader, rows)
+
+    assert sqlite_readings == orm_readings
+    assert sqlite_readings[0]["reading_at"] == datetime(2016, 2, 22, tzinfo=UTC)
+    assert EnergyReading.objects.filter(flow_file=flow_file).count() == len(rows)
+
+
+@pytest.mark.django_db
+def test_sqlite_loader_query_per_batch(d0010_file_path: Path) -> None:
+    """Test each batch of rows is written with a single query, and an empty batch with none."""
+    flow_file = FlowFile.objects.create(name="flow", extension=".uff")
+    rows = build_rows(d0010_file_path, flow_file)
+    loader = SQLiteEnergyReadingLoader(connection)
+
+    with CaptureQueriesContext(connection) as queries:
+        loader.load(rows)
+        loader.load([])
+
+    assert len(queries) == 1
+
+
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="Requires a PostgreSQL database")
+@pytest.mark.django_db
+def test_postgresql_loader_matches_orm(d0010_file_path: Path) -> None:
+    """Test readings written with COPY are read back exactly as those written with the ORM."""
+    flow_file = FlowFile.objects.create(name="flow", extension=".uff")
+    rows = build_rows(d0010_file_path, flow_file)
+
+    orm_readings = load_readings(EnergyReadingLoader, rows)
+    Reading.objects.all().delete()
+
+    assert load_readings(PostgreSQLEnergyReadingLoader, rows) == orm_readings
+
+
+def test_copy_line() -> None:
+    """Test values are written in the text format of COPY, with NULLs and special characters escaped."""
+    row = (1, "back\\slash", "tab\there", "new\nline\r", None, 1.5, datetime(2016, 2, 22, tzinfo=UTC))
+
+    assert build_copy_line(row) == "1\tback\\\\slash\ttab\\there\tnew\\nline\\r\t\\N\t1.5\t2016-02-22T00:00:00+00:00\n"
+
+
+def test_loader_chosen_by_database_engine() -> None:
+    """Test the loader is chosen from the database engine, unless overridden in the settings."""
+    assert type(get_energy_reading_loader()) is SQLiteEnergyReadingLoader
+
+    with override_settings(D0010_LOADER="meter_readings.importers.loaders.EnergyReadingLoader"):
+        assert type(get_energy_reading_loader()) is EnergyReadingLoader
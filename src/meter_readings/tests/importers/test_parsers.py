@@ -0,0 +1,123 @@
+"""Tests for parsing rows of D0010 flow files."""
+
+import csv
+from pathlib import Path
+
+from meter_readings.importers.parsers import FlowFileParser
+
+HEADER_ROW = ["ZHV", "0000475656", "D0010002", "D", "UDMS", "X", "MRCY", "20160302153151", "", "", "", "OPER", ""]
+FOOTER_ROW = ["ZPT", "0000475656", "35", "", "11", "20160302154650", ""]
+
+
+def test_flow_file_parser_sample_file(d0010_file_path: Path) -> None:
+    """Test every register reading of the sample file is parsed."""
+    parser = FlowFileParser()
+    with d0010_file_path.open() as file:
+        records = list(parser.iter_records(csv.reader(file, delimiter="|")))
+
+    assert not parser.errors
+    assert parser.header is not None
+    assert parser.footer is not None
+    assert len(records) == 13
+    assert len({id(record.mpan) for record in records}) == 11
+
+
+def test_flow_file_parser_returns_reading_when_next_register_arrives() -> None:
+    """Test a reading is returned as soon as the next 030 row is fed, not at the end of the file."""
+    parser = FlowFileParser()
+
+    assert parser.feed(HEADER_ROW) == []
+    assert parser.feed(["026", "1200023305967", "V", ""]) == []
+    assert parser.feed(["028", "F75A 00802", "D", ""]) == []
+    assert parser.feed(["030", "S", "20160222000000", "56311.0", "", "", "T", "N", ""]) == []
+
+    (record,) = parser.feed(["030", "S", "20160223000000", "56312.0", "", "", "T", "N", ""])
+    assert record.mpan.mpan_core is not None
+    assert record.mpan.mpan_core.mpan_core == "1200023305967"
+    assert record.register_reading is not None
+    assert record.register_reading.register_reading == 56311.0
+
+
+def test_flow_file_parser_shares_mpan_and_meter_between_registers() -> None:
+    """Test each register of a multi-register meter is a separate reading, sharing the MPAN and meter details."""
+    rows = [
+        HEADER_ROW,
+        ["026", "1900005281720", "V", ""],
+        ["027", "01", "MPAN visit", ""],
+        ["028", "36933604", "D", ""],
+        ["029", "03", "Meter visit", ""],
+        ["030", "DY", "20160222000000", "80598.0", "", "", "T", "N", ""],
+        ["032", "01", "F", ""],
+        ["033", "20", "Register visit", ""],
+        ["030", "NT", "20160222000000", "15549.0", "", "", "T", "N", ""],
+        FOOTER_ROW,
+    ]
+    parser = FlowFileParser()
+    day, night = parser.iter_records(rows)
+
+    assert day.mpan is night.mpan
+    assert day.meter is night.meter
+    assert day.mpan.site_visit is not None
+    assert day.mpan.site_visit.additional_information == "MPAN visit"
+    assert day.meter.site_visit is not None
+    assert day.meter.site_visit.additional_information == "Meter visit"
+    # Validation results and site visits belong to the register reading they follow
+    assert day.meter_reading_validation_result is not None
+    assert day.register_reading_site_visit is not None
+    assert night.meter_reading_validation_result is None
+    assert night.register_reading_site_visit is None
+
+
+def test_flow_file_parser_multiple_meters() -> None:
+    """Test readings are recorded against the meter they follow."""
+    rows = [
+        HEADER_ROW,
+        ["026", "2200031930792", "V", ""],
+        ["028", "S85D24767", "C", ""],
+        ["030", "01", "20160301000000", "20231.0", "", "", "T", "N", ""],
+        ["028", "S85D24768", "C", ""],
+        ["030", "01", "20160301000000", "64472.0", "", "", "T", "N", ""],
+        FOOTER_ROW,
+    ]
+    parser = FlowFileParser()
+    first, second = parser.iter_records(rows)
+
+    assert first.mpan is second.mpan
+    assert first.meter.meter_reading_type is not None
+    assert first.meter.meter_reading_type.meter_id == "S85D24767"
+    assert second.meter.meter_reading_type is not None
+    assert second.meter.meter_reading_type.meter_id == "S85D24768"
+
+
+def test_flow_file_parser_mpan_core_without_readings() -> None:
+    """Test an MPAN core without any register readings is still returned as a reading."""
+    parser = FlowFileParser()
+    (record,) = parser.iter_records([HEADER_ROW, ["026", "1200023305967", "V", ""], FOOTER_ROW])
+
+    assert record.mpan.mpan_core is not None
+    assert record.register_reading is None
+
+
+def test_flow_file_parser_ignores_rows_after_footer() -> None:
+    """Test parsing stops at the file footer."""
+    rows = [HEADER_ROW, ["026", "1200023305967", "V", ""], FOOTER_ROW, ["not", "a", "row"]]
+    parser = FlowFileParser()
+
+    assert len(list(parser.iter_records(rows))) == 1
+    assert not parser.errors
+
+
+def test_flow_file_parser_records_errors_and_continues() -> None:
+    """Test invalid rows are recorded while the remaining rows are still parsed."""
+    rows = [
+        HEADER_ROW,
+        ["026", "1200023305967", "X", ""],
+        [],
+        ["026", "1900001059816", "V", ""],
+        FOOTER_ROW,
+    ]
+    parser = FlowFileParser()
+    list(parser.iter_records(rows))
+
+    assert [row for row, _ in parser.errors] == [["026", "1200023305967", "X", ""], []]
+    assert parser.footer_present
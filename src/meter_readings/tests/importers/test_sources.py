@@ -0,0 +1,78 @@
+"""Tests for opening plain, compressed and archived flow files."""
+
+import bz2
+import gzip
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from meter_readings.importers.sources import FlowFileSource, list_flow_file_sources
+
+
+@pytest.fixture
+def zip_file_path(tmp_path: Path, d0010_file_path: Path) -> Path:
+    """Return a zip archive of two flow files, alongside a directory and hidden files to be ignored."""
+    zip_file_path = tmp_path / "flows.zip"
+    with zipfile.ZipFile(zip_file_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(d0010_file_path, "first.uff")
+        archive.mkdir("nested")
+        archive.write(d0010_file_path, "nested/second.uff")
+        archive.writestr(".DS_Store", "")
+        archive.writestr("__MACOSX/._first.uff", "")
+    return zip_file_path
+
+
+def test_plain_file(d0010_file_path: Path) -> None:
+    """Test an uncompressed file is its own single flow file."""
+    [source] = list_flow_file_sources(d0010_file_path)
+
+    assert source == FlowFileSource(d0010_file_path)
+    assert source.name == "DTC5259515123502080915D0010.uff"
+    assert source.archive_name == ""
+    with source.open() as file:
+        assert file.read() == d0010_file_path.read_bytes()
+
+
+@pytest.mark.parametrize(("suffix", "compress"), [(".gz", gzip.compress), (".bz2", bz2.compress)])
+def test_compressed_file(tmp_path: Path, d0010_file_path: Path, suffix: str, compress: object) -> None:
+    """Test a compressed file is decompressed as it is read, and named without its compression suffix."""
+    compressed_file_path = tmp_path / f"flow.uff{suffix}"
+    compressed_file_path.write_bytes(compress(d0010_file_path.read_bytes()))  # type: ignore[operator]
+
+    [source] = list_flow_file_sources(compressed_file_path)
+
+    assert source.name == "flow.uff"
+    assert source.archive_name == f"flow.uff{suffix}"
+    with source.open() as file:
+        assert file.read() == d0010_file_path.read_bytes()
+
+
+def test_compressed_file_detected_by_content(tmp_path: Path, d0010_file_path: Path) -> None:
+    """Test a compressed file is decompressed even without a compression suffix."""
+    compressed_file_path = tmp_path / "flow.uff"
+    compressed_file_path.write_bytes(gzip.compress(d0010_file_path.read_bytes()))
+
+    with FlowFileSource(compressed_file_path).open() as file:
+        assert file.read() == d0010_file_path.read_bytes()
+
+
+def test_zip_archive(zip_file_path: Path, d0010_file_path: Path) -> None:
+    """Test every flow file in a zip archive is listed, ignoring directories and hidden files."""
+    sources = list_flow_file_sources(zip_file_path)
+
+    assert sources == [FlowFileSource(zip_file_path, "first.uff"), FlowFileSource(zip_file_path, "nested/second.uff")]
+    assert sources[1].name == "second.uff"
+    assert sources[1].archive_name == "flows.zip"
+    with sources[1].open() as file:
+        assert file.read() == d0010_file_path.read_bytes()
+
+
+def test_empty_zip_archive(tmp_path: Path) -> None:
+    """Test a zip archive without any flow files is rejected."""
+    zip_file_path = tmp_path / "empty.zip"
+    with zipfile.ZipFile(zip_file_path, "w") as archive:
+        archive.writestr(".DS_Store", "")
+
+    with pytest.raises(ValueError, match="No flow files found"):
+        list_flow_file_sources(zip_file_path)
@@ -0,0 +1,115 @@
+"""Tests for splitting the raw bytes of flow files into rows."""
+
+import csv
+import gzip
+import io
+from pathlib import Path
+
+import pytest
+
+from meter_readings.importers.tokenizers import RECORD_CODES, FlowFileTokenizer
+
+# Covers line endings, blank lines, records which are not read and a last line without a new line
+EDGE_CASE_CONTENT = (
+    b"ZHV|0000475656|D0010002|D|UDMS|X|MRCY|20160302153151||||OPER|\r\n"
+    b"026|1200023305967|V|\r\n"
+    b"\r\n"
+    b"028|F75A 00802|D|\n"
+    b"\n"
+    b"0261|not a record|\n"
+    b"031|unread record|\n"
+    b"032\n"
+    b"030|S|20160222000000|56311.0|||T|N|\n"
+    b"033|01|free text with \"quotes\", commas and 'apostrophes'|\n"
+    b"ZPT|0000475656|1||1|20160302154650"
+)
+
+
+def read_with_csv(content: bytes) -> list[list[str]]:
+    """Return the rows read by the parser, as split by a csv.reader."""
+    return [
+        row
+        for row in csv.reader(io.TextIOWrapper(io.BytesIO(content), newline=""), delimiter="|", quoting=csv.QUOTE_NONE)
+        if not row or row[0] in RECORD_CODES
+    ]
+
+
+def test_tokenizer_matches_csv_reader(d0010_file_path: Path) -> None:
+    """Test the rows of a flow file are split exactly as a csv.reader would split them."""
+    content = d0010_file_path.read_bytes()
+
+    rows = list(FlowFileTokenizer().iter_rows(io.BytesIO(content)))
+
+    assert rows == read_with_csv(content)
+    assert rows[1] == ["026", "1200023305967", "V", ""]
+
+
+def test_tokenizer_edge_cases() -> None:
+    """Test line endings, blank lines and rows of records which are not read."""
+    rows = list(FlowFileTokenizer().iter_rows(io.BytesIO(EDGE_CASE_CONTENT)))
+
+    assert rows == read_with_csv(EDGE_CASE_CONTENT)
+    assert rows == [
+        ["ZHV", "0000475656", "D0010002", "D", "UDMS", "X", "MRCY", "20160302153151", "", "", "", "OPER", ""],
+        ["026", "1200023305967", "V", ""],
+        [],
+        ["028", "F75A 00802", "D", ""],
+        [],
+        ["032"],
+        ["030", "S", "20160222000000", "56311.0", "", "", "T", "N", ""],
+        ["033", "01", "free text with \"quotes\", commas and 'apostrophes'", ""],
+        ["ZPT", "0000475656", "1", "", "1", "20160302154650"],
+    ]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 7, 64, 1024 * 1024])
+def test_tokenizer_block_size(d0010_file_path: Path, block_size: int) -> None:
+    """Test rows are split the same way however the bytes are split into blocks."""
+    content = d0010_file_path.read_bytes()
+
+    rows = list(FlowFileTokenizer().iter_rows(io.BytesIO(content), block_size=block_size))
+
+    assert rows == read_with_csv(content)
+
+
+def test_tokenizer_feed() -> None:
+    """Test each row is returned as soon as its line is complete, even if its line ending is split across blocks."""
+    tokenizer = FlowFileTokenizer()
+
+    assert tokenizer.feed(b"026|1200023305967|V|\r") == []
+    assert tokenizer.feed(b"\n028|F75A") == [["026", "1200023305967", "V", ""]]
+    assert tokenizer.feed(b" 00802|D|\r") == []
+    assert tokenizer.close() == [["028", "F75A 00802", "D", ""]]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_tokenizer_mmap(tmp_path: Path, d0010_file_path: Path, compress: bool) -> None:
+    """Test files are read the same way when memory mapped, with compressed files read as normal."""
+    file_path = tmp_path / "flow.uff"
+    content = d0010_file_path.read_bytes()
+    file_path.write_bytes(gzip.compress(content) if compress else content)
+
+    with file_path.open(mode="rb") as file, gzip.GzipFile(fileobj=file) if compress else file as flow_file:
+        rows = list(FlowFileTokenizer().iter_rows(flow_file, use_mmap=True))
+
+    assert rows == read_with_csv(content)
+
+
+def test_tokenizer_mmap_empty_file(tmp_path: Path) -> None:
+    """Test an empty file, which cannot be memory mapped, is read as normal."""
+    file_path = tmp_path / "empty.uff"
+    file_path.write_bytes(b"")
+
+    with file_path.open(mode="rb") as file:
+        assert list(FlowFileTokenizer().iter_rows(file, use_mmap=True)) == []
+
+
+def test_tokenizer_encoding() -> None:
+    """Test rows are decoded with the given encoding, failing on undecodable bytes."""
+    content = "033|01|Café|\n".encode("latin-1")
+
+    assert list(FlowFileTokenizer(encoding="latin-1").iter_rows(io.BytesIO(content))) == [
+        ["033", "01", "Café", ""],
+    ]
+    with pytest.raises(UnicodeDecodeError):
+        list(FlowFileTokenizer(encoding="utf-8").iter_rows(io.BytesIO(content)))
@@ -0,0 +1,141 @@
+"""Tests for importing flow files fed in chunks, as they are uploaded."""
+
+import gzip
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from django.db import connection, connections
+
+from meter_readings.importers.flow_files import import_flow_file
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.importers.uploads import FlowFileUpload, GzipStreamDecompressor
+from meter_readings.models.energy_readings import EnergyReading
+from meter_readings.models.flow_files import FlowFile
+from meter_readings.schemas.import_results import ImportResult
+
+# Fields compared between readings imported from a file on disk and from an upload
+COMPARED_FIELDS = ("mpan_core", "meter_id", "meter_register_id", "reading_at", "register_reading")
+
+
+def upload(data: bytes, name: str = "flow.uff", chunk_size: int = 7, *, force: bool = False) -> ImportResult:
+    """Import a flow file from its bytes, fed in chunks of the given size."""
+    flow_file_upload = FlowFileUpload(FlowFileSource(Path(name)), batch_size=4, force=force)
+    for start in range(0, len(data), chunk_size):
+        flow_file_upload.feed(data[start : start + chunk_size])
+    return flow_file_upload.close()
+
+
+def get_energy_readings() -> list[tuple]:
+    """Return the compared fields of every energy reading."""
+    return list(EnergyReading.objects.order_by("id").values_list(*COMPARED_FIELDS))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 100, 1_000_000])
+def test_decompress_concatenated_members(chunk_size: int) -> None:
+    """Test concatenated gzip members are decompressed in blocks of bounded size, whatever the size of each chunk."""
+    data = gzip.compress(b"a" * 100_000) + gzip.compress(b"b" * 10)
+    decompressor = GzipStreamDecompressor(block_size=1000)
+
+    blocks = []
+    for start in range(0, len(data), chunk_size):
+        blocks.extend(decompressor.decompress(data[start : start + chunk_size]))
+
+    assert b"".join(blocks) == b"a" * 100_000 + b"b" * 10
+    assert max(len(block) for block in blocks) <= 1000
+    assert decompressor.complete
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("compress", [bytes, gzip.compress])
+def test_upload(d0010_file_path: Path, compress: object) -> None:
+    """Test an upload, plain or gzipped, imports the same readings as the file on disk."""
+    data = d0010_file_path.read_bytes()
+    import_flow_file(FlowFileSource(d0010_file_path))
+    expected_readings = get_energy_readings()
+    FlowFile.objects.all().delete()
+
+    result = upload(compress(data), "flow.uff.gz")  # type: ignore[operator]
+
+    assert result.success
+    assert result.reading_count == len(expected_readings)
+    assert get_energy_readings() == expected_readings
+    flow_file = FlowFile.objects.get()
+    assert (flow_file.name, flow_file.extension, flow_file.archive_name) == ("flow", ".uff", "flow.uff.gz")
+    assert flow_file.content_hash == hashlib.sha256(data).hexdigest()
+    assert flow_file.file_identifier
+
+
+@pytest.mark.django_db
+def test_upload_already_imported(d0010_file_path: Path) -> None:
+    """Test an upload of a file already imported is rolled back, unless forced."""
+    import_flow_file(FlowFileSource(d0010_file_path))
+    data = d0010_file_path.read_bytes()
+
+    assert upload(data).skipped
+    assert FlowFile.objects.count() == 1
+
+    assert upload(data, force=True).success
+    assert FlowFile.objects.count() == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("corrupt", "error"),
+    [
+        (lambda data: data.replace(b"030|S|20160222000000", b"030|S|not-a-date"), "Error processing row"),
+        (lambda data: gzip.compress(data)[:-100], "Gzip data ended"),
+        (lambda data: gzip.compress(data)[:10] + b"\xff" * 100, "Invalid gzip data"),
+    ],
+)
+def test_upload_with_error_writes_nothing(d0010_file_path: Path, corrupt: object, error: str) -> None:
+    """Test an upload with an invalid row, or invalid gzip data, is rolled back."""
+    result = upload(corrupt(d0010_file_path.read_bytes()))  # type: ignore[operator]
+
+    assert not result.success
+    assert result.reading_count == 0
+    assert any(error in message for message in result.errors)
+    assert not FlowFile.objects.exists()
+    assert not EnergyReading.objects.exists()
+
+
+@pytest.mark.django_db
+def test_abort_upload(d0010_file_path: Path) -> None:
+    """Test an interrupted upload writes nothing."""
+    flow_file_upload = FlowFileUpload(FlowFileSource(Path("flow.uff")), batch_size=1)
+    flow_file_upload.feed(d0010_file_path.read_bytes()[:-200])
+
+    flow_file_upload.abort()
+
+    assert not FlowFile.objects.exists()
+    assert not EnergyReading.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_upload_in_progress_does_not_block_other_writers(d0010_file_path: Path) -> None:
+    """Test nothing is written, and no transaction held open, until an upload is complete, so others can write."""
+    data = d0010_file_path.read_bytes()
+    flow_file_upload = FlowFileUpload(FlowFileSource(Path("upload.uff")), batch_size=1, force=True)
+    flow_file_upload.feed(data[: len(data) // 2])
+
+    assert not connection.in_atomic_block
+    assert not FlowFile.objects.exists()
+
+    # Another importer writes over a connection of its own while the upload is still being received
+    def import_other_file() -> ImportResult:
+        try:
+            return import_flow_file(FlowFileSource(d0010_file_path), force=True)
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other_result = executor.submit(import_other_file).result(timeout=30)
+    assert other_result.success
+
+    flow_file_upload.feed(data[len(data) // 2 :])
+    result = flow_file_upload.close()
+
+    assert result.success
+    assert result.reading_count == 13
+    assert set(FlowFile.objects.values_list("name", flat=True)) == {"upload", d0010_file_path.stem}
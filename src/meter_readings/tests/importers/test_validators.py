@@ -0,0 +1,143 @@
+"""Tests for fast-path validation of the rows of D0010 flow files."""
+
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from meter_readings.importers.validators import (
+    METER_READING_TYPE_VALIDATOR,
+    METER_READING_VALIDATION_RESULT_VALIDATOR,
+    MPAN_CORE_VALIDATOR,
+    REGISTER_READING_VALIDATOR,
+    SITE_VISIT_VALIDATOR,
+    ZHV_HEADER_VALIDATOR,
+    ZPT_FOOTER_VALIDATOR,
+    RecordValidator,
+    literal,
+)
+from meter_readings.schemas.mpan_cores import MPANCore
+
+VALID_ROWS = [
+    (
+        ZHV_HEADER_VALIDATOR,
+        ["ZHV", "0000475656", "D0010002", "D", "UDMS", "X", "MRCY", "20160302153151", "", "", "", "OPER", ""],
+    ),
+    (MPAN_CORE_VALIDATOR, ["026", "1200023305967", "V", ""]),
+    (SITE_VISIT_VALIDATOR, ["027", "01", "Example additional information", ""]),
+    (METER_READING_TYPE_VALIDATOR, ["028", "F75A 00802", "D", ""]),
+    (REGISTER_READING_VALIDATOR, ["030", "S", "20160222000000", "56311.0", "", "", "T", "N", ""]),
+    (REGISTER_READING_VALIDATOR, ["030", "01", "20160222000000", "1", "20160101000000", "10", "", "P"]),
+    (METER_READING_VALIDATION_RESULT_VALIDATOR, ["032", "01", "T", ""]),
+    (ZPT_FOOTER_VALIDATOR, ["ZPT", "0000475656", "35", "", "11", "20160302154650", ""]),
+]
+
+# Values substituted into every field of every valid row, chosen to probe the edges of each check
+EDGE_VALUES = [
+    "",
+    " ",
+    "0",
+    "00",
+    "1",
+    "01",
+    "007",
+    "27",
+    "28",
+    "88",
+    "99",
+    "998",
+    "999",
+    "1000",
+    "-1",
+    "+1",
+    " 1",
+    "1 ",
+    "1_0",
+    "1.0",
+    "1.5",
+    "1e3",
+    "nan",
+    "inf",
+    "\u00b2",
+    "\u0663",
+    "T",
+    "F",
+    "N",
+    "P",
+    "V",
+    "X",
+    "S",
+    "TO",
+    "ZHV",
+    "ZHF",
+    "ZPT",
+    "026",
+    "030",
+    "D0010002",
+    "D001000",
+    "D0010002\n",
+    "DXXXX123",
+    "20160222000000",
+    "20161322000000",
+    "20160230000000",
+    "20160222240000",
+    "2016022200",
+    "201602220000000",
+    " 0160222000000",
+    "2016022200000\u0661",
+    "abcdefghijklmn",
+    "A" * 200,
+    "A" * 201,
+]
+
+
+def validate(validator: RecordValidator[Any], row: list[str], *, fast: bool) -> tuple[Any, ...]:
+    """Validate a row with either path, returning a comparable outcome."""
+    try:
+        model: BaseModel = validator.validate(row) if fast else validator.validate_with_pydantic(row)
+    except ValidationError:
+        return ("invalid",)
+    # repr is used so that nan values compare equal
+    return (type(model), repr(model.__dict__), model.model_fields_set)
+
+
+def mutated_rows() -> list[tuple[RecordValidator[Any], list[str]]]:
+    """Return every valid row, with every field replaced by every edge value, and with every length."""
+    rows = []
+    for validator, row in VALID_ROWS:
+        for index in range(len(row)):
+            rows.extend((validator, [*row[:index], value, *row[index + 1 :]]) for value in EDGE_VALUES)
+        rows.extend((validator, row[:length]) for length in range(len(row) + 1))
+    return rows
+
+
+@pytest.mark.parametrize(("validator", "row"), VALID_ROWS)
+def test_validate_valid_row(validator: RecordValidator[Any], row: list[str], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test valid rows are accepted by the fast path without falling back to pydantic."""
+    expected_model = validator.validate_with_pydantic(row)
+
+    monkeypatch.setattr(validator, "validate_with_pydantic", pytest.fail)
+    assert validator.validate(row) == expected_model
+
+
+def test_validate_matches_pydantic_for_edge_values() -> None:
+    """Test the fast path accepts and rejects exactly the same rows, with the same values, as pydantic."""
+    mismatches = [
+        (validator.model.__name__, row)
+        for validator, row in mutated_rows()
+        if validate(validator, row, fast=True) != validate(validator, row, fast=False)
+    ]
+
+    assert mismatches == []
+
+
+def test_validate_invalid_row_raises_pydantic_error() -> None:
+    """Test invalid rows raise pydantic's validation error, with its message."""
+    with pytest.raises(ValidationError, match="1 validation error for MPANCore\nbsc_validation_status"):
+        MPAN_CORE_VALIDATOR.validate(["026", "1200023305967", "X", ""])
+
+
+def test_record_validator_requires_check_for_every_field() -> None:
+    """Test a validator cannot be compiled unless every field of the schema has a check."""
+    with pytest.raises(ValueError, match="Checks for MPANCore must cover exactly the fields"):
+        RecordValidator(MPANCore, {"code": literal("026")})
@@ -0,0 +1,488 @@
+"""Tests for the import D0010 files management command."""
+
+import gc
+import gzip
+import hashlib
+import json
+import logging
+import os
+import signal
+import zipfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import override_settings
+
+from meter_readings.importers.flow_files import hash_flow_file
+from meter_readings.importers.loaders import SQLiteEnergyReadingLoader
+from meter_readings.importers.pools import IN_FLIGHT_PER_WORKER, ParsedFlowFile, import_flow_files
+from meter_readings.importers.profiles import profile_call, summarise_tracemalloc_reports
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.energy_readings import EnergyReading
+from meter_readings.models.flow_files import FlowFile, FlowFileMetadata
+from meter_readings.models.import_runs import ImportRun, ImportRunFile
+from meter_readings.schemas.import_profiles import ProfileOptions
+from meter_readings.utils.databases import read_sqlite_pragmas
+
+
+@pytest.mark.django_db
+def test_import_d0010_file(d0010_file_path: Path) -> None:
+    """Test importing a valid D0010 file writes the flow file, its metadata and every register reading."""
+    stdout = StringIO()
+    call_command("import_d0010_files", str(d0010_file_path), stdout=stdout)
+
+    assert "Data imported successfully" in stdout.getvalue()
+    assert "rows/sec" in stdout.getvalue()
+    flow_file = FlowFile.objects.get()
+    assert flow_file.name == "DTC5259515123502080915D0010"
+    assert flow_file.extension == ".uff"
+    assert FlowFileMetadata.objects.get().file_identifier == "0000475656"
+    # One energy reading per 030 register reading row
+    assert EnergyReading.objects.count() == 13
+    night_reading = EnergyReading.objects.get(mpan_core="1900005281720", meter_register_id="NT")
+    assert night_reading.meter_id == "36933604"
+    assert night_reading.register_reading == 15549.0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("batch_size", [1, 5, 1000])
+def test_import_d0010_file_batch_size(d0010_file_path: Path, batch_size: int) -> None:
+    """Test the number of readings written does not depend on the bulk insert batch size."""
+    call_command("import_d0010_files", str(d0010_file_path), batch_size=batch_size, stdout=StringIO())
+
+    assert EnergyReading.objects.count() == 13
+
+
+@pytest.mark.django_db
+def test_import_d0010_file_invalid_batch_size(d0010_file_path: Path) -> None:
+    """Test a non-positive batch size is rejected without writing anything."""
+    stdout = StringIO()
+    call_command("import_d0010_files", str(d0010_file_path), batch_size=0, stdout=stdout)
+
+    assert "Batch size must be a positive integer" in stdout.getvalue()
+    assert not FlowFile.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_d0010_file_with_invalid_row_writes_nothing(tmp_path: Path, d0010_file_path: Path) -> None:
+    """Test a file with an invalid row is rejected as a whole."""
+    invalid_file_path = tmp_path / "invalid.uff"
+    invalid_file_path.write_text(d0010_file_path.read_text().replace("030|S|20160222000000", "030|S|not-a-date"))
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(invalid_file_path), stdout=stdout)
+
+    assert "No data from this file will be written to the database" in stdout.getvalue()
+    assert not FlowFile.objects.exists()
+    assert not EnergyReading.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_d0010_directory(tmp_path: Path, d0010_file_path: Path, workers: int) -> None:
+    """Test importing a directory imports every valid file and summarises the successes and failures."""
+    content = d0010_file_path.read_text()
+    (tmp_path / "first.uff").write_text(content)
+    (tmp_path / "second.uff").write_text(content.replace("0000475656", "0000475657"))
+    (tmp_path / "invalid.uff").write_text(content.replace("026|1200023305967|V|", "026|1200023305967|X|"))
+    # Subdirectories are not imported
+    (tmp_path / "subdirectory").mkdir()
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(tmp_path), workers=workers, stdout=stdout)
+
+    assert "Imported 2 of 3 files (1 failed, 0 skipped)" in stdout.getvalue()
+    assert "FAILED  invalid.uff" in stdout.getvalue()
+    assert set(FlowFile.objects.values_list("name", flat=True)) == {"first", "second"}
+    assert EnergyReading.objects.count() == 26
+
+
+@pytest.mark.django_db
+def test_import_d0010_directory_worker_killed(tmp_path: Path, d0010_file_path: Path) -> None:
+    """Test a file killing its worker process fails, while the other files are imported in a restarted pool."""
+    content = d0010_file_path.read_text()
+    (tmp_path / "first.uff").write_text(content)
+    (tmp_path / "killer.uff").write_text(content.replace("0000475656", "0000475657"))
+    (tmp_path / "second.uff").write_text(content.replace("0000475656", "0000475658"))
+
+    def hash_or_kill_worker(source: FlowFileSource) -> str:
+        if source.path.name == "killer.uff":
+            os.kill(os.getpid(), signal.SIGKILL)
+        return hash_flow_file(source)
+
+    # Worker processes are forked from this one, so they hash files with the patched function
+    stdout = StringIO()
+    with patch("meter_readings.importers.pools.hash_flow_file", side_effect=hash_or_kill_worker):
+        call_command("import_d0010_files", str(tmp_path), workers=2, stdout=stdout)
+
+    assert "Imported 2 of 3 files (1 failed, 0 skipped)" in stdout.getvalue()
+    assert "FAILED  killer.uff" in stdout.getvalue()
+    assert "stopped abruptly" in stdout.getvalue()
+    assert set(FlowFile.objects.values_list("name", flat=True)) == {"first", "second"}
+
+
+@pytest.mark.django_db
+def test_import_d0010_directory_releases_parsed_files(tmp_path: Path, d0010_file_path: Path) -> None:
+    """Test only a few files per worker are held parsed at a time, each released once its result is yielded."""
+    content = d0010_file_path.read_text()
+    for number in range(12):
+        (tmp_path / f"{number}.uff").write_text(content.replace("0000475656", f"{475660 + number:010}"))
+
+    held_counts = []
+    for result in import_flow_files(sorted(tmp_path.iterdir()), workers=2):
+        assert result.success
+        gc.collect()
+        held_counts.append(sum(isinstance(obj, ParsedFlowFile) for obj in gc.get_objects()))
+
+    assert len(held_counts) == 12
+    assert max(held_counts) <= 2 * IN_FLIGHT_PER_WORKER
+    assert EnergyReading.objects.count() == 12 * 13
+
+
+@pytest.mark.django_db
+def test_import_d0010_file_records_content_hash(d0010_file_path: Path) -> None:
+    """Test the content hash and file identifier of an imported file are recorded."""
+    call_command("import_d0010_files", str(d0010_file_path), stdout=StringIO())
+
+    flow_file = FlowFile.objects.get()
+    assert flow_file.content_hash == hashlib.sha256(d0010_file_path.read_bytes()).hexdigest()
+    assert flow_file.file_identifier == "0000475656"
+
+
+@pytest.mark.django_db
+def test_import_d0010_file_skips_previously_imported_file(tmp_path: Path, d0010_file_path: Path) -> None:
+    """Test a file with identical content to an imported file is skipped, whatever its name."""
+    renamed_file_path = tmp_path / "renamed.uff"
+    renamed_file_path.write_bytes(d0010_file_path.read_bytes())
+    call_command("import_d0010_files", str(d0010_file_path), stdout=StringIO())
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(renamed_file_path), stdout=stdout)
+
+    assert f"Skipped {renamed_file_path}" in stdout.getvalue()
+    assert FlowFile.objects.count() == 1
+    assert EnergyReading.objects.count() == 13
+
+
+@pytest.mark.django_db
+def test_import_d0010_file_force(d0010_file_path: Path) -> None:
+    """Test a previously imported file is imported again when forced."""
+    call_command("import_d0010_files", str(d0010_file_path), stdout=StringIO())
+    call_command("import_d0010_files", str(d0010_file_path), force=True, stdout=StringIO())
+
+    assert list(FlowFile.objects.order_by("id").values_list("forced", flat=True)) == [False, True]
+    assert EnergyReading.objects.count() == 26
+
+
+@pytest.mark.django_db
+def test_import_d0010_file_imported_concurrently_is_skipped(d0010_file_path: Path) -> None:
+    """Test a file imported since it was checked (e.g. by another worker) is skipped by the unique constraint."""
+    call_command("import_d0010_files", str(d0010_file_path), stdout=StringIO())
+
+    stdout = StringIO()
+    with patch("meter_readings.importers.flow_files.is_flow_file_imported", return_value=False):
+        call_command("import_d0010_files", str(d0010_file_path), stdout=stdout)
+
+    assert f"Skipped {d0010_file_path}" in stdout.getvalue()
+    assert FlowFile.objects.count() == 1
+    assert EnergyReading.objects.count() == 13
+
+
+@pytest.mark.django_db
+def test_import_d0010_file_failed_import_is_not_skipped(tmp_path: Path, d0010_file_path: Path) -> None:
+    """Test a file whose import failed is imported again on the next run."""
+    file_path = tmp_path / "flow.uff"
+    content = d0010_file_path.read_text()
+    file_path.write_text(content.replace("030|S|20160222000000", "030|S|not-a-date"))
+    call_command("import_d0010_files", str(file_path), stdout=StringIO())
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(file_path), stdout=stdout)
+
+    assert "Skipped" not in stdout.getvalue()
+    assert "No data from this file will be written to the database" in stdout.getvalue()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_d0010_directory_skips_duplicate_files(tmp_path: Path, d0010_file_path: Path, workers: int) -> None:
+    """Test files with identical content within a directory are only imported once."""
+    (tmp_path / "first.uff").write_bytes(d0010_file_path.read_bytes())
+    (tmp_path / "second.uff").write_bytes(d0010_file_path.read_bytes())
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(tmp_path), workers=workers, stdout=stdout)
+
+    assert "Imported 1 of 2 files (0 failed, 1 skipped)" in stdout.getvalue()
+    assert FlowFile.objects.count() == 1
+    assert EnergyReading.objects.count() == 13
+
+
+@pytest.mark.django_db
+def test_import_compressed_d0010_file(tmp_path: Path, d0010_file_path: Path) -> None:
+    """Test a gzip compressed file is imported under the name of the flow file within it."""
+    compressed_file_path = tmp_path / "flow.uff.gz"
+    compressed_file_path.write_bytes(gzip.compress(d0010_file_path.read_bytes()))
+
+    call_command("import_d0010_files", str(compressed_file_path), stdout=StringIO())
+
+    flow_file = FlowFile.objects.get()
+    assert (flow_file.name, flow_file.extension, flow_file.archive_name) == ("flow", ".uff", "flow.uff.gz")
+    assert flow_file.content_hash == hashlib.sha256(d0010_file_path.read_bytes()).hexdigest()
+    assert EnergyReading.objects.count() == 13
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_zipped_d0010_files(tmp_path: Path, d0010_file_path: Path, workers: int) -> None:
+    """Test every flow file within a zip archive is imported."""
+    content = d0010_file_path.read_text()
+    zip_file_path = tmp_path / "flows.zip"
+    with zipfile.ZipFile(zip_file_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("first.uff", content)
+        archive.writestr("second.uff", content.replace("0000475656", "0000475657"))
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(zip_file_path), workers=workers, stdout=stdout)
+
+    assert "Imported 2 of 2 files (0 failed, 0 skipped)" in stdout.getvalue()
+    assert "OK      flows.zip/first.uff" in stdout.getvalue()
+    assert set(FlowFile.objects.values_list("name", "archive_name")) == {
+        ("first", "flows.zip"),
+        ("second", "flows.zip"),
+    }
+    assert EnergyReading.objects.count() == 26
+
+
+@pytest.mark.django_db
+def test_import_compressed_copy_of_imported_d0010_file_is_skipped(tmp_path: Path, d0010_file_path: Path) -> None:
+    """Test a compressed copy of a previously imported file is recognised from its decompressed content."""
+    compressed_file_path = tmp_path / "flow.uff.gz"
+    compressed_file_path.write_bytes(gzip.compress(d0010_file_path.read_bytes()))
+    call_command("import_d0010_files", str(d0010_file_path), stdout=StringIO())
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(compressed_file_path), stdout=stdout)
+
+    assert "Skipped" in stdout.getvalue()
+    assert FlowFile.objects.count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("file_name", "content"),
+    [("truncated.uff.gz", gzip.compress(b"ZHV|0000475656|D0010002|")[:-10]), ("corrupt.zip", b"PK\x03\x04corrupt")],
+)
+def test_import_corrupt_compressed_d0010_file(tmp_path: Path, file_name: str, content: bytes) -> None:
+    """Test a corrupt compressed file is reported as a failure rather than stopping the import."""
+    file_path = tmp_path / file_name
+    file_path.write_bytes(content)
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(file_path), stdout=stdout)
+
+    assert "No data from this file will be written to the database" in stdout.getvalue()
+    assert not FlowFile.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_d0010_file_bulk_import(d0010_file_path: Path) -> None:
+    """Test files are imported with the SQLite bulk import pragmas, which are restored afterwards."""
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA synchronous")
+        [(synchronous,)] = cursor.fetchall()
+    pragmas_during_import = []
+
+    def load(loader: SQLiteEnergyReadingLoader, rows: list) -> None:
+        """Record the pragmas set while readings are written, then write them."""
+        with connection.cursor() as cursor:
+            pragmas_during_import.append(read_sqlite_pragmas(cursor, ["synchronous", "temp_store"]))
+        original_load(loader, rows)
+
+    original_load = SQLiteEnergyReadingLoader.load
+    with patch.object(SQLiteEnergyReadingLoader, "load", load):
+        call_command("import_d0010_files", str(d0010_file_path), bulk_import=True, stdout=StringIO())
+
+    assert EnergyReading.objects.count() == 13
+    # NORMAL synchronous writes and temporary tables in MEMORY
+    assert pragmas_during_import[0] == {"synchronous": 1, "temp_store": 2}
+    with connection.cursor() as cursor:
+        assert read_sqlite_pragmas(cursor, ["synchronous", "temp_store"]) == {
+            "synchronous": synchronous,
+            "temp_store": 0,
+        }
+
+
+@pytest.fixture
+def flow_directory(tmp_path: Path, d0010_file_path: Path) -> Path:
+    """Return a directory of a valid flow file, a zip archive of another and a file with an invalid row."""
+    content = d0010_file_path.read_text()
+    flow_directory = tmp_path / "flows"
+    flow_directory.mkdir()
+    (flow_directory / "first.uff").write_text(content)
+    with zipfile.ZipFile(flow_directory / "second.zip", "w") as archive:
+        archive.writestr("second.uff", content.replace("0000475656", "0000475657"))
+    (flow_directory / "third.uff").write_text(content.replace("0000475656", "0000475658").replace("|V|", "|X|"))
+    return flow_directory
+
+
+@pytest.mark.django_db
+def test_import_d0010_directory_journal(flow_directory: Path) -> None:
+    """Test the outcome of importing every file of a directory is recorded in the journal of the import run."""
+    stdout = StringIO()
+    call_command("import_d0010_files", str(flow_directory), stdout=stdout)
+
+    run = ImportRun.objects.get()
+    assert f"Started import run {run.pk}" in stdout.getvalue()
+    assert run.path == str(flow_directory.resolve())
+    assert run.finished_at is not None
+    assert set(run.files.values_list("relative_path", "member", "status", "reading_count")) == {
+        ("first.uff", "", ImportRunFile.Status.IMPORTED, 13),
+        ("second.zip", "second.uff", ImportRunFile.Status.IMPORTED, 13),
+        ("third.uff", "", ImportRunFile.Status.FAILED, 0),
+    }
+    assert "validation error for MPANCore" in run.files.get(relative_path="third.uff").first_error
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_d0010_directory_resume(flow_directory: Path, d0010_file_path: Path, workers: int) -> None:
+    """Test resuming an import run only imports the files it did not import, retrying those which failed."""
+    call_command("import_d0010_files", str(flow_directory), stdout=StringIO())
+    run = ImportRun.objects.get()
+    # Fix the file which failed
+    (flow_directory / "third.uff").write_text(d0010_file_path.read_text().replace("0000475656", "0000475658"))
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(flow_directory), resume=run.pk, workers=workers, stdout=stdout)
+
+    assert f"Resuming import run {run.pk}: 2 files already imported" in stdout.getvalue()
+    assert "third.uff" in stdout.getvalue()
+    assert "first.uff" not in stdout.getvalue()
+    assert "second.uff" not in stdout.getvalue()
+    assert ImportRun.objects.count() == 1
+    assert set(run.files.values_list("status", flat=True)) == {ImportRunFile.Status.IMPORTED}
+    assert EnergyReading.objects.count() == 39
+
+
+@pytest.mark.django_db
+def test_import_d0010_directory_resume_invalid_run(flow_directory: Path, d0010_file_path: Path) -> None:
+    """Test an unknown import run, or one which imported another file or directory, cannot be resumed."""
+    call_command("import_d0010_files", str(d0010_file_path), stdout=StringIO())
+    run = ImportRun.objects.get()
+
+    stdout = StringIO()
+    call_command("import_d0010_files", str(flow_directory), resume=run.pk + 1, stdout=stdout)
+    call_command("import_d0010_files", str(flow_directory), resume=run.pk, stdout=stdout)
+
+    assert f"No import run found with ID {run.pk + 1}" in stdout.getvalue()
+    assert (
+        f"Import run {run.pk} imported {d0010_file_path.resolve()}, not {flow_directory.resolve()}" in stdout.getvalue()
+    )
+    assert FlowFile.objects.count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_d0010_directory_stats(
+    flow_directory: Path,
+    caplog: pytest.LogCaptureFixture,
+    workers: int,
+) -> None:
+    """Test the statistics of each file are printed and logged as a JSON line, with totals for every file."""
+    stdout = StringIO()
+    with caplog.at_level(logging.INFO, logger="meter_readings.import_stats"):
+        call_command("import_d0010_files", str(flow_directory), stats=True, workers=workers, stdout=stdout)
+
+    assert stdout.getvalue().count("  Stages: hash") == 4
+    assert "Total:" in stdout.getvalue()
+    assert "  Counts: 33 groups, 26 readings, 11 errors, " in stdout.getvalue()
+    log_lines = {Path(line["file_path"]).name: line for line in map(json.loads, caplog.messages)}
+    assert set(log_lines) == {"first.uff", "second.uff", "third.uff"}
+    assert log_lines["first.uff"]["status"] == "imported"
+    assert log_lines["first.uff"]["row_counts"] == {"ZHV": 1, "026": 11, "028": 11, "030": 13, "ZPT": 1}
+    assert log_lines["first.uff"]["group_count"] == 11
+    assert log_lines["first.uff"]["reading_count"] == 13
+    assert log_lines["first.uff"]["query_count"] > 0
+    assert all(seconds >= 0 for seconds in log_lines["first.uff"]["stage_seconds"].values())
+    assert log_lines["third.uff"]["status"] == "failed"
+    assert log_lines["third.uff"]["error_count"] == 11
+
+
+@pytest.mark.django_db
+def test_import_d0010_file_without_stats(d0010_file_path: Path, caplog: pytest.LogCaptureFixture) -> None:
+    """Test statistics are neither collected nor printed unless asked for."""
+    stdout = StringIO()
+    with caplog.at_level(logging.INFO, logger="meter_readings.import_stats"):
+        call_command("import_d0010_files", str(d0010_file_path), stdout=stdout)
+
+    assert "Stages:" not in stdout.getvalue()
+    assert not caplog.messages
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize(("profiler", "suffix"), [("cprofile", ".prof"), ("tracemalloc", ".tracemalloc")])
+def test_import_d0010_directory_profile(
+    tmp_path: Path,
+    flow_directory: Path,
+    workers: int,
+    profiler: str,
+    suffix: str,
+) -> None:
+    """Test a report is written for each profiled file, with a summary of every report at the end."""
+    stdout = StringIO()
+    with override_settings(D0010_PROFILE_DIR=tmp_path / "profiles"):
+        call_command(
+            "import_d0010_files",
+            str(flow_directory),
+            profile=profiler,
+            profile_top=5,
+            workers=workers,
+            stdout=stdout,
+        )
+
+    profile_paths = sorted((tmp_path / "profiles").iterdir())
+    assert [profile_path.suffix for profile_path in profile_paths] == [suffix] * 3
+    assert stdout.getvalue().count("  Profile written to ") == 2
+    assert "3 profiled files" in stdout.getvalue()
+    summary = stdout.getvalue().split("profiled files:\n" if profiler == "cprofile" else "was imported:\n")[1]
+    assert len(summary.splitlines()) == 6
+    assert summary.splitlines()[-1] == f"Reports written to {tmp_path / 'profiles'}"
+
+
+def test_tracemalloc_profile_records_peak_memory(tmp_path: Path) -> None:
+    """Test the peak memory of a profiled call includes memory freed before it returned, unlike the retained memory."""
+    retained = []
+
+    def allocate() -> None:
+        freed = bytearray(1024 * 1024)
+        retained.append(bytearray(len(freed) // 4))
+
+    profile = ProfileOptions(profiler="tracemalloc", directory=tmp_path)
+    _, profile_path = profile_call(allocate, profile, FlowFileSource(tmp_path / "flow.uff"))
+
+    memory = summarise_tracemalloc_reports([profile_path], top=5)
+    assert memory.peak_size >= 1024 * 1024
+    assert 256 * 1024 <= memory.retained_size < 1024 * 1024
+    assert memory.allocations[0].size >= 256 * 1024
+    assert "test_import_d0010_files.py" in memory.allocations[0].location
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(("sample_rate", "profile_count"), [(0.0, 0), (1.0, 3)])
+def test_import_d0010_directory_profile_sample(
+    tmp_path: Path,
+    flow_directory: Path,
+    sample_rate: float,
+    profile_count: int,
+) -> None:
+    """Test files are profiled without --profile at the sample rate in settings."""
+    with override_settings(D0010_PROFILE_DIR=tmp_path / "profiles", D0010_PROFILE_SAMPLE_RATE=sample_rate):
+        call_command("import_d0010_files", str(flow_directory), stdout=StringIO())
+
+    assert len(list((tmp_path / "profiles").glob("*.prof"))) == profile_count
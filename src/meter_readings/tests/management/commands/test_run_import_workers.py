@@ -0,0 +1,66 @@
+"""Tests for the run import workers management command."""
+
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from meter_readings.models.energy_readings import EnergyReading
+from meter_readings.models.flow_files import FlowFile
+from meter_readings.models.import_jobs import ImportJob
+
+
+@pytest.fixture
+def import_directory(tmp_path: Path, d0010_file_path: Path) -> Path:
+    """Return a directory holding a valid and an invalid D0010 file."""
+    content = d0010_file_path.read_text()
+    (tmp_path / "valid.uff").write_text(content)
+    (tmp_path / "invalid.uff").write_text(content.replace("026|1200023305967|V|", "026|1200023305967|X|"))
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_enqueue_then_run_import_workers(import_directory: Path) -> None:
+    """Test queued files are only imported once the workers run, each job being done or failed."""
+    stdout = StringIO()
+    call_command("import_d0010_files", str(import_directory), enqueue=True, stdout=stdout)
+
+    assert "Queued 2 import jobs" in stdout.getvalue()
+    assert ImportJob.objects.filter(status=ImportJob.Status.QUEUED).count() == 2
+    assert not FlowFile.objects.exists()
+
+    stdout = StringIO()
+    call_command("run_import_workers", once=True, stdout=stdout)
+
+    assert "DONE    job" in stdout.getvalue()
+    assert "FAILED  job" in stdout.getvalue()
+    assert "Import jobs: 0 queued, 0 running, 1 done, 1 failed" in stdout.getvalue()
+    assert "Queue depth: 0" in stdout.getvalue()
+    assert list(FlowFile.objects.values_list("name", flat=True)) == ["valid"]
+    assert EnergyReading.objects.count() == 13
+
+
+@pytest.mark.django_db
+def test_run_import_workers_stats(import_directory: Path) -> None:
+    """Test the stats of the queue are printed without running any job."""
+    call_command("import_d0010_files", str(import_directory), enqueue=True, stdout=StringIO())
+
+    stdout = StringIO()
+    call_command("run_import_workers", stats=True, stdout=stdout)
+
+    assert "Queue depth: 2" in stdout.getvalue()
+    assert ImportJob.objects.filter(status=ImportJob.Status.QUEUED).count() == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("option", "message"),
+    [("workers", "Number of workers"), ("batch_size", "Batch size"), ("max_attempts", "Number of attempts")],
+)
+def test_run_import_workers_invalid_option(option: str, message: str) -> None:
+    """Test non-positive numbers of workers, batch sizes and attempts are rejected."""
+    stdout = StringIO()
+    call_command("run_import_workers", once=True, stdout=stdout, **{option: 0})
+
+    assert f"{message} must be a positive integer, not 0" in stdout.getvalue()
@@ -0,0 +1,148 @@
+"""Tests for the watch D0010 management command."""
+
+import os
+import time
+import zipfile
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+
+from meter_readings.models.energy_readings import EnergyReading
+from meter_readings.models.flow_files import FlowFile
+from meter_readings.models.watch_checkpoints import WatchCheckpoint
+
+
+@pytest.fixture
+def inbound_directory(tmp_path: Path, d0010_file_path: Path) -> Path:
+    """Return an inbound directory holding a valid and an invalid D0010 file."""
+    directory = tmp_path / "inbound"
+    directory.mkdir()
+    content = d0010_file_path.read_text()
+    (directory / "valid.uff").write_text(content)
+    (directory / "invalid.uff").write_text(content.replace("026|1200023305967|V|", "026|1200023305967|X|"))
+    return directory
+
+
+@pytest.mark.django_db
+def test_watch_d0010_imports_and_moves_files(inbound_directory: Path) -> None:
+    """Test complete files are imported, then moved to the processed or failed directory."""
+    stdout = StringIO()
+    call_command("watch_d0010", str(inbound_directory), once=True, settle_seconds=0, stdout=stdout)
+
+    assert "Data imported successfully" in stdout.getvalue()
+    assert (inbound_directory / "processed" / "valid.uff").exists()
+    assert (inbound_directory / "failed" / "invalid.uff").exists()
+    assert not (inbound_directory / "valid.uff").exists()
+    assert not (inbound_directory / "invalid.uff").exists()
+    assert EnergyReading.objects.count() == 13
+    checkpoint = WatchCheckpoint.objects.get()
+    assert checkpoint.directory == str(inbound_directory.resolve())
+    assert checkpoint.imported_count == 1
+    assert checkpoint.failed_count == 1
+
+
+@pytest.mark.django_db
+def test_watch_d0010_custom_directories(tmp_path: Path, inbound_directory: Path) -> None:
+    """Test files can be moved to processed and failed directories outside of the inbound directory."""
+    call_command(
+        "watch_d0010",
+        str(inbound_directory),
+        once=True,
+        settle_seconds=0,
+        processed_dir=str(tmp_path / "done"),
+        failed_dir=str(tmp_path / "rejected"),
+        stdout=StringIO(),
+    )
+
+    assert (tmp_path / "done" / "valid.uff").exists()
+    assert (tmp_path / "rejected" / "invalid.uff").exists()
+
+
+@pytest.mark.django_db
+def test_watch_d0010_ignores_incomplete_files(inbound_directory: Path, d0010_file_path: Path) -> None:
+    """Test temporary files, hidden files and recently modified files are left to be imported later."""
+    (inbound_directory / "invalid.uff").unlink()
+    (inbound_directory / "arriving.uff.part").write_text(d0010_file_path.read_text())
+    (inbound_directory / ".arriving.uff").write_text(d0010_file_path.read_text())
+    # Only files left unmodified for the settle time are imported
+    settled_at = time.time() - 60
+    os.utime(inbound_directory / "valid.uff", (settled_at, settled_at))
+    (inbound_directory / "recent.uff").write_text(d0010_file_path.read_text().replace("0000475656", "0000475657"))
+
+    call_command("watch_d0010", str(inbound_directory), once=True, settle_seconds=30, stdout=StringIO())
+
+    assert (inbound_directory / "processed" / "valid.uff").exists()
+    assert (inbound_directory / "recent.uff").exists()
+    assert (inbound_directory / "arriving.uff.part").exists()
+    assert (inbound_directory / ".arriving.uff").exists()
+    assert FlowFile.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_watch_d0010_resumes_from_checkpoint(inbound_directory: Path) -> None:
+    """Test files handled before a restart are not looked at again, even if they were left in the inbound directory."""
+    call_command("watch_d0010", str(inbound_directory), once=True, settle_seconds=0, stdout=StringIO())
+    # Put back a handled file, keeping its change time from before the restart
+    (inbound_directory / "processed" / "valid.uff").rename(inbound_directory / "valid.uff")
+    WatchCheckpoint.objects.update(last_change_ns=time.time_ns())
+
+    stdout = StringIO()
+    call_command("watch_d0010", str(inbound_directory), once=True, settle_seconds=0, stdout=stdout)
+
+    assert stdout.getvalue() == ""
+    assert (inbound_directory / "valid.uff").exists()
+
+
+@pytest.mark.django_db
+def test_watch_d0010_moves_previously_imported_file(inbound_directory: Path, d0010_file_path: Path) -> None:
+    """Test a file which has already been imported is skipped, but still moved to the processed directory."""
+    call_command("import_d0010_files", str(d0010_file_path), stdout=StringIO())
+
+    stdout = StringIO()
+    call_command("watch_d0010", str(inbound_directory), once=True, settle_seconds=0, stdout=stdout)
+
+    assert "Skipped" in stdout.getvalue()
+    assert (inbound_directory / "processed" / "valid.uff").exists()
+    assert FlowFile.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_watch_d0010_does_not_overwrite_processed_files(inbound_directory: Path) -> None:
+    """Test a file is renamed when moved if a file of the same name has already been processed."""
+    (inbound_directory / "invalid.uff").unlink()
+    (inbound_directory / "processed").mkdir()
+    (inbound_directory / "processed" / "valid.uff").write_text("previous")
+
+    call_command("watch_d0010", str(inbound_directory), once=True, settle_seconds=0, stdout=StringIO())
+
+    assert (inbound_directory / "processed" / "valid.uff").read_text() == "previous"
+    assert (inbound_directory / "processed" / "valid.uff.1").exists()
+
+
+@pytest.mark.django_db
+def test_watch_d0010_moves_zip_archive_once_imported(inbound_directory: Path, d0010_file_path: Path) -> None:
+    """Test a zip archive is moved to the processed directory once every flow file within it has been imported."""
+    (inbound_directory / "valid.uff").unlink()
+    (inbound_directory / "invalid.uff").unlink()
+    with zipfile.ZipFile(inbound_directory / "flows.zip", "w") as archive:
+        archive.write(d0010_file_path, "first.uff")
+        archive.writestr("second.uff", d0010_file_path.read_text().replace("0000475656", "0000475657"))
+
+    stdout = StringIO()
+    call_command("watch_d0010", str(inbound_directory), once=True, settle_seconds=0, stdout=stdout)
+
+    assert stdout.getvalue().count("Data imported successfully") == 2
+    assert (inbound_directory / "processed" / "flows.zip").exists()
+    assert FlowFile.objects.count() == 2
+    assert WatchCheckpoint.objects.get().imported_count == 1
+
+
+@pytest.mark.django_db
+def test_watch_d0010_invalid_directory(tmp_path: Path) -> None:
+    """Test a missing inbound directory is rejected."""
+    stdout = StringIO()
+    call_command("watch_d0010", str(tmp_path / "missing"), once=True, stdout=stdout)
+
+    assert "No valid directory found" in stdout.getvalue()
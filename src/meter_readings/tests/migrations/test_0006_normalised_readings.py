@@ -0,0 +1,99 @@
+"""Tests for the migration of energy readings into normalised tables."""
+
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.state import StateApps
+
+BEFORE = [("meter_readings", "0005_import_run")]
+AFTER = [("meter_readings", "0006_normalised_readings")]
+
+
+def migrate(targets: list[tuple[str, str]]) -> StateApps:
+    """Migrate the database to the given migrations, returning the models as they are there."""
+    executor = MigrationExecutor(connection)
+    executor.migrate(targets)
+    executor.loader.build_graph()
+    return executor.loader.project_state(targets).apps
+
+
+def build_energy_reading(flow_file_id: int, mpan_core: str, meter_register_id: str, **fields: object) -> dict:
+    """Return the fields of an energy reading of the original table, with empty values for any not given."""
+    return {
+        "flow_file_id": flow_file_id,
+        "mpan_core": mpan_core,
+        "bsc_validation_status": "V",
+        "mpan_site_visit_reason": "",
+        "mpan_site_visit_additional_information": "",
+        "meter_id": "F75A 00802",
+        "meter_reading_type": "D",
+        "meter_reading_site_visit_reason": "",
+        "meter_reading_site_visit_additional_information": "",
+        "meter_register_id": meter_register_id,
+        "reading_at": datetime(2016, 2, 22, tzinfo=UTC),
+        "register_reading": 56311.0,
+        "md_reset_at": None,
+        "number_of_md_resets": None,
+        "meter_reading_flag": "T",
+        "reading_method": "N",
+        "meter_reading_validation_result_reason": "",
+        "meter_reading_validation_result_status": "",
+        "register_reading_site_visit_reason": "",
+        "register_reading_site_visit_additional_information": "",
+        **fields,
+    }
+
+
+@pytest.fixture
+def original_energy_readings() -> Iterator[list[dict]]:
+    """Write energy readings to the original table, before the migration, migrating back to the latest afterwards."""
+    apps = migrate(BEFORE)
+    flow_file = apps.get_model("meter_readings", "FlowFile").objects.create(name="flow", extension=".uff")
+    energy_readings = [
+        build_energy_reading(flow_file.pk, "1200023305967", "S"),
+        build_energy_reading(flow_file.pk, "1900001059816", "01", mpan_site_visit_reason="01"),
+        build_energy_reading(
+            flow_file.pk,
+            "1900001059816",
+            "02",
+            mpan_site_visit_reason="01",
+            register_reading_site_visit_reason="15",
+            register_reading_site_visit_additional_information="Meter stopped",
+        ),
+    ]
+    EnergyReading = apps.get_model("meter_readings", "EnergyReading")  # noqa: N806
+    for energy_reading in energy_readings:
+        EnergyReading.objects.create(**energy_reading)
+    yield energy_readings
+    migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_backfills_normalised_tables(original_energy_readings: list[dict]) -> None:
+    """Test energy readings are copied into the normalised tables once each, and read back through the view."""
+    apps = migrate(AFTER)
+
+    assert apps.get_model("meter_readings", "MPAN").objects.count() == 2
+    assert apps.get_model("meter_readings", "Meter").objects.count() == 1
+    assert apps.get_model("meter_readings", "Register").objects.count() == 3
+    assert apps.get_model("meter_readings", "SiteVisit").objects.count() == 3
+    assert apps.get_model("meter_readings", "Reading").objects.count() == 3
+    energy_readings = apps.get_model("meter_readings", "EnergyReading").objects.order_by("id").values()
+    assert [
+        {field: value for field, value in energy_reading.items() if field != "id"} for energy_reading in energy_readings
+    ] == original_energy_readings
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_reversed_restores_original_table(original_energy_readings: list[dict]) -> None:
+    """Test reversing the migration copies readings back into the original table."""
+    migrate(AFTER)
+    apps = migrate(BEFORE)
+
+    energy_readings = apps.get_model("meter_readings", "EnergyReading").objects.order_by("id").values()
+    assert [
+        {field: value for field, value in energy_reading.items() if field != "id"} for energy_reading in energy_readings
+    ] == original_energy_readings
@@ -0,0 +1,36 @@
+"""Tests for the migration making the content of flow files unique, unless forced."""
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.state import StateApps
+
+BEFORE = [("meter_readings", "0013_import_jobs")]
+AFTER = [("meter_readings", "0014_flow_file_unique_content")]
+
+
+def migrate(targets: list[tuple[str, str]]) -> StateApps:
+    """Migrate the database to the given migrations, returning the models as they are there."""
+    executor = MigrationExecutor(connection)
+    executor.migrate(targets)
+    executor.loader.build_graph()
+    return executor.loader.project_state(targets).apps
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_marks_repeated_flow_files_as_forced() -> None:
+    """Test every flow file but the first with the same content is marked forced, so the constraint can be added."""
+    apps = migrate(BEFORE)
+    FlowFile = apps.get_model("meter_readings", "FlowFile")  # noqa: N806
+    first = FlowFile.objects.create(name="first", extension=".uff", content_hash="a" * 64)
+    repeated = FlowFile.objects.create(name="repeated", extension=".uff", content_hash="a" * 64)
+    other = FlowFile.objects.create(name="other", extension=".uff", content_hash="b" * 64)
+    unhashed = [FlowFile.objects.create(name="unhashed", extension=".uff") for _ in range(2)]
+
+    try:
+        apps = migrate(AFTER)
+        forced = dict(apps.get_model("meter_readings", "FlowFile").objects.values_list("id", "forced"))
+    finally:
+        migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    assert forced == {first.pk: False, repeated.pk: True, other.pk: False, unhashed[0].pk: False, unhashed[1].pk: False}
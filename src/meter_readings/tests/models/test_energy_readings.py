@@ -0,0 +1,48 @@
+"""Tests for the indexes of energy readings."""
+
+from datetime import UTC, datetime
+
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+
+from meter_readings.models.energy_readings import EnergyReading, Reading
+from meter_readings.models.flow_files import FlowFile
+
+READING_AT = datetime(2016, 2, 22, tzinfo=UTC)
+
+
+def get_index_names() -> set[str]:
+    """Return the names of the indexes of the reading table."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, Reading._meta.db_table)
+    return {name for name, constraint in constraints.items() if constraint["index"] and not constraint["primary_key"]}
+
+
+@pytest.mark.django_db
+def test_reading_indexes() -> None:
+    """Test the composite indexes replace the single column indexes of the foreign keys they lead with."""
+    index_names = get_index_names()
+
+    assert {"reading_mpan_reading_at", "reading_meter_reading_at", "reading_flow_file_id"} <= index_names
+    # Only the register key keeps an index of its own (alongside the reading date and register reading indexes)
+    assert len(index_names) == 6
+    assert any(name.startswith("meter_readings_reading_register_id") for name in index_names)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("queryset", "index_name"),
+    [
+        (
+            EnergyReading.objects.filter(mpan_core="1200023305967", reading_at__gte=READING_AT),
+            "reading_mpan_reading_at",
+        ),
+        (EnergyReading.objects.filter(meter_id="F75A 00802", reading_at__lt=READING_AT), "reading_meter_reading_at"),
+        (Reading.objects.filter(mpan_id=1).order_by("reading_at"), "reading_mpan_reading_at"),
+        (Reading.objects.filter(flow_file=FlowFile(pk=1)).order_by("id"), "reading_flow_file_id"),
+    ],
+)
+def test_reading_queries_use_indexes(queryset: QuerySet, index_name: str) -> None:
+    """Test readings of an MPAN, meter or flow file are found with an index, rather than a scan of every reading."""
+    assert index_name in queryset.explain()
@@ -24,3 +24,16 @@ def test_invalid_site_visit_reason() -> None:
             visit_reason="99",
             additional_information="Invalid reason code.",
         )
+
+
+@pytest.mark.parametrize("code", ["027", "029", "033"])
+def test_valid_site_visit_code(code: str) -> None:
+    """Test site visits are valid for MPAN cores (027), meters (029) and register readings (033)."""
+    site_visit = SiteVisit(code=code, visit_reason="01", additional_information="")
+    assert site_visit.code == code
+
+
+def test_invalid_site_visit_code() -> None:
+    """Test invalid site visit code."""
+    with pytest.raises(ValueError, match="1 validation error for SiteVisit\ncode"):
+        SiteVisit(code="026", visit_reason="01", additional_information="")  # type: ignore[reportArgumentType]
@@ -0,0 +1,101 @@
+"""Tests for searching energy readings with the search table of the database."""
+
+from pathlib import Path
+
+import pytest
+from django.contrib import admin
+from django.db import connection
+from django.test.utils import override_settings
+
+from meter_readings.admin import EnergyReadingAdmin
+from meter_readings.importers.flow_files import import_flow_file
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.energy_readings import EnergyReading
+from meter_readings.models.flow_files import FlowFile
+from meter_readings.searches.backends import (
+    READING_SEARCH_TABLE,
+    IndexedReadingSearchBackend,
+    ReadingSearchBackend,
+    SQLiteReadingSearchBackend,
+    get_reading_search_backend,
+    get_search_words,
+)
+
+
+def count_documents() -> int:
+    """Return the number of readings in the search table."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {READING_SEARCH_TABLE}")  # noqa: S608
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def imported_flow_file(d0010_file_path: Path) -> FlowFile:
+    """Import the sample flow file, returning it."""
+    import_flow_file(FlowFileSource(d0010_file_path))
+    return FlowFile.objects.get()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "search_term",
+    ["DTC5259", "1200023305967", "f75a", '"F75A 00802"', "56311", "2016-02-22", "S95 81641.0", "no such reading"],
+)
+def test_search_matches_default_admin_search(imported_flow_file: FlowFile, search_term: str) -> None:
+    """Test the search table finds the same readings as the admin's default lookups of the search fields."""
+    model_admin = EnergyReadingAdmin(EnergyReading, admin.site)
+    queryset = EnergyReading.objects.order_by("id")
+
+    readings, may_have_duplicates = model_admin.get_search_results(None, queryset, search_term)
+    default_readings, _ = admin.ModelAdmin.get_search_results(model_admin, None, queryset, search_term)
+
+    assert not may_have_duplicates
+    assert list(readings) == list(default_readings)
+    assert count_documents() == EnergyReading.objects.count() > 0
+
+
+@pytest.mark.django_db
+def test_search_uses_search_table() -> None:
+    """Test readings are found by a lookup of the FTS5 table rather than a scan of every reading."""
+    readings = SQLiteReadingSearchBackend(connection).search(EnergyReading.objects.all(), "1200023305967")
+
+    assert "VIRTUAL TABLE INDEX" in readings.explain()
+
+
+def test_short_search_words_are_not_searched() -> None:
+    """Test terms with a word shorter than a trigram are left to the default search."""
+    backend = SQLiteReadingSearchBackend(connection)
+
+    assert backend.search(EnergyReading.objects.all(), "S 1200023305967") is None
+    assert backend.search(EnergyReading.objects.all(), "  ") is None
+
+
+def test_search_words() -> None:
+    """Test search terms are split into words, keeping quoted phrases together."""
+    assert get_search_words("F75A  \"F75A 00802\" 'S95105287'") == ["F75A", "F75A 00802", "S95105287"]
+
+
+@pytest.mark.django_db
+def test_deleted_readings_are_removed_from_search_table(imported_flow_file: FlowFile) -> None:
+    """Test readings deleted with their flow file are deleted from the search table too."""
+    imported_flow_file.delete()
+
+    assert count_documents() == 0
+
+
+def test_search_backend_chosen_by_database_engine() -> None:
+    """Test the search backend is chosen from the database engine, unless overridden in the settings."""
+    assert type(get_reading_search_backend()) is SQLiteReadingSearchBackend
+
+    with override_settings(D0010_SEARCH_BACKEND="meter_readings.searches.backends.ReadingSearchBackend"):
+        assert type(get_reading_search_backend()) is ReadingSearchBackend
+
+
+def test_indexed_search_backend_without_search_sql_cannot_be_created() -> None:
+    """Test an indexed search backend which does not build its search SQL fails when created, not when searching."""
+
+    class IncompleteReadingSearchBackend(IndexedReadingSearchBackend):
+        pass
+
+    with pytest.raises(TypeError, match="build_search_sql"):
+        IncompleteReadingSearchBackend(connection)  # type: ignore[abstract]
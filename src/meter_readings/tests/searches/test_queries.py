@@ -0,0 +1,76 @@
+"""Tests for classifying admin search terms for energy readings."""
+
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from django.contrib import admin
+
+from meter_readings.admin import EnergyReadingAdmin
+from meter_readings.importers.flow_files import import_flow_file
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.energy_readings import EnergyReading
+from meter_readings.searches.queries import TypedSearch, classify_search_term
+
+
+@pytest.mark.parametrize(
+    ("search_term", "typed_search"),
+    [
+        ("1200023305967", TypedSearch("mpan_core", {"mpan_core": "1200023305967"})),
+        (" '1200023305967' ", TypedSearch("mpan_core", {"mpan_core": "1200023305967"})),
+        ("f75a 00802", TypedSearch("meter_id", {"meter_id": "F75A 00802"})),
+        ('"S95105287"', TypedSearch("meter_id", {"meter_id": "S95105287"})),
+        (
+            "20160301",
+            TypedSearch(
+                "reading_at",
+                {
+                    "reading_at__gte": datetime(2016, 3, 1, tzinfo=UTC),
+                    "reading_at__lt": datetime(2016, 3, 2, tzinfo=UTC),
+                },
+            ),
+        ),
+        (
+            "20160331 .. 20160301",
+            TypedSearch(
+                "reading_at",
+                {
+                    "reading_at__gte": datetime(2016, 3, 1, tzinfo=UTC),
+                    "reading_at__lt": datetime(2016, 4, 1, tzinfo=UTC),
+                },
+            ),
+        ),
+        ("56311.0", TypedSearch("register_reading", {"register_reading": 56311.0})),
+        # Ambiguous terms: digits which could be a meter ID or a reading, an invalid date, part of a meter ID, and
+        # part of a flow file name
+        ("36933604", None),
+        ("20161301", None),
+        ("F75A", None),
+        ("DTC5259515123502080915", None),
+        ("1200023305967 F75A", None),
+    ],
+)
+def test_classify_search_term(search_term: str, typed_search: TypedSearch | None) -> None:
+    """Test unmistakable terms are classified, and ambiguous terms are not."""
+    assert classify_search_term(search_term) == typed_search
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("search_term", "reading_count", "index_name"),
+    [
+        ("1200023305967", 1, "reading_mpan_reading_at"),
+        ("F75A 00802", 1, "reading_meter_reading_at"),
+        ("20160222-20160224", 5, "reading_reading_at_id"),
+        ("56311.0", 1, "reading_register_reading"),
+    ],
+)
+def test_admin_search_dispatch(d0010_file_path: Path, search_term: str, reading_count: int, index_name: str) -> None:
+    """Test the admin looks classified terms up in the index of their column."""
+    import_flow_file(FlowFileSource(d0010_file_path))
+    model_admin = EnergyReadingAdmin(EnergyReading, admin.site)
+
+    readings, _ = model_admin.get_search_results(None, EnergyReading.objects.all(), search_term)
+
+    assert readings.count() == reading_count
+    assert index_name in readings.explain()
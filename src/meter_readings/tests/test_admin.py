@@ -0,0 +1,119 @@
+"""Tests for the admin of energy readings."""
+
+from pathlib import Path
+
+import pytest
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from meter_readings.admin import EnergyReadingAdmin, KeysetChangeList
+from meter_readings.importers.flow_files import import_flow_file
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.energy_readings import EnergyReading
+
+
+@pytest.fixture
+def energy_readings(d0010_file_path: Path) -> list[EnergyReading]:
+    """Import the sample flow file, returning its energy readings in the order of the admin."""
+    import_flow_file(FlowFileSource(d0010_file_path))
+    return list(EnergyReading.objects.order_by("-reading_at", "-id"))
+
+
+def get_changelist(admin_user: User, query_string: str = "") -> KeysetChangeList:
+    """Return the changelist of energy readings shown for a query string, paging 5 readings at a time."""
+    request = RequestFactory().get(f"/admin/meter_readings/energyreading/{query_string}")
+    request.user = admin_user
+    model_admin = EnergyReadingAdmin(EnergyReading, admin.site)
+    model_admin.list_per_page = 5
+    return model_admin.get_changelist_instance(request)
+
+
+@pytest.mark.django_db
+def test_changelist_joins_flow_files(admin_user: User, energy_readings: list[EnergyReading]) -> None:
+    """Test the changelist reads flow files with the readings, rather than once per reading."""
+    changelist = get_changelist(admin_user)
+
+    with CaptureQueriesContext(connection) as queries:
+        flow_file_names = {str(energy_reading.flow_file) for energy_reading in changelist.result_list}
+
+    assert len(flow_file_names) == 1
+    assert len(queries) == 0
+
+
+@pytest.mark.django_db
+def test_changelist_keyset_pages(admin_user: User, energy_readings: list[EnergyReading]) -> None:
+    """Test the changelist links from a numbered page to the pages after it, found by seeking."""
+    changelist = get_changelist(admin_user, "?p=2")
+    assert changelist.result_list == energy_readings[5:10]
+
+    changelist = get_changelist(admin_user, changelist.keyset_next_url)
+    assert changelist.result_list == energy_readings[10:]
+    assert not changelist.keyset_next_url
+    # Links to the first page, and to other orderings and filters, leave out the key
+    assert changelist.get_query_string() == "?"
+
+
+@pytest.mark.django_db
+def test_changelist_keyset_pages_only_in_default_ordering(
+    admin_user: User,
+    energy_readings: list[EnergyReading],
+) -> None:
+    """Test results sorted by another column are not paged by seeking."""
+    changelist = get_changelist(admin_user, f"?o=2&after={energy_readings[0].pk}")
+
+    assert changelist.keyset_after is None
+    assert not changelist.keyset_next_url
+
+
+@pytest.mark.django_db
+def test_changelist_keyset_page_of_unknown_reading(admin_user: User) -> None:
+    """Test seeking past a reading which does not exist is an invalid lookup, as an invalid page number is."""
+    with pytest.raises(IncorrectLookupParameters):
+        get_changelist(admin_user, "?after=x")
+    with pytest.raises(IncorrectLookupParameters):
+        get_changelist(admin_user, "?after=1")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("value", "choices", "reading_count"),
+    [
+        (None, ["2016"], 13),
+        ("2016", ["2016", "2016-02", "2016-03"], 13),
+        (
+            "2016-02",
+            ["2016", "2016-02", "2016-02-21", "2016-02-22", "2016-02-24", "2016-02-26", "2016-02-28", "2016-03"],
+            9,
+        ),
+        (
+            "2016-02-22",
+            ["2016", "2016-02", "2016-02-21", "2016-02-22", "2016-02-24", "2016-02-26", "2016-02-28", "2016-03"],
+            4,
+        ),
+    ],
+)
+def test_changelist_reading_date_filter(
+    admin_user: User,
+    energy_readings: list[EnergyReading],
+    value: str | None,
+    choices: list[str],
+    reading_count: int,
+) -> None:
+    """Test readings are navigated by year, month and day, with choices read from the date buckets."""
+    changelist = get_changelist(admin_user, f"?reading_date={value}" if value else "")
+    (reading_date_filter,) = changelist.filter_specs
+
+    assert [choice for choice, _ in reading_date_filter.lookup_choices] == choices
+    assert reading_date_filter.lookup_choices[0][1] == "2016 (13)"
+    assert changelist.queryset.count() == reading_count
+
+
+@pytest.mark.django_db
+def test_changelist_reading_date_filter_invalid_date(admin_user: User, energy_readings: list[EnergyReading]) -> None:
+    """Test a date which is not a year, month or day is an invalid lookup."""
+    with pytest.raises(IncorrectLookupParameters):
+        get_changelist(admin_user, "?reading_date=2016-02-30")
@@ -0,0 +1,203 @@
+"""Tests for the JSON API of meter readings."""
+
+import gzip
+import json
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from meter_readings.importers.flow_files import complete_flow_file, create_flow_file, import_flow_file
+from meter_readings.importers.parsers import FlowFileParser
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.energy_readings import Reading
+from meter_readings.models.flow_files import FlowFile
+
+MPAN_CORE = "1200023305967"
+
+
+@pytest.fixture
+def readings(d0010_file_path: Path) -> list[Reading]:
+    """Import the sample flow file, returning its readings in the order of the API."""
+    import_flow_file(FlowFileSource(d0010_file_path))
+    return list(Reading.objects.order_by("reading_at", "id"))
+
+
+def post(user: User, path: str, data: bytes, content_type: str) -> HttpResponse:
+    """Return the response of the API to a POST request of a path, with the given body."""
+    request = RequestFactory().post(path, data=data, content_type=content_type)
+    request.user = user
+    return resolve(request.path).func(request)
+
+
+def build_multipart_body(files: dict[str, bytes], boundary: str = "flow-file-boundary") -> bytes:
+    """Return a multipart body of files, by file name."""
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{name}"\r\n\r\n'.encode()
+        + data
+        + b"\r\n"
+        for name, data in files.items()
+    ]
+    return b"".join(parts) + f"--{boundary}--\r\n".encode()
+
+
+def get(user: User | AnonymousUser, path: str, **headers: str) -> HttpResponse:
+    """Return the response of the API to a GET request of a path."""
+    request = RequestFactory().get(path, headers=headers)
+    request.user = user
+    match = resolve(request.path)
+    return match.func(request, **match.kwargs)
+
+
+@pytest.mark.django_db
+def test_mpan_readings_pages(admin_user: User, readings: list[Reading]) -> None:
+    """Test the readings of an MPAN are listed as rows of values, page after page."""
+    path = reverse("meter_readings:mpan_readings", kwargs={"mpan_core": MPAN_CORE})
+    response = get(admin_user, f"{path}?limit=5")
+    data = json.loads(response.content)
+
+    mpan_readings = [reading for reading in readings if reading.mpan.mpan_core == MPAN_CORE]
+
+    assert response.status_code == 200
+    assert data["fields"][:4] == ["id", "reading_at", "register_reading", "mpan_core"]
+    first_reading = mpan_readings[0]
+    assert data["readings"][0][:4] == [
+        first_reading.pk,
+        first_reading.reading_at.isoformat().replace("+00:00", "Z"),
+        first_reading.register_reading,
+        MPAN_CORE,
+    ]
+
+    reading_ids = [row[0] for row in data["readings"]]
+    while data["next"]:
+        data = json.loads(get(admin_user, data["next"]).content)
+        reading_ids.extend(row[0] for row in data["readings"])
+    assert reading_ids == [reading.pk for reading in mpan_readings]
+
+
+@pytest.mark.django_db
+def test_meter_readings_date_range(admin_user: User, readings: list[Reading]) -> None:
+    """Test the readings of a meter are filtered by an inclusive range of reading dates."""
+    path = reverse("meter_readings:meter_readings", kwargs={"meter_id": "F75A 00802"})
+    data = json.loads(get(admin_user, f"{path}?from=2016-02-22&to=2016-02-22").content)
+
+    assert data["readings"]
+    assert {row[1][:10] for row in data["readings"]} == {"2016-02-22"}
+    assert {row[4] for row in data["readings"]} == {"F75A 00802"}
+    assert data["next"] is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query_string", ["from=2016-03-01&to=2016-02-01", "limit=0", "after=x", "after=0", "page=2"])
+def test_invalid_query(admin_user: User, query_string: str) -> None:
+    """Test invalid query parameters, and keys of readings which do not exist, are bad requests."""
+    path = reverse("meter_readings:mpan_readings", kwargs={"mpan_core": MPAN_CORE})
+    response = get(admin_user, f"{path}?{query_string}")
+
+    assert response.status_code == 400
+    assert json.loads(response.content)["errors"]
+
+
+@pytest.mark.django_db
+def test_conditional_requests(admin_user: User, readings: list[Reading]) -> None:
+    """Test pages are not sent again until a flow file is imported after the client last read them."""
+    path = reverse("meter_readings:mpan_readings", kwargs={"mpan_core": MPAN_CORE})
+    response = get(admin_user, path)
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    assert get(admin_user, path, if_none_match=etag).status_code == 304
+    assert get(admin_user, path, if_modified_since=last_modified).status_code == 304
+
+    # A flow file import completed in a later second than the last
+    flow_file = FlowFile.objects.create(name="later", extension=".uff")
+    FlowFile.objects.filter(pk=flow_file.pk).update(completed_at=timezone.now() + timedelta(seconds=1))
+    assert get(admin_user, path, if_none_match=etag).status_code == 200
+    assert get(admin_user, path, if_modified_since=last_modified).status_code == 200
+
+
+@pytest.mark.django_db
+def test_readings_need_permission() -> None:
+    """Test users not allowed to view readings are forbidden from the API."""
+    path = reverse("meter_readings:meter_readings", kwargs={"meter_id": "F75A 00802"})
+    with pytest.raises(PermissionDenied):
+        get(AnonymousUser(), path)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("compress", [bytes, gzip.compress])
+def test_upload_flow_file(admin_user: User, d0010_file_path: Path, compress: object) -> None:
+    """Test a flow file uploaded as the request body, plain or gzipped, is imported."""
+    path = reverse("meter_readings:upload_flow_files")
+    data = compress(d0010_file_path.read_bytes())  # type: ignore[operator]
+    response = post(admin_user, f"{path}?name=flow.uff", data, "application/octet-stream")
+
+    assert response.status_code == 200
+    [result] = json.loads(response.content)["results"]
+    assert result["name"] == "flow.uff"
+    assert result["success"]
+    assert result["reading_count"] == Reading.objects.count() > 0
+
+
+@pytest.mark.django_db
+def test_upload_many_flow_files(admin_user: User, d0010_file_path: Path) -> None:
+    """Test each flow file of a multipart upload is imported on its own, reporting a result per file."""
+    path = reverse("meter_readings:upload_flow_files")
+    data = d0010_file_path.read_bytes()
+    body = build_multipart_body(
+        {
+            "first.uff": data,
+            "duplicate.uff.gz": gzip.compress(data),
+            "invalid.uff": data.replace(b"030|S|20160222000000", b"030|S|not-a-date"),
+        },
+    )
+    response = post(admin_user, path, body, "multipart/mixed; boundary=flow-file-boundary")
+
+    assert response.status_code == 200
+    first, duplicate, invalid = json.loads(response.content)["results"]
+    assert first["success"]
+    assert duplicate["skipped"]
+    assert not invalid["success"]
+    assert invalid["errors"]
+    assert list(FlowFile.objects.values_list("name", flat=True)) == ["first"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("query_string", "content_type", "status_code"),
+    [
+        ("", "application/octet-stream", 400),
+        ("?name=flow.uff&overwrite=1", "application/octet-stream", 400),
+        ("", "multipart/form-data; boundary=flow-file-boundary", 415),
+    ],
+)
+def test_upload_refused(admin_user: User, query_string: str, content_type: str, status_code: int) -> None:
+    """Test unnamed uploads, unknown parameters and form uploads are refused, without importing anything."""
+    path = reverse("meter_readings:upload_flow_files")
+    response = post(admin_user, f"{path}{query_string}", build_multipart_body({"flow.uff": b""}), content_type)
+
+    assert response.status_code == status_code
+    assert not FlowFile.objects.exists()
+
+
+@pytest.mark.django_db
+def test_conditional_requests_imports_committed_out_of_order(admin_user: User) -> None:
+    """Test pages are sent again when an import started earlier is committed after a later one."""
+    path = reverse("meter_readings:mpan_readings", kwargs={"mpan_core": MPAN_CORE})
+    earlier = create_flow_file(FlowFileSource(Path("earlier.uff")))
+    later = create_flow_file(FlowFileSource(Path("later.uff")))
+    complete_flow_file(later, FlowFileParser())
+    etag = get(admin_user, path).headers["ETag"]
+
+    # The earlier import is committed last, dated in the same second as the later one
+    complete_flow_file(earlier, FlowFileParser())
+    FlowFile.objects.filter(pk=earlier.pk).update(completed_at=FlowFile.objects.get(pk=later.pk).completed_at)
+
+    assert earlier.imported_at <= later.imported_at
+    assert get(admin_user, path, if_none_match=etag).status_code == 200
@@ -0,0 +1,101 @@
+"""Tests for database utility functions."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from meter_readings.models.flow_files import FlowFile
+from meter_readings.utils.databases import count_queries, read_sqlite_pragmas, sqlite_pragmas, write_sqlite_pragmas
+
+
+def test_write_sqlite_pragmas(tmp_path: Path) -> None:
+    """Test pragmas are set and read back, including switching a database file to WAL and back."""
+    database = sqlite3.connect(tmp_path / "db.sqlite3")
+    cursor = database.cursor()
+    names = ["journal_mode", "synchronous", "cache_size", "temp_store", "mmap_size"]
+    previous_pragmas = read_sqlite_pragmas(cursor, names)
+
+    write_sqlite_pragmas(
+        cursor,
+        {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -1024,
+            "temp_store": "MEMORY",
+            "mmap_size": 4096,
+        },
+    )
+
+    assert read_sqlite_pragmas(cursor, names) == {
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "cache_size": -1024,
+        "temp_store": 2,
+        "mmap_size": 4096,
+    }
+    write_sqlite_pragmas(cursor, previous_pragmas)
+    assert read_sqlite_pragmas(cursor, names) == previous_pragmas
+    assert previous_pragmas["journal_mode"] == "delete"
+    database.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sqlite_pragmas_restored() -> None:
+    """Test pragmas are set on the database connection, and restored on exit even if an error is raised."""
+    with connection.cursor() as cursor:
+        previous_pragmas = read_sqlite_pragmas(cursor, ["cache_size", "temp_store"])
+
+    pragmas_within = []
+
+    def fail_with_pragmas() -> None:
+        """Read the pragmas within the context manager, then fail."""
+        with sqlite_pragmas({"cache_size": -4096, "temp_store": "MEMORY"}), connection.cursor() as cursor:
+            pragmas_within.append(read_sqlite_pragmas(cursor, ["cache_size", "temp_store"]))
+            msg = "Import failed"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError):
+        fail_with_pragmas()
+
+    assert pragmas_within == [{"cache_size": -4096, "temp_store": 2}]
+    with connection.cursor() as cursor:
+        assert read_sqlite_pragmas(cursor, ["cache_size", "temp_store"]) == previous_pragmas
+
+
+@pytest.mark.django_db
+def test_sqlite_pragmas_unchanged_in_transaction() -> None:
+    """Test nothing is changed within a transaction, in which SQLite cannot change the synchronous pragma."""
+    with connection.cursor() as cursor:
+        previous_pragmas = read_sqlite_pragmas(cursor, ["synchronous"])
+
+    with sqlite_pragmas({"synchronous": "OFF"}), connection.cursor() as cursor:
+        assert read_sqlite_pragmas(cursor, ["synchronous"]) == previous_pragmas
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sqlite_pragmas_set_on_new_connection() -> None:
+    """Test pragmas are also set on a connection opened within the context manager, but not after it."""
+    with sqlite_pragmas({"cache_size": -4096}), connection.cursor() as cursor:
+        write_sqlite_pragmas(cursor, {"cache_size": -1})
+        # As if the connection was closed and opened again
+        connection_created.send(sender=connection.__class__, connection=connection)
+        assert read_sqlite_pragmas(cursor, ["cache_size"]) == {"cache_size": -4096}
+
+    with connection.cursor() as cursor:
+        write_sqlite_pragmas(cursor, {"cache_size": -1})
+        connection_created.send(sender=connection.__class__, connection=connection)
+        assert read_sqlite_pragmas(cursor, ["cache_size"]) == {"cache_size": -1}
+        write_sqlite_pragmas(cursor, {"cache_size": -2000})
+
+
+@pytest.mark.django_db
+def test_count_queries() -> None:
+    """Test queries are counted, with a bulk insert of many rows counted as a single query."""
+    with count_queries() as queries:
+        FlowFile.objects.bulk_create([FlowFile(name=f"flow_{index}", extension=".uff") for index in range(3)])
+        FlowFile.objects.count()
+
+    assert queries.count == 2
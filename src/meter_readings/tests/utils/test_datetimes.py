@@ -0,0 +1,44 @@
+"""Tests for datetime utility functions."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from meter_readings.utils.datetimes import parse_datetime, parse_timestamp
+
+
+def test_parse_timestamp() -> None:
+    """Test a YYYYMMDDHHMMSS string is parsed into a UTC datetime."""
+    assert parse_timestamp("20160222123456") == datetime(2016, 2, 22, 12, 34, 56, tzinfo=timezone.utc)
+
+
+def test_parse_timestamp_is_cached() -> None:
+    """Test the same datetime string is only parsed once."""
+    assert parse_timestamp("20160223000000") is parse_timestamp("20160223000000")
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "2016022200",
+        "201602220000000",
+        "2016-02-22 0000",
+        "20161322000000",
+        "20160230000000",
+        "20160222240000",
+        "2016022200000\u0661",
+        " 20160222000000",
+    ],
+)
+def test_parse_timestamp_invalid(value: str) -> None:
+    """Test anything other than 14 digits forming a valid datetime is rejected."""
+    with pytest.raises(ValueError, match="Datetime string must be in the format 'YYYYMMDDHHMMSS'"):
+        parse_timestamp(value)
+
+
+def test_parse_datetime() -> None:
+    """Test an optional datetime string is parsed, with an empty string parsed as None."""
+    assert parse_datetime("20160222000000") == datetime(2016, 2, 22, tzinfo=timezone.utc)
+    assert parse_datetime("") is None
+    assert parse_datetime(None) is None
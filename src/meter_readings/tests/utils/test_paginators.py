@@ -0,0 +1,76 @@
+"""Tests for paginators of large tables."""
+
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from meter_readings.importers.flow_files import import_flow_file
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.models.energy_readings import EnergyReading, Reading
+from meter_readings.utils import paginators
+from meter_readings.utils.paginators import EstimatedCountPaginator, KeysetPaginator
+
+
+@pytest.fixture
+def readings(d0010_file_path: Path) -> list[Reading]:
+    """Import the sample flow file, with a reading without a date, returning every reading in date order."""
+    import_flow_file(FlowFileSource(d0010_file_path))
+    undated_reading = Reading.objects.order_by("id").first()
+    undated_reading.pk = None
+    undated_reading.reading_at = None
+    undated_reading.save()
+    return list(Reading.objects.order_by("-reading_at", "-id"))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("per_page", [1, 4, 15, 100])
+def test_keyset_pages(readings: list[Reading], per_page: int) -> None:
+    """Test seeking page after page finds every reading once, in the order of the admin, dated or not."""
+    paginator = KeysetPaginator(Reading.objects.all(), "reading_at", per_page)
+    paged_readings = []
+
+    page = paginator.page_after()
+    paged_readings.extend(page.object_list)
+    while page.next_key is not None:
+        page = paginator.page_after(page.next_key)
+        paged_readings.extend(page.object_list)
+
+    assert paged_readings == readings
+
+
+@pytest.mark.django_db
+def test_keyset_page_seeks_with_index(readings: list[Reading]) -> None:
+    """Test a page after a reading is found by seeking in the reading date index, through the energy readings view."""
+    paginator = KeysetPaginator(EnergyReading.objects.all(), "reading_at", 5)
+    reading = readings[3]
+
+    with CaptureQueriesContext(connection) as queries:
+        page = paginator.page_after(reading.pk)
+
+    assert [energy_reading.pk for energy_reading in page.object_list] == [reading.pk for reading in readings[4:9]]
+    # The key is looked up, then the page is read
+    assert len(queries) == 2
+    seek = EnergyReading.objects.filter(paginator.build_seek(reading.reading_at, reading.pk))
+    query_plan = seek.order_by(*paginator.ordering).explain()
+    assert "SEARCH readings USING INDEX reading_reading_at_id" in query_plan
+    assert "TEMP B-TREE" not in query_plan
+
+
+@pytest.mark.django_db
+def test_estimated_count(readings: list[Reading], monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a large unfiltered queryset is estimated without counting it, and a filtered queryset is counted."""
+    monkeypatch.setattr(paginators, "ESTIMATED_COUNT_THRESHOLD", 1)
+    Reading.objects.filter(pk=sorted(reading.pk for reading in readings)[5]).delete()
+
+    with CaptureQueriesContext(connection) as queries:
+        estimated_count = EstimatedCountPaginator(Reading.objects.order_by("id"), 10).count
+
+    assert "COUNT" not in queries[0]["sql"]
+    # Keys are estimated from their range, which still includes the deleted reading
+    assert estimated_count == len(readings)
+    assert (
+        EstimatedCountPaginator(Reading.objects.filter(reading_at__isnull=False).order_by("id"), 10).count
+        == len(readings) - 2
+    )
@@ -0,0 +1,13 @@
+"""URL configuration for the meter readings API."""
+
+from django.urls import path
+
+from meter_readings import views
+
+app_name = "meter_readings"
+
+urlpatterns = [
+    path("flow-files", views.upload_flow_files, name="upload_flow_files"),
+    path("mpans/<str:mpan_core>/readings", views.mpan_readings, name="mpan_readings"),
+    path("meters/<str:meter_id>/readings", views.meter_readings, name="meter_readings"),
+]
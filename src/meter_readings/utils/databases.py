@@ -0,0 +1,129 @@
+"""Database utilities."""
+
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import AbstractContextManager, contextmanager, suppress
+from typing import Any
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.db.models import Model
+
+
+def read_sqlite_pragmas(cursor: Any, names: Iterable[str]) -> dict[str, Any]:  # noqa: ANN401
+    """Return the current value of each of the named SQLite pragmas.
+
+    Pragmas which do not apply to the database (e.g. `mmap_size` of an in-memory database) have no value, and are left
+    out.
+    """
+    pragmas = {}
+    for name in names:
+        cursor.execute(f"PRAGMA {name}")
+        if row := cursor.fetchone():
+            pragmas[name] = row[0]
+    return pragmas
+
+
+def write_sqlite_pragmas(cursor: Any, pragmas: Mapping[str, Any]) -> None:  # noqa: ANN401
+    """Set the value of each SQLite pragma."""
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+        # Pragmas which return their new value must be read, or the statement is not run to completion
+        cursor.fetchall()
+
+
+@contextmanager
+def sqlite_pragmas(pragmas: Mapping[str, Any], using: str = DEFAULT_DB_ALIAS) -> Iterator[None]:
+    """Set pragmas on a SQLite database connection, restoring their previous values on exit.
+
+    The journal mode is stored in the database file, so a change to it is seen by every connection. Leaving WAL mode
+    requires the database to itself: while another connection (e.g. the admin) has it open, the database is left in
+    WAL mode, which is as durable as the restored synchronous pragma. The other pragmas are set per connection, so they
+    are also set on any connection opened meanwhile (e.g. after the connection is closed to start worker processes).
+    Nothing is changed on other databases, or within a transaction (e.g. in tests), in which SQLite refuses to
+    change the journal mode and synchronous pragmas.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite" or connection.in_atomic_block or not pragmas:
+        yield
+        return
+
+    def set_pragmas_on_new_connection(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:  # noqa: ANN401, ARG001
+        """Set the pragmas on a newly opened connection to the same database."""
+        if connection.alias == using:
+            with connection.cursor() as cursor:
+                write_sqlite_pragmas(cursor, pragmas)
+
+    with connection.cursor() as cursor:
+        previous_pragmas = read_sqlite_pragmas(cursor, list(pragmas))
+        write_sqlite_pragmas(cursor, pragmas)
+    connection_created.connect(set_pragmas_on_new_connection)
+    try:
+        yield
+    finally:
+        connection_created.disconnect(set_pragmas_on_new_connection)
+        connection = connections[using]
+        journal_mode = previous_pragmas.pop("journal_mode", None)
+        with connection.cursor() as cursor:
+            write_sqlite_pragmas(cursor, previous_pragmas)
+            if journal_mode is not None:
+                with suppress(OperationalError):
+                    write_sqlite_pragmas(cursor, {"journal_mode": journal_mode})
+
+
+def sqlite_bulk_import(using: str = DEFAULT_DB_ALIAS) -> AbstractContextManager[None]:
+    """Return a context manager tuning a SQLite database connection for bulk imports (see settings)."""
+    return sqlite_pragmas(settings.D0010_SQLITE_BULK_IMPORT_PRAGMAS, using=using)
+
+
+class QueryCounter:
+    """Count the queries run over a database connection, without recording them (see `count_queries`)."""
+
+    def __init__(self) -> None:
+        """Start counting from zero."""
+        self.count = 0
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,  # noqa: ANN401
+        many: bool,  # noqa: FBT001
+        context: dict[str, Any],
+    ) -> Any:  # noqa: ANN401
+        """Count a query, then run it."""
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries(using: str = DEFAULT_DB_ALIAS) -> Iterator[QueryCounter]:
+    """Count the queries run over a database connection (an `executemany` counts as a single query)."""
+    counter = QueryCounter()
+    with connections[using].execute_wrapper(counter):
+        yield counter
+
+
+def estimate_row_count(model: type[Model], using: str = DEFAULT_DB_ALIAS) -> int | None:
+    """Return an estimate of the number of rows of a model's table, without counting them.
+
+    PostgreSQL's estimate is kept by its statistics (updated by VACUUM and ANALYZE); SQLite's is the range of the
+    table's integer keys, read from the ends of its key index, which overestimates once rows have been deleted.
+    Return None if the database (or a table never analysed by PostgreSQL) has no estimate.
+    """
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [quote_name(model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+        if connection.vendor == "sqlite":
+            key = quote_name(model._meta.pk.column)
+            cursor.execute(f"SELECT MAX({key}) - MIN({key}) + 1 FROM {quote_name(model._meta.db_table)}")  # noqa: S608
+            return cursor.fetchone()[0] or 0
+    return None
@@ -1,13 +1,41 @@
 """Datetime utility functions."""
 
 from datetime import datetime, timezone
+from functools import lru_cache
 
-from django.utils.timezone import make_aware
+# Number of distinct datetime strings kept by parse_timestamp.
+# Reading dates repeat heavily (most readings are taken at midnight on a handful of days), so this is plenty.
+TIMESTAMP_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def parse_timestamp(value: str) -> datetime:
+    """Convert a YYYYMMDDHHMMSS string to a UTC datetime object.
+
+    The string is parsed by position, rather than with strptime, and results are cached by string.
+    Raise ValueError if the string is not 14 digits forming a valid datetime.
+    """
+    if len(value) != 14 or not (value.isascii() and value.isdigit()):
+        msg = f"Datetime string must be in the format 'YYYYMMDDHHMMSS' but is instead {value}."
+        raise ValueError(msg)
+
+    try:
+        return datetime(
+            int(value[0:4]),
+            int(value[4:6]),
+            int(value[6:8]),
+            int(value[8:10]),
+            int(value[10:12]),
+            int(value[12:14]),
+            tzinfo=timezone.utc,
+        )
+    except ValueError as error:
+        msg = f"Datetime string must be in the format 'YYYYMMDDHHMMSS' but is instead {value}."
+        raise ValueError(msg) from error
 
 
 def parse_datetime(value: str | None) -> datetime | None:
     """Convert a YYYYMMDDHHMMSS string to a datetime object."""
     if value:
-        naive_datetime = datetime.strptime(value, "%Y%m%d%H%M%S")  # noqa: DTZ007
-        return make_aware(naive_datetime, timezone.utc)
+        return parse_timestamp(value)
     return None
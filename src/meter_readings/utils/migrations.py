@@ -0,0 +1,143 @@
+"""Migration operations which change the indexes of large tables without blocking writes to them.
+
+On PostgreSQL, indexes are created and dropped CONCURRENTLY, which cannot run in a transaction: migrations using these
+operations must set `atomic = False`. Other databases (e.g. SQLite, which locks the whole database for any write
+anyway) create and drop them as usual.
+"""
+
+from typing import Any
+
+from django.db import migrations
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.operations.base import Operation
+from django.db.migrations.state import ProjectState
+
+
+def supports_concurrent_indexes(schema_editor: BaseDatabaseSchemaEditor) -> bool:
+    """Return True if the database can build and drop indexes without blocking writes to their table."""
+    return schema_editor.connection.vendor == "postgresql"
+
+
+def get_index_options(schema_editor: BaseDatabaseSchemaEditor) -> dict[str, Any]:
+    """Return the options of the schema editor's index statements, building them concurrently if supported."""
+    return {"concurrently": True} if supports_concurrent_indexes(schema_editor) else {}
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """Add an index, building it concurrently where supported."""
+
+    def database_forwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Create the index."""
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.execute(self.index.create_sql(model, schema_editor, **get_index_options(schema_editor)))
+
+    def database_backwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Drop the index."""
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.execute(self.index.remove_sql(model, schema_editor, **get_index_options(schema_editor)))
+
+
+class RemoveForeignKeyIndex(Operation):
+    """Drop the index of a foreign key, dropping it concurrently where supported.
+
+    This only changes the database, so is used within SeparateDatabaseAndState alongside an AlterField setting
+    `db_index=False` on the foreign key. (AlterField would drop the index while blocking writes, and on SQLite would
+    copy the whole table.)
+    """
+
+    reversible = True
+
+    def __init__(self, model_name: str, name: str) -> None:
+        """Prepare to drop the index of a model's foreign key field."""
+        self.model_name = model_name
+        self.name = name
+
+    def deconstruct(self) -> tuple[str, list[Any], dict[str, Any]]:
+        """Return the arguments to recreate the operation, for serialising it."""
+        return self.__class__.__qualname__, [], {"model_name": self.model_name, "name": self.name}
+
+    def state_forwards(self, app_label: str, state: ProjectState) -> None:
+        """Leave the state unchanged: it is changed by the accompanying AlterField."""
+
+    def database_forwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Drop the index of the foreign key, found by inspecting the database as its name is generated."""
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        column = model._meta.get_field(self.name).column
+        options = get_index_options(schema_editor)
+        for index_name in schema_editor._constraint_names(model, [column], index=True):  # noqa: SLF001
+            schema_editor.execute(schema_editor._delete_index_sql(model, index_name, **options))  # noqa: SLF001
+
+    def database_backwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Recreate the index of the foreign key, with the name Django gives it."""
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            field = model._meta.get_field(self.name)
+            options = get_index_options(schema_editor)
+            schema_editor.execute(schema_editor._create_index_sql(model, fields=[field], **options))  # noqa: SLF001
+
+    def describe(self) -> str:
+        """Return a description of the operation."""
+        return f"Remove index of foreign key {self.name} on {self.model_name}"
+
+    @property
+    def migration_name_fragment(self) -> str:
+        """Return a fragment of the name of a migration holding the operation."""
+        return f"remove_{self.model_name.lower()}_{self.name.lower()}_index"
+
+
+class RemoveIndexConcurrently(migrations.RemoveIndex):
+    """Remove an index, dropping it concurrently where supported."""
+
+    def database_forwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Drop the index."""
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = from_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            schema_editor.execute(index.remove_sql(model, schema_editor, **get_index_options(schema_editor)))
+
+    def database_backwards(
+        self,
+        app_label: str,
+        schema_editor: BaseDatabaseSchemaEditor,
+        from_state: ProjectState,
+        to_state: ProjectState,
+    ) -> None:
+        """Recreate the index."""
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = to_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            schema_editor.execute(index.create_sql(model, schema_editor, **get_index_options(schema_editor)))
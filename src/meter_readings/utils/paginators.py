@@ -0,0 +1,122 @@
+"""Paginators for tables too large to count, or to page through with OFFSET."""
+
+from functools import cached_property
+from typing import Any, NamedTuple
+
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import BooleanField, Model, QuerySet
+from django.db.models.expressions import RawSQL
+
+from meter_readings.utils.databases import estimate_row_count
+
+# Number of rows above which an unfiltered queryset is estimated rather than counted
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator estimating the number of objects of a large unfiltered queryset, rather than counting every row.
+
+    Filtered querysets, and tables estimated to hold fewer rows than the threshold, are counted exactly.
+    """
+
+    # Model whose table is estimated (by default, the model of the queryset)
+    estimated_model: type[Model] | None = None
+
+    @cached_property
+    def count(self) -> int:
+        """Return the (estimated) number of objects, across all pages."""
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.has_filters():
+            estimate = estimate_row_count(self.estimated_model or queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class KeysetPage(NamedTuple):
+    """The objects of a page found by seeking, and the key of its last object if there is a next page."""
+
+    object_list: list[Any]
+    next_key: Any
+
+
+class KeysetPaginator:
+    """Page through a queryset ordered by a field then its primary key, seeking past the last object of each page.
+
+    Each page is found by comparing (field, key) with the last row of the previous page, which an index of the field
+    (and key) finds directly, so deep pages cost the same as the first rather than skipping every row before them.
+    Rows whose field is NULL cannot be compared, so are paged through by key alone, before or after the other rows
+    depending on where the database sorts NULLs.
+    """
+
+    def __init__(self, queryset: QuerySet, field_name: str, per_page: int, *, descending: bool = True) -> None:
+        """Prepare to page through a queryset, ordered by a field and its primary key."""
+        self.queryset = queryset
+        self.field = queryset.model._meta.get_field(field_name)
+        self.per_page = per_page
+        self.descending = descending
+        self.connection = connections[queryset.db]
+        prefix = "-" if descending else ""
+        self.ordering = (f"{prefix}{field_name}", f"{prefix}pk")
+
+    def page_after(self, key: Any = None) -> KeysetPage:  # noqa: ANN401
+        """Return the page following the object with the given primary key (or the first page).
+
+        Raise InvalidPage if there is no such object.
+        """
+        field_name = self.field.name
+        value_rows = self.queryset.filter(**{f"{field_name}__isnull": False}).order_by(*self.ordering)
+        null_rows = self.queryset.filter(**{f"{field_name}__isnull": True}).order_by(self.ordering[1])
+        # e.g. PostgreSQL sorts NULLs as larger than any value, so they come after every value in ascending order
+        nulls_last = self.connection.features.nulls_order_largest != self.descending
+        segments = [value_rows, null_rows] if nulls_last else [null_rows, value_rows]
+
+        if key is not None:
+            values = list(self.queryset.filter(pk=key).values_list(field_name, flat=True)[:1])
+            if not values:
+                msg = f"No object with key {key} to page after."
+                raise InvalidPage(msg)
+            value = values[0]
+            if value is None:
+                segments = segments[segments.index(null_rows) :]
+                segments[0] = null_rows.filter(**{"pk__lt" if self.descending else "pk__gt": key})
+            else:
+                segments = segments[segments.index(value_rows) :]
+                segments[0] = value_rows.filter(self.build_seek(value, key))
+
+        # One more object than fits on the page is read to find out whether there is a next page
+        object_list: list[Any] = []
+        for segment in segments:
+            object_list.extend(segment[: self.per_page + 1 - len(object_list)])
+            if len(object_list) > self.per_page:
+                return KeysetPage(object_list[: self.per_page], self.get_key(object_list[self.per_page - 1]))
+        return KeysetPage(object_list, None)
+
+    def get_key(self, obj: Any) -> Any:  # noqa: ANN401
+        """Return the primary key of an object of the queryset."""
+        return obj.pk
+
+    def build_seek(self, value: Any, key: Any) -> RawSQL:  # noqa: ANN401
+        """Return a condition selecting the rows after (value, key), as a single comparison of row values.
+
+        A row value comparison lets the database seek to the first row in an index, rather than test every row
+        before it, as `field < value OR (field = value AND key < key)` would.
+        """
+        quote_name = self.connection.ops.quote_name
+        table = quote_name(self.queryset.model._meta.db_table)
+        operator = "<" if self.descending else ">"
+        sql = (
+            f"({table}.{quote_name(self.field.column)}, {table}.{quote_name(self.queryset.model._meta.pk.column)}) "
+            f"{operator} (%s, %s)"
+        )
+        params = (self.field.get_db_prep_value(value, self.connection), key)
+        return RawSQL(sql, params, output_field=BooleanField())
+
+
+class ValuesKeysetPaginator(KeysetPaginator):
+    """Page through a queryset of `values_list()` rows, whose first value is the primary key, by seeking."""
+
+    def get_key(self, obj: tuple) -> Any:  # noqa: ANN401
+        """Return the primary key of a row of the queryset."""
+        return obj[0]
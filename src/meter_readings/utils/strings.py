@@ -1,6 +1,6 @@
 """String utilities."""
 
-from datetime import datetime
+from meter_readings.utils.datetimes import parse_timestamp
 
 
 def coerce_string_to_int(value: str) -> int | None:
@@ -19,10 +19,6 @@ def validate_string_to_datetime(value: str) -> str:
     if value == "":
         return value
 
-    try:
-        datetime.strptime(value, "%Y%m%d%H%M%S")  # noqa: DTZ007
-    except ValueError as error:
-        msg = f"Datetime string must be in the format 'YYYYMMDDHHMMSS' but is instead {value}."
-        raise ValueError(msg) from error
-
+    # Raises a ValueError if the string is not a valid datetime
+    parse_timestamp(value)
     return value
@@ -1 +1,185 @@
-"""Meter reading views."""
+"""Meter reading views.
+
+A JSON API importing uploaded flow files once they are received (see `importers.uploads`), and listing the readings of
+an MPAN core or a meter, in date order, a page at a time. Readings are serialised straight from `values_list()`
+rows, as a list of fields and a list of rows, rather than as model instances converted to a dictionary each. Pages
+are found by seeking past the last reading of the previous page (see KeysetPaginator), and carry ETag and
+Last-Modified headers from the latest completed flow file import, so that clients can ask for a page only if readings
+have been imported since they last read it.
+"""
+
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+from django.contrib.auth.decorators import permission_required
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http.multipartparser import MultiPartParser, MultiPartParserError
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET, require_POST
+from pydantic import ValidationError
+
+from meter_readings.importers.sources import FlowFileSource
+from meter_readings.importers.uploads import FlowFileUpload, FlowFileUploadHandler
+from meter_readings.models.energy_readings import Reading
+from meter_readings.models.flow_files import FlowFile
+from meter_readings.schemas.import_results import ImportResult
+from meter_readings.schemas.reading_queries import ReadingQuery
+from meter_readings.schemas.upload_queries import FlowFileUploadQuery
+from meter_readings.utils.paginators import ValuesKeysetPaginator
+
+# Number of bytes of a flow file uploaded as the request body read at a time
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Fields of each reading listed by the API, as named in the response, and the lookups they are read with
+READING_FIELDS = {
+    "id": "id",
+    "reading_at": "reading_at",
+    "register_reading": "register_reading",
+    "mpan_core": "mpan__mpan_core",
+    "meter_id": "meter__meter_id",
+    "meter_register_id": "register__meter_register_id",
+    "reading_method": "reading_method",
+    "meter_reading_flag": "meter_reading_flag",
+    "flow_file": "flow_file__name",
+}
+
+
+def get_completed_imports(request: HttpRequest) -> dict[str, Any]:
+    """Return when the latest flow file import was completed and how many have been, read once per request."""
+    if not hasattr(request, "completed_imports"):
+        request.completed_imports = FlowFile.objects.aggregate(
+            latest_completed_at=Max("completed_at"),
+            completed_count=Count("completed_at"),
+        )
+    return request.completed_imports
+
+
+def get_readings_etag(request: HttpRequest, **kwargs: Any) -> str | None:  # noqa: ANN401, ARG001
+    """Return the ETag of any page of readings, which changes whenever a flow file import is committed or deleted.
+
+    Imports are dated when they complete, just before they commit, so concurrent imports may commit out of order:
+    the count of completed imports changes even when the latest date does not.
+    """
+    completed_imports = get_completed_imports(request)
+    latest_completed_at = completed_imports["latest_completed_at"]
+    if latest_completed_at is None:
+        return None
+    return f"{latest_completed_at.isoformat()}-{completed_imports['completed_count']}"
+
+
+def get_readings_last_modified(request: HttpRequest, **kwargs: Any) -> datetime | None:  # noqa: ANN401, ARG001
+    """Return when any page of readings last changed: when the latest flow file import was completed."""
+    return get_completed_imports(request)["latest_completed_at"]
+
+
+def readings_api_view(view: Any) -> Any:  # noqa: ANN401
+    """Make a view of readings read-only, for users allowed to view readings, and answer conditional requests.
+
+    Clients are asked to revalidate pages every time, which costs a single query of the latest import when nothing
+    has changed.
+    """
+
+    @require_GET
+    @permission_required("meter_readings.view_reading", raise_exception=True)
+    @cache_control(private=True, no_cache=True)
+    @condition(etag_func=get_readings_etag, last_modified_func=get_readings_last_modified)
+    @wraps(view)
+    def wrapped_view(request: HttpRequest, **kwargs: Any) -> HttpResponse:  # noqa: ANN401
+        return view(request, **kwargs)
+
+    return wrapped_view
+
+
+def list_readings(request: HttpRequest, **lookups: str) -> JsonResponse:
+    """Return a page of the readings found by the given lookups, filtered and paged by the query parameters."""
+    try:
+        query = ReadingQuery.model_validate(request.GET.dict())
+    except ValidationError as error:
+        return JsonResponse({"errors": error.errors(include_url=False, include_context=False)}, status=400)
+
+    queryset = Reading.objects.filter(**lookups, **query.get_reading_at_lookups()).values_list(
+        *READING_FIELDS.values(),
+    )
+    paginator = ValuesKeysetPaginator(queryset, "reading_at", query.limit, descending=False)
+    try:
+        page = paginator.page_after(query.after)
+    except InvalidPage as error:
+        return JsonResponse({"errors": [{"loc": ["after"], "msg": str(error)}]}, status=400)
+
+    next_url = None
+    if page.next_key is not None:
+        parameters = request.GET.copy()
+        parameters["after"] = page.next_key
+        next_url = f"{request.path}?{parameters.urlencode()}"
+    data = {"fields": list(READING_FIELDS), "readings": page.object_list, "next": next_url}
+    return JsonResponse(data, encoder=DjangoJSONEncoder)
+
+
+@readings_api_view
+def mpan_readings(request: HttpRequest, mpan_core: str) -> JsonResponse:
+    """Return a page of the readings of an MPAN core."""
+    return list_readings(request, mpan__mpan_core=mpan_core)
+
+
+@readings_api_view
+def meter_readings(request: HttpRequest, meter_id: str) -> JsonResponse:
+    """Return a page of the readings of a meter, by its ID (serial number)."""
+    return list_readings(request, meter__meter_id=meter_id)
+
+
+@require_POST
+@permission_required("meter_readings.add_flowfile", raise_exception=True)
+def upload_flow_files(request: HttpRequest) -> JsonResponse:
+    """Import the flow files uploaded in the request body, returning the result of importing each.
+
+    The body is either a single flow file (plain or gzipped), named by the `name` parameter, or many of them as the
+    parts of a `multipart/mixed` body, each named by its file name. Form uploads (`multipart/form-data`) are refused:
+    they are read into memory or temporary files before the view is reached, to check their CSRF token.
+    """
+    try:
+        query = FlowFileUploadQuery.model_validate(request.GET.dict())
+    except ValidationError as error:
+        return JsonResponse({"errors": error.errors(include_url=False, include_context=False)}, status=400)
+
+    if request.content_type == "multipart/form-data":
+        msg = "Upload flow files as a multipart/mixed body, rather than as a form."
+        return JsonResponse({"errors": [{"msg": msg}]}, status=415)
+
+    if request.content_type.startswith("multipart/"):
+        handler = FlowFileUploadHandler(request, force=query.force)
+        try:
+            MultiPartParser(request.META, request, [handler], request.encoding).parse()
+        except MultiPartParserError as error:
+            return JsonResponse({"errors": [{"msg": str(error)}]}, status=400)
+        finally:
+            handler.abort()
+        results = handler.results
+    else:
+        if not query.name:
+            return JsonResponse({"errors": [{"loc": ["name"], "msg": "Name the uploaded flow file."}]}, status=400)
+        # Only the file name is kept, as for the parts of a multipart body
+        upload = FlowFileUpload(FlowFileSource(Path(Path(query.name).name)), force=query.force)
+        try:
+            while chunk := request.read(UPLOAD_CHUNK_SIZE):
+                upload.feed(chunk)
+            results = [upload.close()]
+        finally:
+            upload.abort()
+
+    if not results:
+        return JsonResponse({"errors": [{"msg": "No flow files were uploaded."}]}, status=400)
+    return JsonResponse({"results": [serialise_import_result(result) for result in results]})
+
+
+def serialise_import_result(result: ImportResult) -> dict[str, Any]:
+    """Return the result of importing an uploaded flow file, as JSON."""
+    return {
+        "name": result.file_path.name,
+        "success": result.success,
+        **result.model_dump(mode="json", include={"reading_count", "errors", "skipped", "elapsed_seconds"}),
+    }